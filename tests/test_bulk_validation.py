@@ -0,0 +1,99 @@
+import math
+
+import pytest
+
+from valohai_yaml import ValidationErrors
+from valohai_yaml.excs import InvalidType
+from valohai_yaml.objs import Parameter
+from valohai_yaml.utils import bulk_validation
+from valohai_yaml.utils.bulk_validation import validate_column
+
+use_numpy_cases = [
+    pytest.param(False, id="python"),
+    pytest.param(True, id="numpy", marks=pytest.mark.skipif(bulk_validation.np is None, reason="needs NumPy")),
+]
+
+parameters = {
+    "integer": Parameter(name="test", type="integer"),
+    "integer-range": Parameter(name="test", type="integer", min=0, max=10),
+    "integer-float-range": Parameter(name="test", type="integer", min=0.5, max=2**60 + 0.5),
+    "integer-huge-range": Parameter(name="test", type="integer", min=-(2**70), max=2**64),
+    "integer-choices": Parameter(name="test", type="integer", choices=[1, 2, 3.0, True, "4"]),
+    "float": Parameter(name="test", type="float"),
+    "float-range": Parameter(name="test", type="float", min=-1, max=1.5),
+    "float-inexact-range": Parameter(name="test", type="float", min=2**53 + 1),
+    "float-choices": Parameter(name="test", type="float", choices=[0.5, 1, 2**60 + 1]),
+    "float-string-range": Parameter(name="test", type="float", min="0", max="1"),
+    "string": Parameter(name="test", type="string"),
+    "string-choices": Parameter(name="test", type="string", choices=["a", "b", "c\0", 5]),
+    "string-plain-choices": Parameter(name="test", type="string", choices=["a", "b", "zz"]),
+    "string-range": Parameter(name="test", type="string", min="b", max="x"),
+    "flag": Parameter(name="test", type="flag"),
+    "multiple": Parameter(name="test", type="integer", multiple="separate", min=0, choices=[1, 2, 3]),
+}
+
+columns = {
+    "ints": [-(2**63), -1, 0, 1, 2, 3, 4, 5, 9, 10, 11, 2**53 + 1, 2**60, 2**63 - 1],
+    "huge-ints": [1, 2**64, -(2**100)],
+    "floats": [-1.5, -0.0, 0.5, 1.0, 1.5, 2.0, 1e300, math.inf, -math.inf, math.nan],
+    "numbers": [1, 1.0, 2, 2.5, 3, 4],
+    "strings": ["a", "b", "c", "c\0", "4", "5.5", "", "hello", "zz"],
+    "mixed": [1, "2", 3.0, True, None, [1, 2], ["3"], [[1]], "", "x", 2.5, False],
+}
+
+
+def validate_each(parameter, values):
+    results = []
+    for value in values:
+        try:
+            results.append((parameter.validate(value), None))
+        except ValidationErrors as exc:
+            results.append((value, [str(error) for error in exc.errors]))
+        except InvalidType as exc:
+            results.append((value, [str(exc)]))
+    return results
+
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a):
+        return math.isnan(b)
+    return type(a) is type(b) and a == b
+
+
+@pytest.mark.parametrize("use_numpy", use_numpy_cases)
+@pytest.mark.parametrize("column", columns)
+@pytest.mark.parametrize("parameter", parameters)
+def test_validate_column_matches_validate(parameter, column, use_numpy):
+    parameter = parameters[parameter]
+    values = columns[column]
+    result = validate_column(parameter, values, use_numpy=use_numpy)
+    expected = validate_each(parameter, values)
+    assert result.mask == [errors is None for (_, errors) in expected]
+    assert result.errors == {i: errors for (i, (_, errors)) in enumerate(expected) if errors is not None}
+    for index, (value, _) in enumerate(expected):
+        assert _same(result.values[index], value), index
+    assert result.is_valid() == all(result.mask)
+
+
+@pytest.mark.parametrize("use_numpy", use_numpy_cases)
+def test_validate_column(use_numpy):
+    parameter = Parameter(name="test", type="float", min=0, max=1)
+    result = validate_column(parameter, (x / 4 for x in range(-1, 6)), use_numpy=use_numpy)
+    assert result.mask == [False, True, True, True, True, True, False]
+    assert result.values[1:6] == [0.0, 0.25, 0.5, 0.75, 1.0]
+    assert result.errors == {
+        0: ["-0.25 is less than the minimum allowed (0)"],
+        6: ["1.25 is greater than the maximum allowed (1)"],
+    }
+    assert validate_column(parameter, [], use_numpy=use_numpy).is_valid()
+
+
+def test_validate_column_without_numpy(monkeypatch):
+    monkeypatch.setattr(bulk_validation, "np", None)
+    parameter = Parameter(name="test", type="integer", choices=[1, 2])
+    result = validate_column(parameter, [1, "2", 3])
+    assert result.mask == [True, True, False]
+    assert result.values == [1, 2, 3]
+    assert result.errors == {2: ["3 is not among the choices allowed ([1, 2])"]}
+    with pytest.raises(ImportError):
+        validate_column(parameter, [1], use_numpy=True)
@@ -0,0 +1,174 @@
+import io
+import os
+import pickle
+
+import pytest
+import yaml
+
+from tests.consts import examples_path, invalid_obj, valid_bytes
+from valohai_yaml import ValidationErrors, parse
+from valohai_yaml.caching import (
+    BaseParseCache,
+    DiskParseCache,
+    ParseCache,
+    decode_entry_data,
+    encode_entry_data,
+    get_content_key,
+)
+
+
+def test_parse_cache_hits():
+    cache = ParseCache()
+    config1 = parse(valid_bytes, cache=cache)
+    config2 = parse(valid_bytes.decode("utf-8"), cache=cache)
+    config3 = parse(io.BytesIO(valid_bytes), cache=cache)
+    assert config1.serialize() == config2.serialize() == config3.serialize()
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+
+
+def test_parse_cache_returns_independent_configs():
+    cache = ParseCache()
+    with open(os.path.join(examples_path, "example1.yaml"), "rb") as infp:
+        source = infp.read()
+    config1 = parse(source, cache=cache)
+    step = config1.steps["run training"]
+    step.command.append("rm -rf /")
+    step.parameters.clear()
+    config2 = parse(source, cache=cache)
+    assert config2.serialize() == parse(source).serialize()
+
+
+def test_parse_cache_validation_is_keyed():
+    cache = ParseCache()
+    source = "- step: {name: foo, image: 0, command: foo}"
+    parse(source, validate=False, cache=cache)
+    with pytest.raises(ValidationErrors):
+        parse(source, validate=True, cache=cache)
+    assert len(cache) == 1  # failed validation is not cached
+
+
+def test_parse_cache_lru_eviction():
+    cache = ParseCache(maxsize=2)
+    sources = [f"- step: {{name: s{i}, image: x, command: x}}" for i in range(3)]
+    parse(sources[0], cache=cache)
+    parse(sources[1], cache=cache)
+    parse(sources[0], cache=cache)  # refresh
+    parse(sources[2], cache=cache)  # evicts sources[1]
+    assert len(cache) == 2
+    parse(sources[0], cache=cache)
+    assert cache.cache_info().hits == 2
+    parse(sources[1], cache=cache)
+    assert cache.cache_info().misses == 4
+
+
+def test_parse_cache_ttl():
+    now = [0.0]
+    cache = ParseCache(ttl=10, clock=lambda: now[0])
+    parse(valid_bytes, cache=cache)
+    now[0] = 5
+    parse(valid_bytes, cache=cache)
+    now[0] = 20
+    parse(valid_bytes, cache=cache)
+    assert cache.cache_info()[:2] == (1, 2)
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 128, 0)
+
+
+def test_parse_cache_passes_through_preparsed_data():
+    cache = ParseCache()
+    with pytest.raises(ValidationErrors):
+        parse(invalid_obj, cache=cache)
+    assert not parse([], validate=False, cache=cache).steps
+    assert cache.cache_info() == (0, 0, 128, 0)
+
+
+def test_disk_parse_cache(tmp_path):
+    source = valid_bytes
+    config = parse(source, cache=DiskParseCache(tmp_path))
+    # A fresh cache object (as in another process) should find the entry
+    cache = DiskParseCache(tmp_path)
+    assert len(cache) == 1
+    assert parse(source, cache=cache).serialize() == config.serialize()
+    assert cache.cache_info()[:2] == (1, 0)
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+
+def test_disk_parse_cache_corrupt_entry(tmp_path):
+    cache = DiskParseCache(tmp_path)
+    parse(valid_bytes, cache=cache)
+    (entry_path,) = tmp_path.glob("*/*.vhyc")
+    entry_path.write_bytes(b"VHYC\x00garbage")
+    assert parse(valid_bytes, cache=cache).serialize() == parse(valid_bytes).serialize()
+    assert cache.cache_info()[:2] == (0, 2)
+    assert parse(valid_bytes, cache=cache)  # rewritten
+    assert cache.cache_info()[:2] == (1, 2)
+    cache.clear()
+    assert not len(cache)
+
+
+def test_cache_key_depends_on_version(monkeypatch):
+    import valohai_yaml
+
+    key = get_content_key(valid_bytes, validate=True)
+    assert key != get_content_key(valid_bytes, validate=False)
+    monkeypatch.setattr(valohai_yaml, "__version__", "0.0.0")
+    assert key != get_content_key(valid_bytes, validate=True)
+
+
+def test_incomplete_cache_class():
+    class IncompleteCache(BaseParseCache):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteCache()
+
+
+def test_disk_parse_cache_entry_encoding():
+    data = yaml.safe_load(
+        """
+        a: 2001-12-14t21:59:43.10-05:00
+        b: 2002-12-14
+        c: !!binary aGVsbG8=
+        d: !!set {x, y}
+        1: x
+        ~: z
+        2.5: [.nan, .inf]
+        e: !!omap [a: 1]
+        f: {__vhyc_date: not a date}
+        g: [{__vhyc_set: [1, 2]}, {}]
+        """,
+    )
+    decoded = decode_entry_data(encode_entry_data(data))
+    assert repr(decoded) == repr(data)
+    with pytest.raises(TypeError):
+        encode_entry_data({"a": object()})
+
+
+def test_disk_parse_cache_caches_empty_document(tmp_path):
+    cache = DiskParseCache(tmp_path)
+    assert not parse("", cache=cache).steps
+    assert not parse("", cache=cache).steps
+    assert cache.cache_info()[:2] == (1, 1)
+    memory_cache = ParseCache()
+    parse("", cache=memory_cache)
+    parse("", cache=memory_cache)
+    assert memory_cache.cache_info()[:2] == (1, 1)
+
+
+def test_disk_parse_cache_does_not_unpickle(tmp_path):
+    cache = DiskParseCache(tmp_path)
+    parse(valid_bytes, cache=cache)
+    (entry_path,) = tmp_path.glob("*/*.vhyc")
+    # A pickle that would run code on load isn't loaded
+    entry_path.write_bytes(b"VHYC\x02" + pickle.dumps(Exploit()))
+    assert parse(valid_bytes, cache=cache).serialize() == parse(valid_bytes).serialize()
+    assert cache.cache_info()[:2] == (0, 2)
+
+
+class Exploit:
+    """An object that fails the test when unpickled."""
+
+    def __reduce__(self) -> tuple:  # noqa: D105
+        return (pytest.fail, ("unpickled",))
@@ -1,6 +1,18 @@
 from collections import defaultdict
+from shlex import quote
 
-from valohai_yaml.commands import build_command, join_command
+import pytest
+
+from valohai_yaml.commands import (
+    CommandInterpolationWarning,
+    build_command,
+    compile_command,
+    interpolable_re,
+    join_command,
+    quote_multiple,
+)
+from valohai_yaml.objs import Parameter
+from valohai_yaml.objs.parameter import compile_pass_as
 from valohai_yaml.objs.parameter_map import ParameterMap
 
 
@@ -147,3 +159,158 @@ def test_join_command():
     assert join_command(["#!/bin/sh", "foo", " ", "bar"], " && ") == "#!/bin/sh\nfoo && bar"
     assert join_command(["#!/bin/sh\nfoo", " ", "bar"], " && ") == "#!/bin/sh\nfoo && bar"
     assert join_command(["#!/bin/bash\nfoo", "#!woop"], " && ") == "#!/bin/bash\nfoo && #!woop"
+
+
+def _old_interpolate(command, parameter_map, special):
+    # The previous regexp-substitution implementation of `build_command`'s interpolation.
+    def replace(match):
+        value = match.group(1)
+        if value in special:
+            return quote(special[value])
+        if value in ("parameters", "params"):
+            return quote_multiple(parameter_map.build_parameters())
+        if value.startswith("parameter:"):
+            parameter_name = value.split(":", 1)[1]
+            if parameter_name in parameter_map.parameters:
+                return quote_multiple(parameter_map.build_parameter_by_name(parameter_name))
+        if value.startswith("parameter-value:"):
+            parameter_name = value.split(":", 1)[1]
+            if parameter_name in parameter_map.values:
+                return quote(str(parameter_map.values[parameter_name]))
+        return match.group(0)
+
+    return interpolable_re.sub(replace, command).strip()
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "",
+        "   python train.py   ",
+        "python train.py {parameters}",
+        "python train.py {params} -- {params}",
+        "{parameter:decoder-spec}{parameter:num-epochs}",
+        "echo {parameter-value:decoder-spec} {parameter-value:nope} {parameter:nope}",
+        "echo {parameter:} {parameter-value:} {:} {parameter} {parameters:x}",
+        "cd {source-path} && python {source-path}",
+        "echo ${HOME} {{double}} {unclosed",
+        "awk '{print $1}' | sed -e 's/{a}/{b}/' {",
+        "multi\nline {parameters}\n{parameter:seed}",
+        "{}{}{{}}",
+    ],
+)
+def test_compiled_command_matches_substitution(example1_config, command):
+    step = example1_config.steps["run training"]
+    values = dict(step.get_parameter_defaults(include_flags=False), **parameter_test_values)
+    parameter_map = ParameterMap(parameters=step.parameters, values=values)
+    special = {"source-path": "my script.py"}
+    expected = _old_interpolate(command, parameter_map, special)
+    assert build_command(command, parameter_map, special_interpolations=special) == [expected]
+
+
+def test_compile_command_is_cached():
+    command = "python train.py {parameters} --out {parameter-value:out} {source-path}"
+    compiled = compile_command(command)
+    assert compile_command(command) is compiled
+    assert compiled.literals == ("python train.py ", " --out ", " ", "")
+    assert [(p.kind, p.parameter_name) for p in compiled.placeholders] == [
+        ("parameters", ""),
+        ("parameter-value", "out"),
+        (None, ""),
+    ]
+
+
+def test_interpolation_failure_warns():
+    parameter = Parameter(name="x", type="string", pass_as="--x={value")  # Broken format string
+    parameter_map = ParameterMap(parameters={"x": parameter}, values={"x": "y"})
+    with pytest.warns(CommandInterpolationWarning):
+        assert build_command(" run {parameters} ", parameter_map) == ["run {parameters}"]
+
+
+def test_build_commands_matches_build_command(example1_config):
+    step = example1_config.steps["run training"]
+    rows = [
+        {},
+        {"decoder-spec": "a b", "num-epochs": 10},
+        {"num-epochs": None},
+        {"seed": 3, "decoder-spec": "x"},
+    ]
+    command = ["python run.py {params}", "echo {parameter:seed} {parameter-value:decoder-spec}"]
+    expected = [step.build_command(row, command=command) for row in rows]
+    assert list(step.build_commands(rows, command=command)) == expected
+    assert list(step.build_commands(iter(rows))) == [step.build_command(row) for row in rows]
+
+
+def test_build_commands_columnar(example1_config):
+    step = example1_config.steps["run training"]
+    columns = {"num-epochs": [1, 2, 3], "decoder-spec": ["a", "b", None]}
+    rows = [{"num-epochs": n, "decoder-spec": d} for (n, d) in zip(*columns.values())]
+    assert list(step.build_commands(columns)) == [step.build_command(row) for row in rows]
+    with pytest.raises(ValueError):
+        list(step.build_commands({"num-epochs": [1, 2], "seed": [1]}))
+
+
+def test_build_commands_formats_defaults_once(example1_config, monkeypatch):
+    step = example1_config.steps["run training"]
+    formatted = []
+    original_format_cli = Parameter.format_cli
+
+    def counting_format_cli(self, value):
+        formatted.append(self.name)
+        return original_format_cli(self, value)
+
+    monkeypatch.setattr(Parameter, "format_cli", counting_format_cli)
+    commands = list(step.build_commands({"num-epochs": list(range(100))}))
+    assert len(commands) == 100
+    assert formatted.count("num-epochs") == 100
+    defaults = step.get_parameter_defaults(include_flags=False)
+    assert defaults
+    for name in defaults:
+        if name != "num-epochs":
+            assert formatted.count(name) == 1
+
+
+def _format_map_bits(template, name, value):
+    # The previous implementation of `Parameter.format_cli`'s atom formatting.
+    env = {"name": name, "value": value, "v": value}
+    return [bit.format_map(env) for bit in template.split()]
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "--{name}={value}",
+        "--{name} {value}",
+        "-{name}{v}{v}",
+        "{name}={value}={name} {{literal}} {{{value}}}",
+        "--flag",
+        "{value:>8} {value:.2f}",
+        "{value!r}",
+        "{name.upper}",
+        "{value:{name}}",
+        "{other}",
+        "{}",
+        "{0}",
+        "{value",
+        "value}",
+    ],
+)
+@pytest.mark.parametrize("value", ["x", "with space", 3, 2.5, True, -0.0])
+def test_pass_as_formatter_matches_format_map(template, value):
+    formatter = compile_pass_as(template, "my-param")
+    try:
+        expected = _format_map_bits(template, "my-param", value)
+    except Exception as exc:
+        with pytest.raises(type(exc)):
+            formatter.format(value)
+    else:
+        assert formatter.format(value) == expected
+
+
+def test_pass_as_formatter_fast_path():
+    formatter = compile_pass_as("--{name}={value}", "seed")
+    assert compile_pass_as("--{name}={value}", "seed") is formatter
+    assert formatter.bit_parts == [("--seed=", "")]
+    assert compile_pass_as("{value!r}", "seed").bit_parts is None
+    parameter = Parameter(name="files", type="string", multiple="repeat", pass_as="-f {v}")
+    assert parameter.format_cli(["a", "b c"]) == ["-f", "a", "-f", "b c"]
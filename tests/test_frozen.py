@@ -0,0 +1,109 @@
+import glob
+import os
+import pickle
+
+import pytest
+
+from tests.consts import examples_path
+from valohai_yaml import parse
+from valohai_yaml.excs import FrozenItemError
+from valohai_yaml.objs import Step
+from valohai_yaml.objs.utils import FrozenDict, FrozenList
+from valohai_yaml.pipelines.conversion import PipelineConverter
+
+example_paths = sorted(glob.glob(os.path.join(examples_path, "*.yaml")))
+
+
+def _read(yaml_path):
+    with open(yaml_path) as infp:
+        return infp.read()
+
+
+def _lint_messages(config):
+    return [(m["type"], m["message"]) for m in config.lint().messages]
+
+
+@pytest.mark.parametrize("yaml_path", example_paths, ids=os.path.basename)
+def test_frozen_config_behaves_like_mutable(yaml_path):
+    source = _read(yaml_path)
+    mutable = parse(source)
+    frozen = parse(source, frozen=True)
+    assert frozen.frozen
+    assert not mutable.frozen
+    assert frozen.serialize() == mutable.serialize()
+    assert _lint_messages(frozen) == _lint_messages(mutable)
+    for name, step in frozen.steps.items():
+        assert step.build_command({}) == mutable.steps[name].build_command({})
+    for name, pipeline in frozen.pipelines.items():
+        converted = PipelineConverter(config=frozen, commit_identifier="latest").convert_pipeline(pipeline)
+        expected = PipelineConverter(config=mutable, commit_identifier="latest").convert_pipeline(
+            mutable.pipelines[name],
+        )
+        assert converted == expected
+
+
+@pytest.mark.parametrize("yaml_path", example_paths, ids=os.path.basename)
+def test_frozen_config_equality(yaml_path):
+    source = _read(yaml_path)
+    a = parse(source, frozen=True)
+    b = parse(source, frozen=True)
+    assert a is not b
+    assert a == b
+    assert hash(a) == hash(b)
+    assert {a: "x"}[b] == "x"
+    assert pickle.loads(pickle.dumps(a)) == a
+    assert parse(source, lazy=True, frozen=True) == a
+    # Unfrozen items are still compared by identity
+    assert parse(source) != parse(source)
+    assert parse(source) != a
+
+
+def test_frozen_config_is_immutable():
+    config = parse(_read(os.path.join(examples_path, "example1.yaml")), frozen=True)
+    step = config.steps["run training"]
+    parameter = step.parameters["num-epochs"]
+    with pytest.raises(FrozenItemError):
+        step.image = "busybox"
+    with pytest.raises(FrozenItemError):
+        del parameter.default
+    with pytest.raises(TypeError):
+        config.steps["new"] = step
+    with pytest.raises(TypeError):
+        step.parameters.pop("num-epochs")
+    with pytest.raises(TypeError):
+        step.outputs.append("foo")
+    assert isinstance(config.steps, FrozenDict)
+    assert isinstance(step.outputs, FrozenList)
+    assert isinstance(step, Step)
+    assert type(step).__name__ == "Step"
+    # Internal state can still be set, so e.g. lookup indexes work
+    assert config.get_step_by(image=step.image) is config.steps[next(iter(config.steps))]
+
+
+def test_frozen_config_equality_is_structural():
+    source = _read(os.path.join(examples_path, "pipeline-example.yaml"))
+    a = parse(source, frozen=True)
+    mutable = parse(source)
+    mutable.steps["Train model"].image = "busybox:latest"
+    b = mutable.freeze()
+    assert a != b
+    assert a.steps["Test model"] == b.steps["Test model"]
+    assert a.steps["Train model"] != b.steps["Train model"]
+    assert a.pipelines == b.pipelines
+
+
+def test_thawed_and_merged_frozen_config():
+    source = _read(os.path.join(examples_path, "example1.yaml"))
+    frozen = parse(source, frozen=True)
+    thawed = frozen.thawed()
+    assert not thawed.frozen
+    assert not thawed.steps["run training"].frozen
+    assert thawed.serialize() == frozen.serialize()
+    thawed.steps["run training"].image = "alpine"
+    thawed.steps["run training"].outputs.append("foo")
+    assert frozen.steps["run training"].image == "busybox"
+
+    merged = frozen.merge_with(parse(source, frozen=True))
+    assert not merged.frozen
+    assert merged.serialize() == parse(source).merge_with(parse(source)).serialize()
+    merged.steps["run training"].image = "alpine"
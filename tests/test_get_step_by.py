@@ -1,5 +1,6 @@
 from tests.config_data import echo_step, list_step
-from valohai_yaml.objs import Config
+from valohai_yaml import parse
+from valohai_yaml.objs import Config, Step
 
 
 def test_get_step_by_simple_name():
@@ -48,3 +49,67 @@ def test_get_step_by_nothing_returns_none():
 def test_get_step_from_empty_config():
     config = Config.parse([])
     assert not config.get_step_by(name="greeting")
+
+
+def make_steps(n):
+    return [{"step": {"name": f"step-{i}", "image": f"image-{i % 10}", "command": ["echo", f"{i}"]}} for i in range(n)]
+
+
+def test_get_step_by_many_steps():
+    config = Config.parse(make_steps(1000))
+    assert config.get_step_by(name="step-500").command == ["echo", "500"]
+    assert config.get_step_by(index=999).name == "step-999"
+    assert config.get_step_by(name="step-500", index=500)
+    assert not config.get_step_by(name="step-500", index=499)
+    assert not config.get_step_by(name="step-500", image="image-1")
+    assert not config.get_step_by(index=1000)
+    assert not config.get_step_by(index=-1)
+    assert config.get_step_by(image="image-3").name == "step-3"
+    assert config.get_step_by(image="image-3", index=13).name == "step-13"
+    assert config.get_step_by(command=["echo", "123"]).name == "step-123"
+    assert not config.get_step_by(name=["unhashable"])
+
+
+def test_get_step_by_name_or_index_does_not_serialize(monkeypatch):
+    config = Config.parse(make_steps(100))
+
+    def fail(self):
+        raise AssertionError(f"{self.name} should not have been serialized")
+
+    step = config.steps["step-50"]
+    monkeypatch.setattr(Step, "serialize", fail)
+    assert config.get_step_by(name="step-50") is step
+    assert config.get_step_by(index=50) is step
+
+
+def test_get_step_by_indexes_follow_changes():
+    config = Config.parse(make_steps(10))
+    assert config.get_step_by(image="image-3").name == "step-3"
+    del config.steps["step-3"]
+    assert config.get_step_by(image="image-3") is None
+    config.steps["step-3"] = Step.parse(make_steps(4)[3]["step"])
+    assert config.get_step_by(image="image-3", index=9).name == "step-3"
+    config.steps["step-3"].image = "changed"
+    config.clear_step_indexes()
+    assert config.get_step_by(image="changed").name == "step-3"
+    merged = config.merge_with(Config.parse([{"step": {"name": "step-3", "image": "merged", "command": "x"}}]))
+    assert merged.get_step_by(image="merged").name == "step-3"
+    assert not merged.get_step_by(image="changed")
+
+
+def test_get_step_by_never_returns_steps_modified_in_place():
+    config = Config.parse(make_steps(20))
+    assert config.get_step_by(image="image-3").name == "step-3"
+    config.steps["step-3"].image = "changed"
+    assert config.get_step_by(image="image-3").name == "step-13"
+    assert config.get_step_by(image="changed").name == "step-3"  # The index was rebuilt
+    config.steps["step-13"].command.append("more")
+    assert not config.get_step_by(command=["echo", "13"])
+    assert config.get_step_by(command=["echo", "13", "more"]).name == "step-13"
+
+
+def test_get_step_by_lazy_config():
+    config = parse(make_steps(100), lazy=True)
+    assert config.get_step_by(index=50).name == "step-50"
+    assert sum(config.steps.is_parsed(name) for name in config.steps) == 1
+    assert config.get_step_by(image="image-7").name == "step-7"
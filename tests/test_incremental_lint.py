@@ -0,0 +1,129 @@
+import glob
+import os
+
+import pytest
+import yaml
+
+from tests.consts import error_examples_path, examples_path, warning_examples_path
+from valohai_yaml.lint import lint, lint_incremental
+from valohai_yaml.objs import Pipeline, Step
+
+
+def _messages(lr):
+    return [(m["type"], m["message"]) for m in lr.messages]
+
+
+@pytest.mark.parametrize(
+    "yaml_path",
+    sorted(
+        glob.glob(os.path.join(examples_path, "*.yaml"))
+        + glob.glob(os.path.join(error_examples_path, "*.yaml"))
+        + glob.glob(os.path.join(warning_examples_path, "*.yaml")),
+    ),
+    ids=os.path.basename,
+)
+def test_incremental_lint_matches_lint(yaml_path):
+    with open(yaml_path) as infp:
+        source = infp.read()
+    expected = _messages(lint(source))
+    first = lint_incremental(source)
+    assert _messages(first) == expected
+    assert _messages(lint_incremental(source, first)) == expected
+
+
+pipeline_doc = [
+    {"step": {"name": "a", "image": "busybox", "command": "echo a"}},
+    {"step": {"name": "b", "image": "busybox", "command": "echo b"}},
+    {
+        "pipeline": {
+            "name": "p",
+            "nodes": [{"name": "na", "type": "execution", "step": "a"}],
+            "edges": [],
+        },
+    },
+]
+
+
+def _count_lint_calls(monkeypatch):
+    calls = []
+    for cls in (Step, Pipeline):
+        original = cls.lint
+
+        def counting_lint(self, lint_result, context, original=original):
+            calls.append(self.name)
+            return original(self, lint_result, context)
+
+        monkeypatch.setattr(cls, "lint", counting_lint)
+    return calls
+
+
+def test_incremental_lint_only_relints_changed_items(monkeypatch):
+    calls = _count_lint_calls(monkeypatch)
+    first = lint_incremental(yaml.safe_dump(pipeline_doc))
+    assert sorted(calls) == ["a", "b", "p"]
+    assert first.config.steps["b"].command == "echo b"
+
+    calls.clear()
+    doc = [dict(d) for d in pipeline_doc]
+    doc[1] = {"step": {"name": "b", "image": "busybox", "command": "echo bee"}}
+    second = lint_incremental(yaml.safe_dump(doc), first)
+    assert calls == ["b"]  # the pipeline doesn't reference `b`
+    assert second.config.steps["b"].command == "echo bee"
+    assert second.config.steps["a"] is first.config.steps["a"]
+    assert _messages(second) == _messages(lint(doc))
+
+
+def test_incremental_lint_relints_dependent_pipelines(monkeypatch):
+    calls = _count_lint_calls(monkeypatch)
+    first = lint_incremental(pipeline_doc)
+    assert first.is_valid()
+
+    calls.clear()
+    doc = [pipeline_doc[1], pipeline_doc[2]]  # step `a` removed
+    second = lint_incremental(doc, first)
+    assert calls == ["p"]
+    assert _messages(second) == [("error", 'Pipeline "p" node "na" step "a" does not exist')]
+
+    calls.clear()
+    third = lint_incremental(pipeline_doc, second)
+    assert sorted(calls) == ["a", "p"]
+    assert third.is_valid()
+
+
+def test_incremental_lint_duplicate_names():
+    first = lint_incremental(pipeline_doc)
+    doc = [*pipeline_doc, {"step": {"name": "a", "image": "busybox", "command": "echo a2"}}]
+    second = lint_incremental(doc, first)
+    assert _messages(second) == _messages(lint(doc))
+    assert ("warning", "Duplicate step name: a.") in _messages(second)
+    assert _messages(lint_incremental(pipeline_doc, second)) == []
+
+
+def test_incremental_lint_schema_errors_keep_indices():
+    doc = [*pipeline_doc, {"step": {"name": "c"}}]
+    first = lint_incremental(doc)
+    assert _messages(first) == _messages(lint(doc))
+    doc = [{"step": {"name": "c"}}, *pipeline_doc]  # the same erroneous item, moved
+    assert _messages(lint_incremental(doc, first)) == _messages(lint(doc))
+
+
+def test_incremental_lint_identical_erroneous_items():
+    doc = [{"step": {"name": "c"}}] * 2
+    expected = _messages(lint(doc))
+    assert any("(0.step)" in message for (_, message) in _messages(lint(doc, ansi_colors=False)))
+    result = lint_incremental(doc)
+    for _ in range(3):
+        assert _messages(result) == expected
+        result = lint_incremental(doc, result)
+    moved = [*pipeline_doc, *doc]
+    assert _messages(lint_incremental(moved, result)) == _messages(lint(moved))
+
+
+def test_incremental_lint_identical_items_get_their_own_states():
+    doc = [*pipeline_doc, pipeline_doc[0]]
+    first = lint_incremental(doc)
+    second = lint_incremental(doc, first)
+    assert _messages(second) == _messages(lint(doc))
+    states = list(second._incremental_state.values())
+    assert len({id(state) for state in states}) == len(doc)
+    assert states == list(first._incremental_state.values())
@@ -7,7 +7,9 @@ from tests.utils import (
     get_valid_example_path,
     get_warning_example_path,
 )
-from valohai_yaml.lint import lint_file
+from valohai_yaml.lint import lint, lint_file, lint_incremental
+from valohai_yaml.types import SourceLocation
+from valohai_yaml.utils.yaml_loaders import load_yaml_with_locations
 
 
 @pytest.mark.parametrize(
@@ -86,3 +88,50 @@ def test_expression_lint_fail(file_path, expected_message):
     items = lint_file(get_error_example_path(file_path))
     messages = [item["message"] for item in chain(items.hints, items.errors)]
     assert any(expected_message in message for message in messages), messages
+
+
+def test_lint_locations():
+    result = lint_file(get_error_example_path("step-missing-required-properties.yaml"))
+    image_error = next(m for m in result.errors if m["path"] == [0, "step", "image"])
+    assert image_error["location"] == SourceLocation(line=2, column=5)
+
+    result = lint_file(get_warning_example_path("nonsensical-task-bits.yaml"))
+    warning = next(result.warnings)
+    assert warning["path"] == [1, "task"]
+    assert warning["location"] == SourceLocation(line=10, column=3)
+
+
+def test_lint_locations_follow_moved_items():
+    doc = """
+- step:
+    name: foo
+    image: foo
+    command: foo
+    stop-condition: "{{ nope"
+"""
+    padding = "- step: {name: bar, image: bar, command: bar}\n"
+    first = lint_incremental(doc)
+    second = lint_incremental(padding + doc, first)
+    assert [m["location"] for m in first.errors] == [SourceLocation(line=2, column=3)]
+    assert [m["location"] for m in second.errors] == [SourceLocation(line=3, column=3)]
+    assert [m["location"] for m in lint(padding + doc).errors] == [SourceLocation(line=3, column=3)]
+
+
+def test_lint_preparsed_data_has_no_locations():
+    result = lint([{"step": {"name": "c"}}])
+    assert all(m["location"] is None for m in result.messages)
+
+
+def test_load_yaml_with_locations():
+    data, locations = load_yaml_with_locations("- a: [1, 2]\n  b:\n    c: d\n")
+    assert data == [{"a": [1, 2], "b": {"c": "d"}}]
+    assert locations == {
+        (): (1, 1),
+        (0,): (1, 3),
+        (0, "a"): (1, 3),
+        (0, "a", 0): (1, 7),
+        (0, "a", 1): (1, 10),
+        (0, "b"): (2, 3),
+        (0, "b", "c"): (3, 5),
+    }
+    assert load_yaml_with_locations("") == (None, {})
@@ -1,10 +1,20 @@
+import copy
+import os
+
+import pytest
+
 from tests.config_data import (
     complex_step,
     complex_step_alt,
     complex_steps_merged,
     echo_step,
 )
-from valohai_yaml.objs import Config
+from tests.consts import examples_path
+from valohai_yaml import parse
+from valohai_yaml.excs import FrozenItemError
+from valohai_yaml.objs import Config, Override
+from valohai_yaml.pipelines.conversion import PipelineConverter
+from valohai_yaml.utils.merge import merge_dicts, merge_item, merge_simple
 
 
 def test_merging():
@@ -22,3 +32,158 @@ def test_merging_conflict():
     c = a.merge_with(b)
     expected = Config.parse([complex_steps_merged])
     assert c.serialize() == expected.serialize()
+
+
+def _deepcopying_merge_with_step(a, step):
+    # The previous, copying implementation of `Override.merge_with_step`
+    override = a.thawed() if a else Override()
+    for attr in ("parameters", "inputs", "environment_variables"):
+        merged = merge_dicts(getattr(step, attr), getattr(override, attr), merger=merge_simple, copier=copy.deepcopy)
+        setattr(override, attr, merged)
+    return override
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+@pytest.mark.parametrize("example", ["pipeline-example.yaml", "pipeline-with-override-example.yaml"])
+def test_override_merge_with_step(example, frozen):
+    with open(os.path.join(examples_path, example)) as infp:
+        config = parse(infp, frozen=frozen)
+    original = config.serialize()
+    for pipeline in config.pipelines.values():
+        for node in pipeline.nodes:
+            if not getattr(node, "step", None) or node.step not in config.steps:
+                continue
+            step = config.steps[node.step]
+            merged = Override.merge_with_step(node.override, step)
+            expected = _deepcopying_merge_with_step(node.override, step)
+            assert merged.serialize() == expected.serialize()
+            assert Override.serialize_to_template(merged) == Override.serialize_to_template(expected)
+            assert merged.frozen
+            overridden = node.override.parameters if node.override else {}
+            for name, parameter in merged.parameters.items():
+                assert parameter.frozen
+                # Frozen parameters can be shared as-is; mutable ones never are.
+                assert (parameter is step.parameters[name]) == (frozen and name not in overridden)
+                assert hash(parameter) == hash(parameter.thawed().freeze())
+                with pytest.raises(FrozenItemError):
+                    parameter.default = "changed"
+            for parameter in merged.thawed().parameters.values():
+                parameter.default = "changed"
+    assert config.serialize() == original
+
+
+def _old_merge_simple(a, b):
+    a = copy.deepcopy(a)
+    a.__dict__.update(copy.deepcopy(b).__dict__)
+    return a
+
+
+def _old_merge_step(a, b):
+    result = _old_merge_simple(a, b)
+    for attr in ("parameters", "inputs", "environment_variables"):
+        merged = merge_dicts(getattr(a, attr), getattr(b, attr), merger=_old_merge_simple, copier=copy.deepcopy)
+        setattr(result, attr, merged)
+    result.outputs = a.outputs[:] + b.outputs[:]
+    result.environment_variable_groups = a.environment_variable_groups + b.environment_variable_groups
+    result.cache_volumes = a.cache_volumes + b.cache_volumes
+    return result
+
+
+def _old_merge_config(a, b):
+    # The previous, deep-copying implementation of `Config.default_merge`
+    result = _old_merge_simple(a, b)
+    result.steps = merge_dicts(a.steps, b.steps, merger=_old_merge_step, copier=copy.deepcopy)
+    for attr in ("endpoints", "pipelines", "deployments"):
+        merged = merge_dicts(getattr(a, attr), getattr(b, attr), merger=_old_merge_simple, copier=copy.deepcopy)
+        setattr(result, attr, merged)
+    return result
+
+
+@pytest.mark.parametrize("example", ["example1.yaml", "pipeline-example.yaml", "pipeline-with-tasks-example.yaml"])
+def test_merge_engine_matches_deepcopying_merge(example):
+    with open(os.path.join(examples_path, example)) as infp:
+        source = infp.read()
+    a = parse(source)
+    b = parse(source)
+    for step in b.steps.values():
+        step.image = "other-image"
+        step.cache_volumes.append("/cache")
+        if step.parameters:
+            step.parameters.popitem()
+    merged = a.merge_with(b)
+    assert merged.serialize() == _old_merge_config(a, b).serialize()
+    # Nothing mutable is shared with the inputs
+    for name, step in merged.steps.items():
+        assert step.image == "other-image"
+        assert step.parameters is not a.steps[name].parameters
+        for param_name, parameter in step.parameters.items():
+            assert parameter is not a.steps[name].parameters[param_name]
+            assert parameter.choices is None or parameter.choices is not a.steps[name].parameters[param_name].choices
+    for name, pipeline in merged.pipelines.items():
+        assert pipeline.nodes is not b.pipelines[name].nodes
+
+
+def test_merge_item():
+    class Thing:
+        def __init__(self, **kwargs) -> None:  # noqa: ANN003
+            self.__dict__.update(kwargs)
+
+    a = Thing(name="a", tags=["x"], counts={"a": 1}, nested=(1, "a"), _cache="a")
+    b = Thing(name="b", tags=["y"], counts={"b": 2}, _cache="b")
+    merged = merge_item(a, b, field_mergers={"counts": lambda ca, cb: {**ca, **cb}})
+    assert type(merged) is Thing
+    assert vars(merged) == {"name": "b", "tags": ["y"], "counts": {"a": 1, "b": 2}, "nested": (1, "a"), "_cache": "b"}
+    assert merged.tags is not b.tags  # copied
+    assert merged.nested is a.nested  # immutable, so not copied
+    assert vars(a)["name"] == "a"  # inputs are untouched
+    copies = []
+    merge_item(a, b, copier=lambda value: copies.append(value) or value)
+    assert copies == [b.tags, b.counts]
+
+
+def test_override_merge_with_step_leaves_nested_items_mutable():
+    config = parse(
+        [
+            {
+                "step": {
+                    "name": "s",
+                    "image": "busybox",
+                    "command": "true",
+                    "parameters": [
+                        {"name": "p", "type": "integer", "widget": {"type": "slider", "settings": {"a": 1}}},
+                        {"name": "q", "type": "string"},
+                    ],
+                },
+            },
+            {
+                "pipeline": {
+                    "name": "pl",
+                    "nodes": [
+                        {
+                            "name": "n",
+                            "type": "execution",
+                            "step": "s",
+                            "override": {
+                                "parameters": [
+                                    {"name": "q", "type": "string", "widget": {"type": "text", "settings": {"b": 1}}},
+                                ],
+                            },
+                        },
+                    ],
+                    "edges": [],
+                },
+            },
+        ],
+    )
+    step = config.steps["s"]
+    override = config.pipelines["pl"].get_node_by(name="n").override
+    merged = Override.merge_with_step(override, step)
+    assert merged.parameters["p"].widget.frozen
+    assert merged.parameters["q"].widget.frozen
+    PipelineConverter(config=config, commit_identifier="latest").convert_pipeline(config.pipelines["pl"])
+    for widget in (step.parameters["p"].widget, override.parameters["q"].widget):
+        assert not widget.frozen
+        widget.settings["c"] = 2
+        widget.type = "changed"
+    assert merged.parameters["p"].widget.settings == {"a": 1}
+    assert merged.parameters["q"].widget.type == "text"
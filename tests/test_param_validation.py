@@ -55,3 +55,56 @@ def test_choice(case):
     with pytest.raises(ValidationErrors):
         param.validate(case)
     param.validate("blep")
+
+
+def test_validator_is_memoized_until_settings_change():
+    param = Parameter(name="test", type="integer", min=0, max=10, choices=list(range(10000)))
+    validator = param.get_validator()
+    assert param.get_validator() is validator
+    assert validator.choice_set is not None
+    assert param.validate("5") == 5
+    param.max = 100000
+    assert param.get_validator() is not validator
+    param.validate(9999)
+    param.choices = [1, 2, 3]
+    with pytest.raises(ValidationErrors) as exc_info:
+        param.validate(9999)
+    assert list(exc_info.value) == ["9999 is not among the choices allowed ([1, 2, 3])"]
+    param.choices.append(9999)  # modified in place
+    param.clear_validator()
+    assert param.validate(9999) == 9999
+
+
+def test_choices_set_lookup_matches_list():
+    param = Parameter(name="test", type="float", choices=[1, 2.5, "x"])
+    assert param.validate("1") == 1.0
+    assert param.validate(2.5) == 2.5
+    with pytest.raises(ValidationErrors):
+        param.validate("3")
+    # Unhashable choices fall back to comparing to each choice
+    param = Parameter(name="test", choices=[["a"], "b"])
+    assert param.get_validator().choice_set is None
+    assert param.validate("b") == "b"
+    with pytest.raises(ValidationErrors):
+        param.validate("a")
+
+
+def test_step_validate_parameter_values(example1_config):
+    step = example1_config.steps["run training"]
+    assert step.validate_parameter_values({}) == {}
+    assert step.validate_parameter_values({"num-epochs": "20", "seed": None}) == {}
+    errors = step.validate_parameter_values(
+        {
+            "num-epochs": "a lot",
+            "decoder-spec": ["a", "b"],
+            "nope": 1,
+        },
+    )
+    assert errors == {
+        "num-epochs": ["a lot is not an integer"],
+        "decoder-spec": ["Only a single value is allowed"],
+        "nope": ["Unknown parameter 'nope'"],
+    }
+    step.parameters["seed"].optional = False
+    step.parameters["seed"].default = None
+    assert step.validate_parameter_values({}) == {"seed": ["No value supplied"]}
@@ -1,4 +1,13 @@
+import copy
+import glob
+import os
+import pickle
+
+import pytest
+
+from tests.consts import examples_path, warning_examples_path
 from valohai_yaml import parse
+from valohai_yaml.objs.utils import LazyItemMap
 
 
 def test_unknown_parse():
@@ -6,3 +15,44 @@ def test_unknown_parse():
     lint_result = cfg.lint()
     assert lint_result.warning_count == 1
     assert list(lint_result.warnings)[0]["message"] == "No parser for {'city_name': 'Constantinople'}"
+
+
+@pytest.mark.parametrize(
+    "yaml_path",
+    sorted(glob.glob(os.path.join(examples_path, "*.yaml")) + glob.glob(os.path.join(warning_examples_path, "*.yaml"))),
+    ids=os.path.basename,
+)
+def test_lazy_parse_matches_eager(yaml_path):
+    with open(yaml_path) as infp:
+        source = infp.read()
+    eager = parse(source, validate=False)
+    lazy = parse(source, validate=False, lazy=True)
+    assert lazy.serialize() == eager.serialize()
+    assert [m["message"] for m in lazy.lint().messages] == [m["message"] for m in eager.lint().messages]
+
+
+def test_lazy_parse_only_parses_accessed_items():
+    data = [{"step": {"name": f"step-{i}", "image": "busybox", "command": f"echo {i}"}} for i in range(500)]
+    data.append({"step": {"name": "step-0", "image": "busybox", "command": "echo again"}})
+    config = parse(data, lazy=True)
+    assert isinstance(config.steps, LazyItemMap)
+    assert len(config.steps) == 500
+    assert "step-42" in config.steps
+    assert not config.steps.is_parsed("step-42")
+    assert config.steps["step-42"].command == "echo 42"
+    assert config.steps.is_parsed("step-42")
+    assert sum(config.steps.is_parsed(name) for name in config.steps) == 1
+    # The last duplicate wins, in the position of the first one, like when parsing eagerly
+    assert list(config.steps)[0] == "step-0"
+    assert config.steps["step-0"].command == "echo again"
+    assert [m["message"] for m in config.lint().warnings] == ["Duplicate step name: step-0."]
+
+
+def test_lazy_parse_copies():
+    with open(os.path.join(examples_path, "example1.yaml")) as infp:
+        source = infp.read()
+    config = parse(source, lazy=True)
+    copied = pickle.loads(pickle.dumps(config))
+    assert copied.serialize() == copy.deepcopy(config).serialize() == parse(source).serialize()
+    merged = config.merge_with(parse(source, lazy=True))
+    assert merged.serialize() == parse(source).merge_with(parse(source)).serialize()
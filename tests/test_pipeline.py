@@ -1,6 +1,6 @@
 from tests.utils import get_error_example_path, get_warning_example_path
 from valohai_yaml.lint import lint_file
-from valohai_yaml.objs import Config, DeploymentNode, ExecutionNode
+from valohai_yaml.objs import Config, DeploymentNode, ExecutionNode, Override, TaskNode
 from valohai_yaml.objs.pipelines.node import ErrorAction
 
 
@@ -197,3 +197,88 @@ def test_pipeline_runtime_config_preset_override_requires_environment():
     assert not lint_result.is_valid()
     errors = list(lint_result.errors)
     assert any('missing "environment"' in e["message"] for e in errors)
+
+
+def test_pipeline_index_is_cached_and_invalidated(pipeline_config: Config):
+    pipeline = pipeline_config.pipelines["My little pipeline"]
+    index = pipeline.get_index()
+    assert pipeline.get_index() is index
+    assert list(pipeline.node_map) == [node.name for node in pipeline.nodes]
+    assert [edge.target for edge in index.edges_by_source["batch1"]] == [
+        edge.target for edge in pipeline.edges if edge.source_node == "batch1"
+    ]
+
+    # Renaming a node, adding a node or rewiring an edge invalidates the index
+    pipeline.nodes[0].name = "renamed"
+    assert "renamed" in pipeline.node_map
+    pipeline.nodes.append(ExecutionNode(name="extra", step="run training"))
+    assert "extra" in pipeline.node_map
+    pipeline.edges[0].source = "extra.parameter.foo"
+    assert pipeline.get_index().edges_by_source["extra"] == [pipeline.edges[0]]
+    assert "_index_cache" not in pipeline.serialize()
+
+
+def large_pipeline_config(n_nodes):
+    return Config.parse(
+        [
+            {"step": {"name": "s", "image": "busybox", "command": "true", "parameters": [{"name": "p"}]}},
+            {
+                "pipeline": {
+                    "name": "big",
+                    "nodes": [{"name": f"n{i}", "type": "execution", "step": "s"} for i in range(n_nodes)],
+                    "edges": [[f"n{i}.parameter.p", f"n{i + 1}.parameter.p"] for i in range(n_nodes - 1)],
+                    "parameters": [{"name": "p", "targets": [f"n{i}.parameter.p" for i in range(n_nodes)]}],
+                },
+            },
+        ],
+    )
+
+
+def test_large_pipeline_lint_builds_index_once(monkeypatch):
+    from valohai_yaml.objs.pipelines.pipeline import PipelineIndex
+
+    config = large_pipeline_config(2000)
+    builds = []
+    original_build = PipelineIndex.build
+    monkeypatch.setattr(PipelineIndex, "build", lambda *args: builds.append(1) or original_build(*args))
+    assert config.lint().is_valid()
+    assert len(builds) == 1
+
+
+def test_get_node_by_fast_paths(monkeypatch):
+    pipeline = large_pipeline_config(1000).pipelines["big"]
+    pipeline.nodes.append(TaskNode(name="task-node", task="some-task"))
+    pipeline.nodes.append(ExecutionNode(name="n5", step="other"))
+
+    def fail(self):
+        raise AssertionError("should not serialize")
+
+    monkeypatch.setattr(ExecutionNode, "serialize", fail)
+    assert pipeline.get_node_by(name="n500") is pipeline.nodes[500]
+    assert pipeline.get_node_by(name="n5", step="other") is pipeline.nodes[-1]
+    assert pipeline.get_node_by(type="task").name == "task-node"
+    assert pipeline.get_node_by(task="some-task").name == "task-node"
+    assert pipeline.get_node_by(step="s", type="execution") is pipeline.nodes[0]
+    assert not pipeline.get_node_by(name="n5", type="task")
+    assert not pipeline.get_node_by(name="nope")
+    assert not pipeline.get_node_by(name=["unhashable"])
+    assert not pipeline.get_node_by(task=None)
+
+
+def test_get_node_by_memoizes_serialization(pipeline_config: Config, monkeypatch):
+    pipeline = pipeline_config.pipelines["My little pipeline"]
+    node = pipeline.get_node_by(name="batch1")
+    assert pipeline.get_node_by(**{"on-error": "stop-all"}) is None  # elided default; all nodes now memoized
+    calls = []
+    original_serialize = ExecutionNode.serialize
+    monkeypatch.setattr(ExecutionNode, "serialize", lambda self: calls.append(self) or original_serialize(self))
+    assert pipeline.get_node_by(name="batch1", commit=None) is None
+    assert not calls
+    node.on_error = ErrorAction.CONTINUE  # invalidates the memoized serialization
+    assert pipeline.get_node_by(**{"on-error": "continue"}) is node
+    assert calls == [node]
+    assert pipeline.get_node_by(**{"on-error": "continue"}) is node
+    assert calls == [node]
+    node.override = Override(image="other")  # replacing a nested object invalidates it too
+    assert pipeline.get_node_by(override={"image": "other"}) is node
+    assert calls == [node, node]
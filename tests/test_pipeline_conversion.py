@@ -1,3 +1,5 @@
+import copy
+
 from valohai_yaml.objs import Config
 from valohai_yaml.pipelines.conversion import PipelineConverter
 from valohai_yaml.utils.duration import parse_duration_string
@@ -153,3 +155,97 @@ def test_pipeline_conversion_env_vars_are_dict(pipeline_with_env_vars_config: Co
     ), "environment-variables should be a dict, not a list, for API compatibility"
     assert node["template"]["environment-variables"]["DATA_VERSION"] == "v1.0"
     assert node["template"]["environment-variables"]["PREPROCESS_MODE"] == "full"
+
+
+def test_pipeline_conversion_execution_plan(pipeline_config: Config):
+    pipeline = pipeline_config.pipelines["My medium pipeline"]
+    converter = PipelineConverter(config=pipeline_config, commit_identifier="latest")
+    result = converter.convert_pipeline(pipeline)
+    assert "plan" not in result
+    result = converter.convert_pipeline(pipeline, include_plan=True)
+    plan = result["plan"]
+    assert plan == converter.get_execution_plan(pipeline)
+    assert sorted(name for wave in plan["waves"] for name in wave) == sorted(node["name"] for node in result["nodes"])
+    levels = {name: level for (level, wave) in enumerate(plan["waves"]) for name in wave}
+    for edge in result["edges"]:
+        assert levels[edge["source_node"]] < levels[edge["target_node"]]
+    assert len(plan["critical_path"]) == len(plan["waves"])
+    for name, node_plan in plan["nodes"].items():
+        assert node_plan["level"] == levels[name]
+        assert node_plan["critical"] == (name in plan["critical_path"])
+        assert node_plan["in_degree"] == len({e["source_node"] for e in result["edges"] if e["target_node"] == name})
+        assert node_plan["fan_out"] == len({e["target_node"] for e in result["edges"] if e["source_node"] == name})
+
+
+def test_pipeline_batch_conversion(pipeline_with_parameters_config):
+    pipeline = next(iter(pipeline_with_parameters_config.pipelines.values()))
+    argument_sets = [{}] + [{parameter.name: f"value-{i}"} for i, parameter in enumerate(pipeline.parameters)]
+    converter = PipelineConverter(config=pipeline_with_parameters_config, commit_identifier="latest")
+    payloads = converter.iter_convert_pipeline_batch(pipeline, argument_sets, include_plan=True)
+    assert not isinstance(payloads, list)  # a generator
+    payloads = list(payloads)
+    assert len(payloads) == len(argument_sets)
+    for arguments, payload in zip(argument_sets, payloads):
+        expected = PipelineConverter(
+            config=pipeline_with_parameters_config,
+            commit_identifier="latest",
+            parameter_arguments=arguments,
+        ).convert_pipeline(pipeline, include_plan=True)
+        assert payload == expected
+    # Modifying one payload (even deep within it) doesn't affect the others
+    first, second = payloads[0], payloads[1]
+    expected_second = copy.deepcopy(second)
+    first["nodes"][0]["template"].setdefault("parameters", {})["run-id"] = 1
+    first["nodes"].append({"name": "extra"})
+    first["edges"].clear()
+    first["plan"]["waves"].clear()
+    next(iter(first["parameters"].values()))["config"]["name"] = "changed"
+    assert second == expected_second
+    assert converter.convert_pipeline_batch(pipeline, argument_sets[:1]) == [converter.convert_pipeline(pipeline)]
+
+
+def test_pipeline_conversion_template_cache(pipeline_overridden_config: Config):
+    pipeline = pipeline_overridden_config.pipelines["My overriden input pipeline"]
+    converter = PipelineConverter(config=pipeline_overridden_config, commit_identifier="latest")
+    first = converter.convert_pipeline(pipeline)
+    info = converter.template_cache_info()
+    assert info.misses == info.currsize == len({node["name"] for node in first["nodes"]})
+    second = converter.convert_pipeline(pipeline)
+    assert second == first
+    assert converter.template_cache_info().hits == info.misses
+    converter.clear_template_cache()
+    assert converter.template_cache_info() == (0, 0, None, 0)
+
+
+def test_pipeline_conversion_template_cache_fan_out():
+    steps = [{"step": {"name": f"step-{i}", "image": "busybox", "command": "true"}} for i in range(4)]
+    nodes = [{"name": f"node-{i}", "type": "execution", "step": f"step-{i % 4}"} for i in range(300)]
+    nodes.append(
+        {"name": "overridden", "type": "execution", "step": "step-0", "override": {"image": "other"}},
+    )
+    config = Config.parse([*steps, {"pipeline": {"name": "fan-out", "nodes": nodes, "edges": []}}])
+    converter = PipelineConverter(config=config, commit_identifier="latest")
+    result = converter.convert_pipeline(config.pipelines["fan-out"])
+    assert converter.template_cache_info()[:2] == (296, 5)
+    templates = {node["name"]: node["template"] for node in result["nodes"]}
+    assert templates["node-0"] == templates["node-4"]
+    assert templates["node-0"] is not templates["node-4"]
+    assert templates["overridden"]["image"] == "other"
+    assert templates["node-0"]["image"] == "busybox"
+
+
+def test_pipeline_conversion_template_cache_isolation(pipeline_overridden_config: Config):
+    pipeline = pipeline_overridden_config.pipelines["My overriden input pipeline"]
+    converter = PipelineConverter(config=pipeline_overridden_config, commit_identifier="latest")
+    expected = PipelineConverter(config=pipeline_overridden_config, commit_identifier="latest").convert_pipeline(
+        pipeline,
+    )
+    for node in converter.convert_pipeline(pipeline)["nodes"]:
+        template = node["template"]
+        template.setdefault("parameters", {})["hacked"] = "HACK"
+        template.setdefault("inputs", {}).clear()
+        template.setdefault("runtime_config", {})["hacked"] = True
+        if isinstance(template.get("command"), list):
+            template["command"].append("HACK")
+    assert converter.convert_pipeline(pipeline) == expected
+    assert converter.template_cache_info().hits > 0
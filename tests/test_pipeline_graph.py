@@ -0,0 +1,86 @@
+import pytest
+
+from tests.utils import get_error_example_path
+from valohai_yaml.excs import ValidationError
+from valohai_yaml.lint import lint_file
+from valohai_yaml.objs.pipelines.graph import PipelineGraph
+
+
+def make_graph(edges, node_names="abcdef"):
+    return PipelineGraph(node_names, [tuple(edge) for edge in edges])
+
+
+def test_graph_sorting():
+    graph = make_graph(["ab", "ac", "bd", "cd", "de", "ad", "ad", "ax"])  # duplicate and dangling edges are ignored
+    assert graph.successors[0] == [1, 2, 3]
+    assert not graph.has_cycles()
+    assert graph.find_cycle() is None
+    assert graph.get_topological_order() == ["a", "f", "b", "c", "d", "e"]
+    assert graph.get_levels() == [["a", "f"], ["b", "c"], ["d"], ["e"]]
+    assert graph.get_depths() == {"a": 0, "f": 0, "b": 1, "c": 1, "d": 2, "e": 3}
+
+
+def test_graph_reachability():
+    graph = make_graph(["ab", "bc", "ad", "ef"])
+    assert graph.get_descendants("a") == {"b", "c", "d"}
+    assert graph.get_ancestors("c") == {"a", "b"}
+    assert graph.get_ancestors("a") == set()
+    assert graph.is_reachable("a", "c")
+    assert not graph.is_reachable("c", "a")
+    assert not graph.is_reachable("a", "f")
+
+
+@pytest.mark.parametrize(
+    "edges, cycle",
+    [
+        (["aa"], ["a", "a"]),
+        (["ab", "bc", "cb", "cd"], ["b", "c", "b"]),
+        (["ab", "bc", "cd", "da", "de"], ["a", "b", "c", "d", "a"]),
+    ],
+)
+def test_graph_cycles(edges, cycle):
+    graph = make_graph(edges)
+    assert graph.has_cycles()
+    assert graph.find_cycle() == cycle
+    with pytest.raises(ValidationError, match="cycle"):
+        graph.get_topological_order()
+    with pytest.raises(ValidationError, match="cycle"):
+        graph.get_levels()
+    assert graph.get_descendants("a") >= set(cycle[1:])
+
+
+def test_large_graph():
+    n = 20_000
+    names = [f"n{i}" for i in range(n)]
+    # A chain, with every node also depending on its predecessor's predecessor
+    edges = [(names[i], names[i + 1]) for i in range(n - 1)] + [(names[i], names[i + 2]) for i in range(n - 2)]
+    graph = PipelineGraph(names, edges)
+    assert graph.get_topological_order() == names
+    assert len(graph.get_levels()) == n
+    assert len(graph.get_ancestors(names[-1])) == n - 1
+    graph = PipelineGraph(names, [*edges, (names[-1], names[0])])
+    assert len(graph.find_cycle()) == n + 1
+
+
+def test_pipeline_graph(pipeline_config):
+    pipeline = pipeline_config.pipelines["My little pipeline"]
+    graph = pipeline.get_graph()
+    assert pipeline.get_graph() is graph
+    assert graph.get_topological_order()[0] == "batch1"
+    assert graph.get_levels()[0] == ["batch1"]
+    pipeline.edges.pop()
+    assert pipeline.get_graph() is not graph
+
+
+def test_cyclic_pipeline_lint():
+    result = lint_file(get_error_example_path("cyclic-pipeline.yaml"))
+    assert [error["message"] for error in result.errors] == [
+        "Pipeline cyclic-pipeline has a cycle: second -> third -> second",
+    ]
+
+
+def test_graph_critical_path():
+    assert make_graph(["ab", "ac", "bd", "cd", "de", "ad"]).get_critical_path() == ["a", "b", "d", "e"]
+    assert make_graph(["ef", "ab", "bc"]).get_critical_path() == ["a", "b", "c"]
+    assert make_graph([]).get_critical_path() == ["a"]
+    assert PipelineGraph([], []).get_critical_path() == []
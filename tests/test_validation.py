@@ -1,8 +1,13 @@
 import glob
+import io
+import json
 import os
+import pathlib
 import re
 
 import pytest
+import yaml
+from jsonschema import Draft202012Validator
 
 from tests.consts import (
     error_examples_path,
@@ -13,8 +18,11 @@ from tests.consts import (
     valid_obj,
     warning_examples_path,
 )
-from valohai_yaml import ValidationErrors, validate
+from valohai_yaml import ValidationErrors, is_valid, parse, validate
 from valohai_yaml.__main__ import main
+from valohai_yaml.utils import read_yaml
+from valohai_yaml.utils.lint_formats import LintResultWriter
+from valohai_yaml.validation import check_structure, get_json_schema, get_validator
 
 
 def assert_validation_output(capsys, snapshot, yaml_path: str, sort_output: bool = False) -> bool:
@@ -99,3 +107,145 @@ def test_error_list():
     assert any(("Additional properties are not allowed" in err) for err in errs)  # pragma: no branch
     assert any(("required property" in err) for err in errs)  # pragma: no branch
     assert any(("0 is not of type 'string'" in err) for err in errs)
+
+
+@pytest.mark.parametrize(
+    "yaml_path",
+    sorted(
+        glob.glob(os.path.join(examples_path, "*.yaml"))
+        + glob.glob(os.path.join(error_examples_path, "*.yaml"))
+        + glob.glob(os.path.join(warning_examples_path, "*.yaml")),
+    ),
+    ids=os.path.basename,
+)
+def test_precrawled_validator_matches_generic_validator(yaml_path):
+    """Test that the validator with a pre-crawled schema registry reports exactly what a generic one does."""
+    try:
+        with open(yaml_path) as infp:
+            data = read_yaml(infp)
+    except yaml.YAMLError:
+        return
+
+    def describe(errors):
+        return [
+            (e.message, e.validator, list(e.path), list(e.schema_path), list(e.relative_schema_path)) for e in errors
+        ]
+
+    generic_validator = Draft202012Validator(get_json_schema())
+    assert describe(get_validator().iter_errors(data)) == describe(generic_validator.iter_errors(data))
+    assert describe(get_validator().iter_errors(invalid_obj)) == describe(generic_validator.iter_errors(invalid_obj))
+
+
+def test_fail_fast():
+    assert len(validate(invalid_obj, raise_exc=False)) > 1
+    assert len(validate(invalid_obj, raise_exc=False, fail_fast=True)) == 1
+    with pytest.raises(ValidationErrors) as ei:
+        parse(invalid_obj, fail_fast=True)
+    assert len(ei.value.errors) == 1
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        valid_obj,
+        [],
+        [{"deployment": {"name": "x"}}],
+    ],
+)
+def test_is_valid(data):
+    assert is_valid(data)
+    assert check_structure(data)
+
+
+@pytest.mark.parametrize(
+    "data, structurally_ok",
+    [
+        (invalid_obj, False),
+        ({"step": {}}, False),
+        (["step"], False),
+        ([{"pipeline": []}], False),
+        ([{"step": {"name": "foo", "command": "foo", "image": "foo", "upload-store": 0}}], True),
+    ],
+)
+def test_is_not_valid(data, structurally_ok):
+    assert not is_valid(data)
+    assert check_structure(data) == structurally_ok
+    assert validate(data, raise_exc=False)  # structural check must agree with the full validation
+
+
+def test_parallel_cli(capsys):
+    """Test that linting in parallel outputs exactly what linting sequentially does."""
+    paths = sorted(glob.glob(os.path.join(error_examples_path, "*.yaml")))
+    paths += sorted(glob.glob(os.path.join(warning_examples_path, "*.yaml")))
+    assert main(["--no-colors", *paths]) == 1
+    sequential_out = capsys.readouterr().out
+    assert main(["--no-colors", "--jobs", "2", *paths]) == 1
+    assert capsys.readouterr().out == sequential_out
+    assert re.search(r"\*\*\* \d+ errors, \d+ warnings", sequential_out)
+
+
+def test_cli_negative_jobs(capsys):
+    paths = sorted(glob.glob(os.path.join(error_examples_path, "*.yaml")))[:2]
+    with pytest.raises(SystemExit) as ei:
+        main(["--jobs", "-1", *paths])
+    assert ei.value.code == 2
+    assert "must not be negative" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("output_format", ["json", "ndjson", "sarif"])
+def test_machine_readable_cli(capsys, output_format):
+    paths = [
+        os.path.join(error_examples_path, "step-missing-required-properties.yaml"),
+        os.path.join(examples_path, "example1.yaml"),
+        os.path.join(warning_examples_path, "duplicate_step_names.yaml"),
+    ]
+    assert main(["--format", output_format, *paths]) == 1
+    out = capsys.readouterr().out
+    if output_format == "ndjson":
+        entries = [json.loads(line) for line in out.splitlines()]
+    elif output_format == "json":
+        entries = json.loads(out)
+    else:
+        sarif = json.loads(out)
+        assert sarif["version"] == "2.1.0"
+        results = sarif["runs"][0]["results"]
+        assert {r["level"] for r in results} == {"error", "warning"}
+        entries = [
+            {
+                "file": r["locations"][0]["physicalLocation"]["artifactLocation"]["uri"],
+                "message": r["message"]["text"],
+            }
+            for r in results
+        ]
+    expected_files = {paths[0], paths[2]}
+    if output_format == "sarif":
+        expected_files = {pathlib.Path(path).as_uri() for path in expected_files}
+    assert {entry["file"] for entry in entries} == expected_files
+    assert not any("\033[" in entry["message"] for entry in entries)
+    if output_format != "sarif":
+        assert any(entry["severity"] == "error" and entry["path"] == "$[0].step" for entry in entries)
+        assert any(entry["severity"] == "warning" and entry["path"] is None for entry in entries)
+
+
+def test_sarif_relative_paths(capsys, monkeypatch):
+    monkeypatch.chdir(os.path.dirname(error_examples_path))
+    path = os.path.join(os.path.basename(error_examples_path), "cyclic-pipeline.yaml")
+    assert main(["--format", "sarif", path]) == 1
+    (run,) = json.loads(capsys.readouterr().out)["runs"]
+    base_uri = run["originalUriBaseIds"]["%SRCROOT%"]["uri"]
+    assert base_uri == pathlib.Path(os.path.dirname(error_examples_path)).as_uri() + "/"
+    artifact_location = run["results"][0]["locations"][0]["physicalLocation"]["artifactLocation"]
+    assert artifact_location == {"uri": "error_examples/cyclic-pipeline.yaml", "uriBaseId": "%SRCROOT%"}
+
+
+def test_incomplete_lint_result_writer():
+    class IncompleteWriter(LintResultWriter):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        IncompleteWriter(io.StringIO())
+
+
+def test_empty_machine_readable_cli(capsys):
+    assert main(["--format", "json", os.path.join(examples_path, "example1.yaml")]) == 0
+    assert json.loads(capsys.readouterr().out) == []
@@ -0,0 +1,153 @@
+import glob
+import os
+
+import pytest
+import yaml
+
+from tests.consts import error_examples_path, examples_path
+from valohai_yaml.lint import lint
+from valohai_yaml.objs import Config
+from valohai_yaml.types import SourceLocation
+from valohai_yaml.utils import read_yaml, yaml_loaders
+from valohai_yaml.utils.yaml_loaders import (
+    get_yaml_loader,
+    get_yaml_loader_names,
+    load_yaml_with_locations,
+    register_yaml_loader,
+)
+
+conformance_paths = sorted(
+    glob.glob(os.path.join(examples_path, "*.yaml")) + glob.glob(os.path.join(error_examples_path, "*.yaml")),
+)
+
+malformed_sources = [
+    "- a: [1, 2\n- b",
+    "- step:\n    name: x\n  image: y\n   command: z\n",
+    "- step: {name: x\n",
+    "foo: 'bar\n",
+    "- a\nb: c\n",
+    "\t- a",
+]
+
+
+def _describe_yaml_error(exc):
+    mark = getattr(exc, "problem_mark", None)
+    return ("yaml-error", type(exc).__name__, str(exc), mark and (mark.line, mark.column))
+
+
+def _parse_with(path: str, loader: str):
+    with open(path, "rb") as infp:
+        try:
+            data = read_yaml(infp, loader=loader)
+        except Exception as exc:
+            return _describe_yaml_error(exc)
+    try:
+        return ("config", Config.parse(data).serialize())
+    except Exception as exc:
+        return ("parse-error", type(exc).__name__, str(exc))
+
+
+@pytest.mark.parametrize("loader", get_yaml_loader_names())
+@pytest.mark.parametrize("path", conformance_paths, ids=os.path.basename)
+def test_loader_conformance(path, loader):
+    """Test that every registered loader produces an identical `Config` for every example."""
+    assert _parse_with(path, loader) == _parse_with(path, "pyyaml")
+
+
+@pytest.mark.parametrize("loader", get_yaml_loader_names())
+@pytest.mark.parametrize("path", conformance_paths, ids=os.path.basename)
+def test_loader_lint_conformance(path, loader):
+    with open(path, "rb") as infp:
+        data = infp.read()
+    try:
+        loaded = read_yaml(data, loader=loader)
+    except Exception:
+        return  # covered by `test_loader_conformance`
+    expected = read_yaml(data, loader="pyyaml")
+    assert _lint_messages(loaded) == _lint_messages(expected)
+
+
+@pytest.mark.parametrize("loader", get_yaml_loader_names())
+@pytest.mark.parametrize("source", malformed_sources)
+def test_loader_error_conformance(source, loader):
+    """Test that every registered loader reports malformed YAML the same way (e.g. at the same line)."""
+    with pytest.raises(Exception) as exc_info:
+        read_yaml(source, loader=loader)
+    with pytest.raises(Exception) as expected_exc_info:
+        read_yaml(source, loader="pyyaml")
+    assert _describe_yaml_error(exc_info.value) == _describe_yaml_error(expected_exc_info.value)
+
+
+@pytest.mark.parametrize("source", malformed_sources)
+def test_lint_reports_pure_python_error_marks(source):
+    with pytest.raises(Exception) as exc_info:
+        read_yaml(source, loader="pyyaml")
+    mark = exc_info.value.problem_mark
+    assert _lint_messages(source) == [("error", f"Indentation Error at line {mark.line + 1}, column {mark.column + 1}")]
+
+
+def _lint_messages(data):
+    return [(m["type"], m["message"]) for m in lint(data, ansi_colors=False).messages]
+
+
+def test_default_loader_is_registered():
+    assert get_yaml_loader() in [get_yaml_loader(name) for name in get_yaml_loader_names()]
+
+
+def test_unknown_loader():
+    with pytest.raises(ValueError, match="Unknown YAML loader"):
+        read_yaml("- step: {}", loader="nonexistent")
+
+
+locations_source = """\
+- base: &base
+    image: busybox
+- step:
+    1: one
+    false: no
+    name: first
+    name: second
+    <<: *base
+"""
+
+
+@pytest.mark.parametrize("loader", get_yaml_loader_names())
+def test_load_yaml_with_locations(loader):
+    data, locations = load_yaml_with_locations(locations_source, loader=loader)
+    assert data == yaml.safe_load(locations_source)
+    assert locations[(1, "step", 1)] == SourceLocation(line=4, column=5)
+    assert locations[(1, "step", False)] == SourceLocation(line=5, column=5)
+    # The last occurrence of a duplicate key wins, as it does for the value
+    assert locations[(1, "step", "name")] == SourceLocation(line=7, column=5)
+    # Merged keys are located in the anchored mapping
+    assert locations[(1, "step", "image")] == SourceLocation(line=2, column=5)
+    assert (1, "step", "1") not in locations
+    assert load_yaml_with_locations(locations_source, loader="pyyaml") == (data, locations)
+
+
+def test_load_yaml_with_locations_uses_registry(monkeypatch):
+    used = []
+
+    class TrackingLoader(yaml.SafeLoader):
+        def __init__(self, stream) -> None:
+            used.append(self)
+            super().__init__(stream)
+
+    monkeypatch.setitem(yaml_loaders._loaders, "tracking", get_yaml_loader("pyyaml"))
+    monkeypatch.setitem(yaml_loaders._loader_classes, "tracking", TrackingLoader)
+    monkeypatch.setattr(yaml_loaders, "DEFAULT_YAML_LOADER", "tracking")
+    assert load_yaml_with_locations("- a: 1")[0] == [{"a": 1}]
+    assert len(used) == 1
+    assert lint("- step: {name: x, image: y, command: z}").messages == []
+    assert len(used) == 2
+
+
+def test_load_yaml_with_locations_needs_loader_class(monkeypatch):
+    monkeypatch.setattr(yaml_loaders, "_loaders", dict(yaml_loaders._loaders))
+    monkeypatch.setattr(yaml_loaders, "_loader_classes", dict(yaml_loaders._loader_classes))
+    register_yaml_loader("plain", yaml.safe_load)
+    assert read_yaml("- a", loader="plain") == ["a"]
+    with pytest.raises(ValueError, match="source locations"):
+        load_yaml_with_locations("- a", loader="plain")
+    with pytest.raises(ValueError, match="Unknown YAML loader"):
+        load_yaml_with_locations("- a", loader="nonexistent")
@@ -1,12 +1,13 @@
 from valohai_yaml.excs import ValidationErrors
 from valohai_yaml.parsing import parse
-from valohai_yaml.validation import validate
+from valohai_yaml.validation import is_valid, validate
 
 __version__ = "0.57.0"
 
 __all__ = [
     "ValidationErrors",
     "__version__",
+    "is_valid",
     "parse",
     "validate",
 ]
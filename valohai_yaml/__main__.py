@@ -3,10 +3,17 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
 
 from valohai_yaml.lint import LintResult, lint
+from valohai_yaml.utils.lint_formats import LINT_RESULT_WRITERS, TextLintResultWriter
 from valohai_yaml.utils.markdown_doc import generate_schema_doc
-from valohai_yaml.validation import get_json_schema
+from valohai_yaml.validation import get_json_schema, get_validator
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -40,6 +47,19 @@ def main(argv: list[str] | None = None) -> int:
         help="disable ANSI colors",
         default=None,
     )
+    ap.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of processes to lint files with in parallel (0 for one per CPU)",
+    )
+    ap.add_argument(
+        "--format",
+        choices=list(LINT_RESULT_WRITERS),
+        default="text",
+        help="output format for lint results",
+    )
     ap.add_argument("file", nargs="*", help="file(s) to validate")
     args = ap.parse_args(argv)
 
@@ -54,7 +74,13 @@ def main(argv: list[str] | None = None) -> int:
     if not args.file:
         ap.error("No input files specified.")
 
-    if args.ansi_colors is None:
+    if args.jobs < 0:
+        ap.error("The number of jobs must not be negative.")
+
+    writer = LINT_RESULT_WRITERS[args.format](sys.stdout)
+    if not writer.human_readable:
+        args.ansi_colors = False
+    elif args.ansi_colors is None:
         try:
             default_ansi_colors = sys.stdout.isatty()
         except Exception:
@@ -62,29 +88,56 @@ def main(argv: list[str] | None = None) -> int:
         args.ansi_colors = default_ansi_colors
 
     errors = warnings = 0
-    for file in args.file:
-        result = process_file(file, ansi_colors=args.ansi_colors)
+    writer.start()
+    for file, result in lint_files(args.file, ansi_colors=args.ansi_colors, jobs=args.jobs):
+        writer.write_result(file, result)
         errors += result.error_count
         warnings += result.warning_count
-
-    if errors or warnings:
-        print(f"*** {errors} errors, {warnings} warnings")
+    writer.finish(errors=errors, warnings=warnings)
 
     return 1 if errors or (args.strict_warnings and warnings) else 0
 
 
 def process_file(file: str, ansi_colors: bool = True) -> LintResult:
-    header_printed = False
+    result = lint_path(file, ansi_colors=ansi_colors)
+    print_result(file, result)
+    return result
+
 
+def lint_path(file: str, ansi_colors: bool = True) -> LintResult:
     with open(file, "rb") as stream:
-        result = lint(stream, ansi_colors=ansi_colors)
-
-    for item in result.messages:
-        if not header_printed:
-            print(">>>", file)
-            header_printed = True
-        print(f"{item['type']}: {item['message']}")
-        print("-" * 60)
+        return lint(stream, ansi_colors=ansi_colors)
+
+
+def print_result(file: str, result: LintResult) -> None:
+    TextLintResultWriter(sys.stdout).write_result(file, result)
+
+
+def lint_files(files: list[str], *, ansi_colors: bool = True, jobs: int = 1) -> Iterator[tuple[str, LintResult]]:
+    """
+    Lint the given files, yielding 2-tuples of filename and result in the order the files were given.
+
+    :param jobs: Number of worker processes to use; 0 for one per CPU. With 1, no worker processes are used.
+    """
+    if jobs == 1 or len(files) <= 1:
+        for file in files:
+            yield (file, lint_path(file, ansi_colors=ansi_colors))
+        return
+    with ProcessPoolExecutor(max_workers=(jobs or None), initializer=_init_lint_worker) as executor:
+        yield from zip(files, executor.map(partial(_lint_path_in_worker, ansi_colors=ansi_colors), files))
+
+
+def _init_lint_worker() -> None:
+    get_validator()  # Warm up the validator once per worker, not once per file
+
+
+def _lint_path_in_worker(file: str, ansi_colors: bool) -> LintResult:
+    result = lint_path(file, ansi_colors=ansi_colors)
+    # Only the messages are needed by the parent process, and not everything
+    # retained in the result (e.g. exceptions) is necessarily picklable.
+    result.config = None
+    for message in result.messages:
+        message["exception"] = None
     return result
 
 
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import abc
+import base64
+import copy
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from valohai_yaml.objs import Config
+    from valohai_yaml.types import YamlReadable
+
+
+# Returned by `BaseParseCache.get()` when there is no entry (as `None` is valid data, for an empty document).
+MISS: Any = object()
+
+
+class CacheInfo(NamedTuple):
+    """Cache statistics, akin to `functools.lru_cache`'s `cache_info()`."""
+
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+def read_yaml_source(yaml: YamlReadable) -> bytes | None:
+    """
+    Read the raw bytes of YAML source for content-addressing.
+
+    Returns None for pre-parsed data, which can't be content-addressed cheaply.
+    """
+    if isinstance(yaml, (dict, list)):
+        return None
+    if isinstance(yaml, str):
+        return yaml.encode("utf-8")
+    if isinstance(yaml, bytes):
+        return yaml
+    content = yaml.read()
+    return content.encode("utf-8") if isinstance(content, str) else content
+
+
+@cache
+def get_schemata_fingerprint() -> str:
+    """Get a fingerprint of the JSON schemata the data is validated against."""
+    from valohai_yaml import schema_data
+
+    return hashlib.sha256(json.dumps(schema_data.SCHEMATA, sort_keys=True).encode()).hexdigest()
+
+
+def get_content_key(source: bytes, *, validate: bool) -> str:
+    """Get a cache key for the given YAML source, specific to this library version and its schemata."""
+    from valohai_yaml import __version__
+
+    hasher = hashlib.sha256()
+    hasher.update(f"{__version__}\0{get_schemata_fingerprint()}\0{int(validate)}\0".encode())
+    hasher.update(source)
+    return hasher.hexdigest()
+
+
+class BaseParseCache(abc.ABC):
+    """Base class for content-addressed caches of loaded (and validated) YAML data."""
+
+    maxsize: int | None = None
+
+    # Whether the data returned by `get()` is shared between hits, and must thus be copied before use.
+    shares_data = True
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @abc.abstractmethod
+    def __len__(self) -> int:  # noqa: D105
+        raise NotImplementedError()
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(hits=self.hits, misses=self.misses, maxsize=self.maxsize, currsize=len(self))
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Any:
+        """Get the data cached for `key`, or `MISS` if there is no (live) entry."""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def put(self, key: str, data: Any) -> None:
+        raise NotImplementedError()
+
+    def parse(
+        self,
+        yaml: YamlReadable,
+        validate: bool = True,
+        fail_fast: bool = False,
+        lazy: bool = False,
+        frozen: bool = False,
+    ) -> Config:
+        """Parse the given YAML data into a `Config` object, going through the cache if possible."""
+        from valohai_yaml.parsing import build_config, load_and_validate
+
+        source = read_yaml_source(yaml)
+        if source is None:  # pre-parsed data; nothing to address by
+            data = load_and_validate(yaml, validate=validate, fail_fast=fail_fast)
+            return build_config(data, lazy=lazy, frozen=frozen)
+        key = get_content_key(source, validate=validate)
+        data = self.get(key)
+        if data is MISS:
+            data = load_and_validate(source, validate=validate, fail_fast=fail_fast)
+            self.put(key, data)
+        if self.shares_data:
+            # Nb: `Config.parse` retains references into the data it's given, so give it a private copy
+            data = copy.deepcopy(data)
+        return build_config(data, lazy=lazy, frozen=frozen)
+
+
+class ParseCache(BaseParseCache):
+    """
+    In-process, content-addressed cache for `valohai_yaml.parse()`.
+
+    Entries are keyed by a hash of the raw YAML bytes and the library version,
+    and hold the loaded (and validated, if requested) data; the expensive YAML loading and
+    schema validation steps are thus skipped on a hit.  Every hit returns a freshly constructed
+    `Config`, so callers are free to modify what they get without corrupting the cached entry.
+
+    Usage:
+        cache = ParseCache(maxsize=256, ttl=600)
+        config = parse(yaml, cache=cache)
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int | None = 128,
+        ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        :param maxsize: Maximum number of entries to keep; least recently used entries are evicted first.
+                        None for unbounded.
+        :param ttl: Maximum age of an entry, in seconds. None for no expiry.
+        :param clock: Clock function used for TTL bookkeeping.
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and self.clock() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, data: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self.clock(), data)
+            self._entries.move_to_end(key)
+            while self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+# Values JSON can't represent (as loaded by `yaml.SafeLoader`) are encoded as single-key objects
+# with one of these keys; data objects that look like those are escaped by encoding them as pairs.
+_TAG_PREFIX = "__vhyc_"
+_TAG_DECODERS: dict[str, Callable[[Any], Any]] = {
+    f"{_TAG_PREFIX}pairs": dict,
+    f"{_TAG_PREFIX}tuple": tuple,
+    f"{_TAG_PREFIX}set": set,
+    f"{_TAG_PREFIX}bytes": base64.b64decode,
+    f"{_TAG_PREFIX}datetime": datetime.datetime.fromisoformat,
+    f"{_TAG_PREFIX}date": datetime.date.fromisoformat,
+}
+
+
+def _encode_json_value(value: Any) -> Any:  # noqa: C901
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, list):
+        return [_encode_json_value(item) for item in value]
+    if isinstance(value, dict):
+        if all(type(key) is str for key in value) and not (len(value) == 1 and next(iter(value)) in _TAG_DECODERS):
+            return {key: _encode_json_value(item) for (key, item) in value.items()}
+        pairs = [[_encode_json_value(key), _encode_json_value(item)] for (key, item) in value.items()]
+        return {f"{_TAG_PREFIX}pairs": pairs}
+    if isinstance(value, tuple):
+        return {f"{_TAG_PREFIX}tuple": [_encode_json_value(item) for item in value]}
+    if isinstance(value, (set, frozenset)):
+        return {f"{_TAG_PREFIX}set": [_encode_json_value(item) for item in value]}
+    if isinstance(value, bytes):
+        return {f"{_TAG_PREFIX}bytes": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, datetime.datetime):  # Nb: before `date`, as it's a subclass
+        return {f"{_TAG_PREFIX}datetime": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {f"{_TAG_PREFIX}date": value.isoformat()}
+    raise TypeError(f"Can't encode {type(value).__name__} in a cache entry")
+
+
+def _decode_json_object(obj: dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        key = next(iter(obj))
+        decoder = _TAG_DECODERS.get(key)
+        if decoder is not None:
+            return decoder(obj[key])
+    return obj
+
+
+def encode_entry_data(data: Any) -> bytes:
+    """
+    Encode loaded YAML data as JSON for a cache entry.
+
+    Unlike e.g. pickle, decoding the data can't run arbitrary code.
+    Values JSON can't represent (such as timestamps, or mappings with non-string keys) are tagged.
+
+    :raises TypeError: if the data contains values that can't be encoded.
+    """
+    return json.dumps(_encode_json_value(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def decode_entry_data(content: bytes) -> Any:
+    """Decode data encoded with `encode_entry_data`."""
+    return json.loads(content, object_hook=_decode_json_object)
+
+
+class DiskParseCache(BaseParseCache):
+    """
+    Persistent, content-addressed cache for `valohai_yaml.parse()`, shareable between processes.
+
+    Entries are stored as files in `directory`, keyed by a hash of the raw YAML bytes,
+    the library version and a fingerprint of the JSON schemata, so upgrading the library
+    implicitly invalidates old entries.  Entries are written to a temporary file
+    and atomically renamed into place, so concurrent readers and writers never see
+    partially written entries.  As every writer of an entry writes equivalent content,
+    it doesn't matter which of racing writers wins, so no file locking is needed.
+
+    Entries are stored as (tagged) JSON, so reading them can't run arbitrary code;
+    tampered entries can still make `parse()` return wrong configurations, though.
+
+    Usage:
+        cache = DiskParseCache("/var/cache/valohai-yaml")
+        config = parse(yaml, cache=cache)
+    """
+
+    shares_data = False
+
+    FORMAT_MAGIC = b"VHYC"
+    FORMAT_VERSION = 2
+    FILE_SUFFIX = ".vhyc"
+
+    def __init__(self, directory: str | os.PathLike[str]) -> None:
+        super().__init__()
+        self.directory = os.fspath(directory)
+
+    def __len__(self) -> int:  # noqa: D105
+        return sum(1 for _ in self._iter_entry_paths())
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}{self.FILE_SUFFIX}")
+
+    def _iter_entry_paths(self) -> Iterator[str]:
+        if not os.path.isdir(self.directory):
+            return
+        for dirpath, _dirnames, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.endswith(self.FILE_SUFFIX):
+                    yield os.path.join(dirpath, filename)
+
+    def clear(self) -> None:
+        for path in list(self._iter_entry_paths()):
+            try:
+                os.unlink(path)
+            except OSError:  # pragma: no cover
+                pass
+        self.hits = self.misses = 0
+
+    def get(self, key: str) -> Any:
+        path = self._get_entry_path(key)
+        try:
+            with open(path, "rb") as infp:
+                header = infp.read(len(self.FORMAT_MAGIC) + 1)
+                if header != self.FORMAT_MAGIC + bytes([self.FORMAT_VERSION]):
+                    raise ValueError(f"{path} is not a version {self.FORMAT_VERSION} cache entry")
+                data = decode_entry_data(infp.read())
+        except FileNotFoundError:
+            data = MISS
+        except Exception:
+            # Corrupt or incompatible entry; get rid of it so it gets rewritten.
+            try:
+                os.unlink(path)
+            except OSError:  # pragma: no cover
+                pass
+            data = MISS
+        if data is MISS:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: Any) -> None:
+        path = self._get_entry_path(key)
+        try:
+            content = encode_entry_data(data)
+        except (TypeError, ValueError, RecursionError):
+            # Data that can't be encoded (e.g. recursive, via YAML aliases) is just not cached.
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as outfp:
+                    outfp.write(self.FORMAT_MAGIC + bytes([self.FORMAT_VERSION]))
+                    outfp.write(content)
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            # The cache is best-effort; failing to write an entry is not fatal.
+            pass
@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import re
 import warnings
+from functools import lru_cache
 from shlex import quote
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 from valohai_yaml.utils import listify
 
 if TYPE_CHECKING:
-    from re import Match
+    from collections.abc import Mapping
 
     from valohai_yaml.objs.parameter_map import ParameterMap
 
@@ -26,29 +27,72 @@ def quote_multiple(args: list[str] | None) -> str:
     return " ".join(quote(arg) for arg in args)
 
 
-def _replace_interpolation(
-    parameter_map: ParameterMap,
-    match: Match[str],
-    special_interpolations: dict[str, str],
-) -> str:
-    value = match.group(1)
+class CommandPlaceholder(NamedTuple):
+    """A `{...}` placeholder within a command; see `compile_command`."""
+
+    text: str  # The placeholder as written, left in place if there is nothing to interpolate.
+    key: str  # The text within the braces.
+    kind: str | None  # "parameters", "parameter", "parameter-value", or None for other keys.
+    parameter_name: str  # The parameter name of "parameter" and "parameter-value" placeholders.
+
+    def render(self, parameter_map: ParameterMap, special_interpolations: Mapping[str, str]) -> str:
+        if self.key in special_interpolations:
+            return quote(special_interpolations[self.key])
+        kind = self.kind
+        if kind == "parameters":
+            return parameter_map.build_quoted_parameters()
+        if kind == "parameter" and self.parameter_name in parameter_map.parameters:
+            return parameter_map.build_quoted_parameter_by_name(self.parameter_name)
+        if kind == "parameter-value" and self.parameter_name in parameter_map.values:
+            return quote(str(parameter_map.values[self.parameter_name]))
+        return self.text
+
+
+class CompiledCommand(NamedTuple):
+    """
+    A command string split into literal segments and placeholders; see `compile_command`.
+
+    There is always one more literal segment than there are placeholders, and they alternate,
+    starting (and ending) with a literal segment.
+    """
+
+    literals: tuple[str, ...]
+    placeholders: tuple[CommandPlaceholder, ...]
 
-    if value in special_interpolations:
-        return quote(special_interpolations[value])
+    def render(self, parameter_map: ParameterMap, special_interpolations: Mapping[str, str]) -> str:
+        bits = [self.literals[0]]
+        for placeholder, literal in zip(self.placeholders, self.literals[1:]):
+            bits.append(placeholder.render(parameter_map, special_interpolations))
+            bits.append(literal)
+        return "".join(bits)
 
-    if value in ("parameters", "params"):
-        return quote_multiple(parameter_map.build_parameters())
 
-    if value.startswith("parameter:"):
-        parameter_name = value.split(":", 1)[1]
-        if parameter_name in parameter_map.parameters:
-            return quote_multiple(parameter_map.build_parameter_by_name(parameter_name))
+def _parse_placeholder(key: str) -> CommandPlaceholder:
+    kind = None
+    parameter_name = ""
+    if key in ("parameters", "params"):
+        kind = "parameters"
+    else:
+        prefix, colon, name = key.partition(":")
+        if colon and prefix in ("parameter", "parameter-value"):
+            kind, parameter_name = prefix, name
+    return CommandPlaceholder(text=f"{{{key}}}", key=key, kind=kind, parameter_name=parameter_name)
 
-    if value.startswith("parameter-value:"):
-        parameter_name = value.split(":", 1)[1]
-        if parameter_name in parameter_map.values:
-            return quote(str(parameter_map.values[parameter_name]))
-    return match.group(0)  # Return the original otherwise
+
+@lru_cache(maxsize=1024)
+def compile_command(command: str) -> CompiledCommand:
+    """
+    Compile a command string into literal segments and placeholders to interpolate parameters etc. into.
+
+    The results are cached, so interpolating into the same command again (e.g. the command of a step,
+    for each of its executions) doesn't need to parse it again.
+    """
+    # With the one group in the regexp, the split alternates between literals and the placeholders' keys.
+    bits = interpolable_re.split(command)
+    return CompiledCommand(
+        literals=tuple(bits[0::2]),
+        placeholders=tuple(_parse_placeholder(key) for key in bits[1::2]),
+    )
 
 
 def build_command(
@@ -84,13 +128,11 @@ def build_command(
         # (There's still naturally the chance for false-positives, so guard against
         #  those value errors and warn about them.)
 
-        if interpolable_re.search(command):
+        compiled_command = compile_command(command)
+        if compiled_command.placeholders:
             try:
-                command = interpolable_re.sub(
-                    lambda match: _replace_interpolation(parameter_map, match, special),
-                    command,
-                )
-            except ValueError as exc:  # pragma: no cover
+                command = compiled_command.render(parameter_map, special)
+            except ValueError as exc:
                 warnings.warn(
                     f"failed to interpolate into {command!r}: {exc}",
                     CommandInterpolationWarning,
@@ -25,3 +25,7 @@ class ValidationErrors(ValidationError):
     def __iter__(self) -> Iterator[ErrorType]:
         """Iterate over the errors contained within."""
         return iter(self.errors)
+
+
+class FrozenItemError(AttributeError):
+    """An attempt to modify a frozen `Item`."""
@@ -1,19 +1,31 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+from collections import deque
 from typing import TYPE_CHECKING, Any, Callable
 
 import yaml as pyyaml
 from jsonschema.exceptions import relevance
 
 from valohai_yaml.excs import ValidationError
-from valohai_yaml.utils import read_yaml
+from valohai_yaml.types import SourceLocation
+from valohai_yaml.utils import read_yaml_with_locations
 from valohai_yaml.utils.terminal import noop_style, style
 from valohai_yaml.validation import get_validator
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Iterable, Iterator
 
-    from valohai_yaml.types import LintResultMessage, YamlReadable
+    from jsonschema import ValidationError as JSONSchemaValidationError
+
+    from valohai_yaml.objs import Config
+    from valohai_yaml.types import (
+        LintResultMessage,
+        ObjectPath,
+        SourceLocationMap,
+        YamlReadable,
+    )
 
 
 class LintResult:
@@ -21,12 +33,42 @@ class LintResult:
 
     def __init__(self) -> None:
         self.messages: list[LintResultMessage] = []
+        # The configuration that was linted, if it could be parsed.
+        self.config: Config | None = None
+        # Map of object paths to source locations, if known.
+        self.source_locations: SourceLocationMap | None = None
+        # State retained by `lint_incremental` for use in the next round.
+        # Keyed by the position and content key of each top-level item.
+        self._incremental_state: dict[tuple[int, str], _IncrementalItemState] = {}
+
+    def find_location(self, path: Iterable[str | int] | None) -> SourceLocation | None:
+        """Find the source location of the object at `path`, or its closest ancestor that has a known location."""
+        if not self.source_locations or path is None:
+            return None
+        path = tuple(path)
+        while path:
+            location = self.source_locations.get(path)
+            if location:
+                return location
+            path = path[:-1]
+        return self.source_locations.get(())
+
+    def locate_messages(self, start: int, path: ObjectPath | None) -> None:
+        """Attribute messages from index `start` onwards that have no path to the object at `path`."""
+        if path is None:
+            return
+        location = self.find_location(path)
+        for message in self.messages[start:]:
+            if message["path"] is None:
+                message["path"] = list(path)
+                message["location"] = message["location"] or location
 
     def add_error(
         self,
         message: str,
-        location: None = None,
+        location: SourceLocation | None = None,
         exception: Exception | None = None,
+        path: list[str | int] | None = None,
     ) -> None:
         self.messages.append(
             {
@@ -34,14 +76,16 @@ class LintResult:
                 "message": message,
                 "location": location,
                 "exception": exception,
+                "path": path,
             },
         )
 
     def add_warning(
         self,
         message: str,
-        location: None = None,
+        location: SourceLocation | None = None,
         exception: Exception | None = None,
+        path: list[str | int] | None = None,
     ) -> None:
         self.messages.append(
             {
@@ -49,14 +93,16 @@ class LintResult:
                 "message": message,
                 "location": location,
                 "exception": exception,
+                "path": path,
             },
         )
 
     def add_hint(
         self,
         message: str,
-        location: None = None,
+        location: SourceLocation | None = None,
         exception: Exception | None = None,
+        path: list[str | int] | None = None,
     ) -> None:
         self.messages.append(
             {
@@ -64,6 +110,7 @@ class LintResult:
                 "message": message,
                 "location": location,
                 "exception": exception,
+                "path": path,
             },
         )
 
@@ -115,8 +162,17 @@ def _validate_json_schema(
     styler: Callable[..., str] = style,
 ) -> int:
     """Validate against the JSON schema; add errors to `lr` and return the number of errors."""
+    return _add_json_schema_errors(lr, get_validator().iter_errors(data), styler)
+
+
+def _add_json_schema_errors(
+    lr: LintResult,
+    errors: Iterable[JSONSchemaValidationError],
+    styler: Callable[..., str] = style,
+) -> int:
+    """Add JSON schema validation errors to `lr` and return the number of errors."""
     errors = sorted(
-        get_validator().iter_errors(data),
+        errors,
         key=lambda error: (relevance(error), repr(error.path)),
     )
     for error in errors:
@@ -128,6 +184,8 @@ def _validate_json_schema(
         styled_path = styler(".".join(obj_path), bold=True)
         lr.add_error(
             f"  {styled_validator} validation on {styled_schema_path}: {styled_message} ({styled_path})",
+            location=lr.find_location(error.path),
+            path=list(error.path),
         )
         # when path has only 2 nodes. it means it has problem in main steps/pipelines/endpoints objects
         if len(error.path) == 2 and not error.instance:
@@ -136,10 +194,29 @@ def _validate_json_schema(
                 f"error in following configuration: {styled_path}",
                 fg="blue",
             )
-            lr.add_hint(styled_hint)
+            lr.add_hint(styled_hint, location=lr.find_location(error.path), path=list(error.path))
     return len(errors)
 
 
+def _read_yaml_for_lint(lr: LintResult, yaml: YamlReadable) -> tuple[bool, Any]:
+    """
+    Read YAML data (and its source locations) for linting.
+
+    On failure, add an error to `lr`. Return a 2-tuple of success and data.
+    """
+    try:
+        data, lr.source_locations = read_yaml_with_locations(yaml)
+        return (True, data)
+    except pyyaml.YAMLError as err:
+        if hasattr(err, "problem_mark"):
+            mark = err.problem_mark
+            indent_error = f"Indentation Error at line {mark.line + 1}, column {mark.column + 1}"
+            lr.add_error(indent_error, location=SourceLocation(line=mark.line + 1, column=mark.column + 1))
+        else:
+            lr.add_error(str(err))
+        return (False, None)
+
+
 def lint(
     yaml: YamlReadable,
     *,
@@ -155,15 +232,8 @@ def lint(
     :param ansi_colors: Whether to use ANSI colors in the output.
     """
     lr = LintResult()
-    try:
-        data = read_yaml(yaml)
-    except pyyaml.YAMLError as err:
-        if hasattr(err, "problem_mark"):
-            mark = err.problem_mark
-            indent_error = f"Indentation Error at line {mark.line + 1}, column {mark.column + 1}"
-            lr.add_error(indent_error)
-        else:
-            lr.add_error(str(err))
+    success, data = _read_yaml_for_lint(lr, yaml)
+    if not success:
         return lr
 
     if validate_schema and _validate_json_schema(
@@ -181,5 +251,187 @@ def lint(
     except ValidationError as err:  # Could happen before we get to linting things
         lr.add_error(str(err), exception=err)
     else:
+        lr.config = config
         config.lint(lr, context={})
     return lr
+
+
+class _IncrementalItemState:
+    """Validation, parsing and linting results for a single top-level item, retained by `lint_incremental`."""
+
+    # Sentinel for "not parsed yet"; `None` means "no parser for this item".
+    NOT_PARSED: Any = object()
+
+    def __init__(self, datum: Any) -> None:
+        self.datum = datum
+        self.schema_errors: list[JSONSchemaValidationError] | None = None
+        self.parsed: Any = self.NOT_PARSED
+        self.parse_error: ValidationError | None = None
+        self.lint_messages: list[LintResultMessage] | None = None
+        self.lint_dependency_key: Any = None
+
+    def get_schema_errors(self, index: int) -> list[JSONSchemaValidationError]:
+        if self.schema_errors is None:
+            # The base schema validates each top-level item on its own,
+            # so validating the item as a single-item document yields the same errors...
+            self.schema_errors = list(get_validator().iter_errors([self.datum]))
+        # ... except for the index of the item in the document (the retained errors are left as they are).
+        return [_relocate_schema_error(error, index) for error in self.schema_errors]
+
+    def parse(self) -> Any:
+        if self.parsed is self.NOT_PARSED and not self.parse_error:
+            from valohai_yaml.objs import Config
+
+            try:
+                self.parsed = Config.parse_top_level_item(self.datum)
+            except ValidationError as err:
+                self.parse_error = err
+        if self.parse_error:
+            raise self.parse_error
+        return self.parsed
+
+
+def _relocate_schema_error(error: JSONSchemaValidationError, index: int) -> JSONSchemaValidationError:
+    error = copy.copy(error)
+    error.path = error.relative_path = deque([index, *list(error.relative_path)[1:]])
+    return error
+
+
+def _match_incremental_states(
+    previous_state: dict[tuple[int, str], _IncrementalItemState],
+    keys: list[str],
+    data: list[Any],
+) -> list[_IncrementalItemState]:
+    """
+    Find the retained state for each top-level item, creating new ones as needed.
+
+    Items are matched to those of the previous round by position and content, then by content alone
+    (so moved items are matched too).  Each retained state is only used for a single item.
+    """
+    exact_matches = [previous_state.pop((index, key), None) for (index, key) in enumerate(keys)]
+    unmatched_by_key: dict[str, list[_IncrementalItemState]] = {}
+    for (_, key), retained_state in previous_state.items():
+        unmatched_by_key.setdefault(key, []).append(retained_state)
+    states = []
+    for index, (key, state) in enumerate(zip(keys, exact_matches)):
+        if state is None:
+            candidates = unmatched_by_key.get(key)
+            state = candidates.pop() if candidates else _IncrementalItemState(data[index])
+        states.append(state)
+    return states
+
+
+def _get_item_content_key(datum: Any) -> str:
+    # `repr` is order-sensitive and tells apart e.g. `1` and `"1"`, which is what we want here.
+    return hashlib.sha256(repr(datum).encode("utf-8")).hexdigest()
+
+
+def _get_pipeline_dependency_key(pipeline: Any, config: Config, item_keys: dict[int, str]) -> Any:
+    """Get a key that changes whenever any step or task the pipeline references changes."""
+    from valohai_yaml.objs import ExecutionNode, TaskNode
+
+    def get_key(item: Any) -> str | None:
+        return item_keys.get(id(item)) if item is not None else None
+
+    key = []
+    for node in pipeline.nodes:
+        if isinstance(node, (ExecutionNode, TaskNode)):
+            if node.step:
+                key.append(("step", node.step, get_key(config.steps.get(node.step))))
+            task_name = getattr(node, "task", None)
+            if task_name:
+                task = config.tasks.get(task_name)
+                key.append(("task", task_name, get_key(task)))
+                if task is not None:
+                    key.append(("step", task.step, get_key(config.steps.get(task.step))))
+    return key
+
+
+def lint_incremental(
+    yaml: YamlReadable,
+    previous: LintResult | None = None,
+    *,
+    validate_schema: bool = True,
+    ansi_colors: bool = True,
+) -> LintResult:
+    """
+    Validate & lint `yaml`, reusing work done for unchanged items in a previous result.
+
+    This is meant for editor integrations that re-lint a document on every change:
+    top-level items are matched to those of the previous round by their content,
+    and only changed items (and pipelines that reference changed steps or tasks) are
+    re-validated, re-parsed and re-linted.  Document-wide checks (such as duplicate names)
+    are always redone.  The resulting messages are the same as `lint()` would produce.
+
+    :param yaml: YAML string or file-like object
+    :param previous: The result of a previous `lint_incremental` call for (an earlier version of) this document.
+    :param validate_schema: Whether to validate against the JSON schema before attempting to parse and lint.
+    :param ansi_colors: Whether to use ANSI colors in the output.
+    """
+    lr = LintResult()
+    success, data = _read_yaml_for_lint(lr, yaml)
+    if not success:
+        return lr
+    if not isinstance(data, list):  # Nothing to be incremental about
+        return lint(data, validate_schema=validate_schema, ansi_colors=ansi_colors)
+
+    keys = [_get_item_content_key(datum) for datum in data]
+    states = _match_incremental_states(dict(previous._incremental_state) if previous else {}, keys, data)
+    lr._incremental_state = {(index, key): state for (index, (key, state)) in enumerate(zip(keys, states))}
+
+    if validate_schema:
+        schema_errors = [error for (index, state) in enumerate(states) for error in state.get_schema_errors(index)]
+        if schema_errors:
+            _add_json_schema_errors(
+                lr,
+                schema_errors,
+                styler=style if ansi_colors else noop_style,  # type: ignore[arg-type]
+            )
+            return lr
+
+    from valohai_yaml.objs import Config
+
+    try:
+        config = Config.from_parsed_items(data, (state.parse() for state in states))
+    except ValidationError as err:
+        lr.add_error(str(err), exception=err)
+        return lr
+    lr.config = config
+
+    _lint_config_incrementally(lr, config, list(zip(keys, states)))
+    return lr
+
+
+def _lint_config_incrementally(
+    lr: LintResult,
+    config: Config,
+    states: list[tuple[str, _IncrementalItemState]],
+) -> None:
+    """Lint `config` like `Config.lint` does, reusing the lint messages retained in `states` where possible."""
+    from valohai_yaml.objs import Pipeline
+
+    item_states = {}
+    item_keys = {}
+    for key, state in states:
+        if state.parsed:
+            item_states[id(state.parsed[1])] = state
+            item_keys[id(state.parsed[1])] = key
+
+    context = {"config": config}
+    for warning in config._parse_warnings or ():
+        lr.add_warning(warning)
+    for items in config.get_lint_iterables():
+        for item in items.values():
+            state = item_states[id(item)]
+            dependency_key = (
+                _get_pipeline_dependency_key(item, config, item_keys) if isinstance(item, Pipeline) else None
+            )
+            if state.lint_messages is None or state.lint_dependency_key != dependency_key:
+                item_lr = LintResult()
+                item.lint(item_lr, context)
+                state.lint_messages = item_lr.messages
+                state.lint_dependency_key = dependency_key
+            start = len(lr.messages)
+            # The items may have moved, so the messages are copied and re-located.
+            lr.messages.extend(dict(message) for message in state.lint_messages)
+            lr.locate_messages(start, config.get_item_path(item))
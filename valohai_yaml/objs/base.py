@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import copy
 from collections import OrderedDict
-from typing import TYPE_CHECKING, Any, Callable, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, TypeVar
 
-from valohai_yaml.objs.utils import serialize_into
+from valohai_yaml.excs import FrozenItemError
+from valohai_yaml.objs.utils import freeze_value, hash_value, serialize_into, thaw_value
 from valohai_yaml.utils.merge import merge_simple
 
 if TYPE_CHECKING:
@@ -20,15 +22,110 @@ class Item:
     Base class for all objects represented in a valohai.yaml file.
 
     Provides basic parsing and serialization.
+
+    Items are mutable, and compared by identity, unless frozen with `freeze()`.
     """
 
     _original_data: Iterable | None = None  # Possible original data dict or list this object was parsed from
 
+    _frozen = False
+    _hash: int | None = None  # Structural hash of a frozen item
+
+    # The frozen variant of this class (see `freeze()`), and the regular class (itself, unless a frozen variant).
+    _frozen_type: ClassVar[type[Item]]
+    _unfrozen_type: ClassVar[type[Item]]
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa: D105
+        super().__init_subclass__(**kwargs)
+        if not issubclass(cls, _FrozenItem):
+            _create_frozen_type(cls)
+
+    def __eq__(self, other: object) -> bool:  # noqa: D105
+        if self is other:
+            return True
+        if not (self._frozen and isinstance(other, Item) and other._frozen):
+            return NotImplemented  # Falls back to identity
+        if type(self) is not type(other) or hash(self) != hash(other):
+            return False
+        return self.get_data() == other.get_data()
+
+    def __hash__(self) -> int:  # noqa: D105
+        if not self._frozen:
+            return object.__hash__(self)
+        if self._hash is None:
+            self._hash = self._get_structural_hash()
+        return self._hash
+
+    def __copy__(self: T) -> T:
+        """Get a shallow copy of this item; copies of frozen items are mutable, but share the frozen values."""
+        inst = object.__new__(self._unfrozen_type)
+        fields = vars(inst)
+        fields.update(vars(self))
+        fields.pop("_hash", None)
+        return inst  # type: ignore[return-value]
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def freeze(self: T) -> T:
+        """
+        Make this item, and all the items and values within it, immutable.
+
+        Mappings are replaced with read-only `FrozenDict`s, lists with `FrozenList`s and sets with frozensets,
+        and setting (non-underscore-prefixed) attributes raises a `FrozenItemError`.
+        A structural hash is computed bottom-up (when first needed), so frozen items can be used as e.g. dict keys
+        and memoization keys, and compared by value; equality checks only need to compare the items' data
+        when their hashes match.
+        Freezing an item that is already frozen does nothing.
+
+        :return: The item itself.
+        """
+        if not self._frozen:
+            self._freeze_fields(copy_items=False)
+        return self
+
+    def frozen_copy(self: T) -> T:
+        """
+        Get a frozen version of this item without modifying it, or any of the items and values within it.
+
+        Items within the item are frozen copies too, unless frozen already; other values are frozen as in `freeze()`.
+
+        :return: A frozen shallow copy of the item, or the item itself if it's frozen already.
+        """
+        if self._frozen:
+            return self
+        inst = copy.copy(self)
+        inst._freeze_fields(copy_items=True)
+        return inst
+
+    def _freeze_fields(self, *, copy_items: bool) -> None:
+        fields = vars(self)
+        for key, value in fields.items():
+            if not key.startswith("_"):
+                fields[key] = freeze_value(value, copy_items=copy_items)
+        fields.pop("_hash", None)  # Could have been copied over from another item
+        # Only frozen items pay for the assignment guard; see `_FrozenItem`.
+        self.__class__ = self._frozen_type  # type: ignore[assignment]
+
+    def _get_structural_hash(self) -> int:
+        return hash((type(self).__qualname__, hash_value(self.get_data())))
+
+    def thawed(self: T) -> T:
+        """Get a mutable deep copy of this item (which need not be frozen)."""
+        if not self._frozen:
+            return copy.deepcopy(self)
+        inst = copy.copy(self)
+        fields = vars(inst)
+        for key, value in fields.items():
+            if not key.startswith("_"):
+                fields[key] = thaw_value(value)
+        return inst
+
     def get_data(self) -> SerializedDict:
         """Get the object's data for serialization."""
-        data = vars(self).copy()
-        data.pop("_original_data", None)
-        return data
+        # Underscore-prefixed attributes (such as `_original_data`, or caches) are not data.
+        return {key: value for (key, value) in vars(self).items() if not key.startswith("_")}
 
     def serialize(self) -> Any:  # type = Any because subclasses may override
         out = OrderedDict()  # type: OrderedDict[str, Any]
@@ -63,8 +160,59 @@ class Item:
     ) -> T:
         if strategy is None:
             strategy = self.default_merge
+        if self._frozen or other._frozen:
+            # The merge strategies build on mutable copies of the items.
+            return strategy(self.thawed() if self._frozen else self, other.thawed() if other._frozen else other)
         return strategy(self, other)
 
     @classmethod
     def default_merge(cls: type[T], a: T, b: T) -> T:
         return merge_simple(a, b)
+
+
+class _FrozenItem:
+    """
+    Mixin for the frozen variants of `Item` classes, which frozen items' classes are switched to.
+
+    Keeping the assignment guard out of the regular classes keeps it from slowing down e.g. parsing.
+    The variants have the same names as the classes they're derived from.
+    """
+
+    _frozen = True
+    _unfrozen_type: ClassVar[type[Item]]
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: D105
+        # Underscore-prefixed attributes (such as caches) are not data, so they can be set on frozen items too.
+        if not name.startswith("_"):
+            raise FrozenItemError(f"Can't set {name!r} on a frozen {type(self).__name__}")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name: str) -> None:  # noqa: D105
+        if not name.startswith("_"):
+            raise FrozenItemError(f"Can't delete {name!r} from a frozen {type(self).__name__}")
+        super().__delattr__(name)
+
+    def __reduce_ex__(self, protocol: Any) -> tuple[Any, ...]:  # noqa: D105
+        # The variant classes can't be looked up by name, so reconstruct via the unfrozen class.
+        # The hash is left out (to be recomputed), as string hashes differ between processes.
+        state = {key: value for (key, value) in vars(self).items() if key != "_hash"}
+        return (_reconstruct_frozen_item, (self._unfrozen_type, state))
+
+
+def _create_frozen_type(cls: type[Item]) -> None:
+    cls._unfrozen_type = cls
+    cls._frozen_type = type(
+        cls.__name__,
+        (_FrozenItem, cls),
+        {"__module__": cls.__module__, "__qualname__": cls.__qualname__, "_unfrozen_type": cls},
+    )
+
+
+def _reconstruct_frozen_item(cls: type[Item], state: dict[str, Any]) -> Item:
+    inst = object.__new__(cls)
+    vars(inst).update(state)
+    inst.__class__ = cls._frozen_type
+    return inst
+
+
+_create_frozen_type(Item)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import copy
-from itertools import chain
+from functools import partial
+from itertools import chain, islice
 from typing import TYPE_CHECKING, Any, Callable
 
 from valohai_yaml.excs import InvalidType
@@ -12,22 +13,37 @@ from valohai_yaml.objs.endpoint import Endpoint
 from valohai_yaml.objs.pipelines.pipeline import Pipeline
 from valohai_yaml.objs.step import Step
 from valohai_yaml.objs.task import Task
-from valohai_yaml.objs.utils import check_type_and_dictify
-from valohai_yaml.types import LintContext, SerializedDict
-from valohai_yaml.utils.lint import lint_iterables
-from valohai_yaml.utils.merge import merge_dicts, merge_simple
+from valohai_yaml.objs.utils import LazyItemMap, check_type_and_dictify
+from valohai_yaml.types import LintContext, ObjectPath, SerializedDict
+from valohai_yaml.utils.merge import merge_dicts, merge_item, merge_simple
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Collection, Iterable, Mapping, MutableMapping
 
 ParserFunction = Callable[[SerializedDict], Any]
 
+# Maps top-level element names to the `Config` attributes the parsed items are stored in.
+TOP_LEVEL_ITEM_ATTRIBUTES = {
+    "step": "steps",
+    "task": "tasks",
+    "endpoint": "endpoints",
+    "pipeline": "pipelines",
+    "blueprint": "pipelines",
+    "deployment": "deployments",
+}
+
 
 class Config(Item):
     """Represents a `valohai.yaml` file."""
 
     # Warnings that may be stuck on the top-level config during its parsing.
-    _parse_warnings = None
+    _parse_warnings: list[str] | None = None
+
+    # Paths of parsed top-level items in the original data, keyed by item object ID.
+    _item_paths: dict[int, ObjectPath] | None = None
+
+    # Indexes for `get_step_by`, built on demand.
+    _step_index: _StepIndex | None = None
 
     def __init__(
         self,
@@ -38,34 +54,121 @@ class Config(Item):
         pipelines: Iterable[Pipeline] = (),
         deployments: Iterable[Deployment] = (),
     ) -> None:
-        self.steps = check_type_and_dictify(steps, Step, "name")
-        self.tasks = check_type_and_dictify(tasks, Task, "name")
-        self.endpoints = check_type_and_dictify(endpoints, Endpoint, "name")
-        self.pipelines = check_type_and_dictify(pipelines, Pipeline, "name")
-        self.deployments = check_type_and_dictify(deployments, Deployment, "name")
+        # These are OrderedDicts, or `LazyItemMap`s for lazily parsed configurations.
+        self.steps: MutableMapping[str, Step] = check_type_and_dictify(steps, Step, "name")
+        self.tasks: MutableMapping[str, Task] = check_type_and_dictify(tasks, Task, "name")
+        self.endpoints: MutableMapping[str, Endpoint] = check_type_and_dictify(endpoints, Endpoint, "name")
+        self.pipelines: MutableMapping[str, Pipeline] = check_type_and_dictify(pipelines, Pipeline, "name")
+        self.deployments: MutableMapping[str, Deployment] = check_type_and_dictify(deployments, Deployment, "name")
 
     @classmethod
-    def parse(cls, data: Iterable) -> Config:
+    def parse(cls, data: Iterable, lazy: bool = False) -> Config:
         """
         Parse a Config structure out of a list of Python dicts (that's likely deserialized from YAML).
 
+        :param data: Config-y iterable container of dicts
+        :param lazy: Whether to only parse each top-level item when it is first accessed; see `parse_lazily`.
+        :return: Config object
+        """
+        if lazy:
+            return cls.parse_lazily(data)
+        return cls.from_parsed_items(data, (cls.parse_top_level_item(datum) for datum in data))
+
+    @classmethod
+    def parse_lazily(cls, data: Iterable) -> Config:
+        """
+        Parse a Config structure out of a list of Python dicts, deferring the parsing of each top-level item.
+
+        The `steps`, `pipelines`, etc. mappings of the returned Config are `LazyItemMap`s
+        that parse items out of their data only when they are first accessed, so e.g. looking up
+        a single step from a large configuration doesn't need to parse all the others.
+        Parse warnings (such as duplicate names) and the serialized form are the same as with eager parsing,
+        but errors in an item's data are only raised when that item is accessed.
+
         :param data: Config-y iterable container of dicts
         :return: Config object
         """
         parsers = cls.get_top_level_parsers()
         parse_warnings: list[str] = []
+        item_paths: dict[int, ObjectPath] = {}
         append_warning_if_not_unique = _get_unique_name_checker(parse_warnings)
+        item_maps: dict[str, LazyItemMap[Any]] = {attr: LazyItemMap() for attr in TOP_LEVEL_ITEM_ATTRIBUTES.values()}
 
-        for datum in data:
-            if not isinstance(datum, dict):
-                raise InvalidType(f"Top-level YAML item {datum} is not a dictionary")
-            for item_type, (items, parse) in parsers.items():
-                if item_type in datum:
-                    items.append(parsed_item := parse(datum[item_type]))
-                    append_warning_if_not_unique(item_type, parsed_item)
-                    break
-            else:
+        for index, datum in enumerate(data):
+            item_type = cls.get_top_level_item_type(datum)
+            if item_type is None:
                 parse_warnings.append(f"No parser for {datum}")
+                continue
+            item_map = item_maps[TOP_LEVEL_ITEM_ATTRIBUTES[item_type]]
+            parse = parsers[item_type][1]
+            item_data = datum[item_type]
+            name = item_data.get("name") if isinstance(item_data, dict) else None
+            if isinstance(name, str):
+                item_map.add_unparsed(name, item_data, parse, _get_item_path_recorder(item_paths, (index, item_type)))
+            else:  # Can't know the name without parsing, so do it now
+                parsed_item = parse(item_data)
+                item_map[parsed_item.name] = parsed_item
+                item_paths[id(parsed_item)] = (index, item_type)
+                name = parsed_item.name
+            append_warning_if_not_unique(item_type, name)
+
+        inst = cls()
+        for attr, item_map in item_maps.items():
+            setattr(inst, attr, item_map)
+        inst._original_data = data
+        inst._parse_warnings = parse_warnings
+        inst._item_paths = item_paths
+        return inst
+
+    @classmethod
+    def get_top_level_item_type(cls, datum: Any) -> str | None:
+        """Get the type of a top-level item of a configuration file, or None if there is no parser for it."""
+        if not isinstance(datum, dict):
+            raise InvalidType(f"Top-level YAML item {datum} is not a dictionary")
+        for item_type in cls.get_top_level_parsers():
+            if item_type in datum:
+                return item_type
+        return None
+
+    @classmethod
+    def parse_top_level_item(cls, datum: Any) -> tuple[str, Any] | None:
+        """
+        Parse a single top-level item of a configuration file.
+
+        :return: 2-tuple of item type and parsed item, or None if there is no parser for the item.
+        """
+        item_type = cls.get_top_level_item_type(datum)
+        if item_type is None:
+            return None
+        parse = cls.get_top_level_parsers()[item_type][1]
+        return (item_type, parse(datum[item_type]))
+
+    @classmethod
+    def from_parsed_items(
+        cls,
+        data: Iterable,
+        parsed_items: Iterable[tuple[str, Any] | None],
+    ) -> Config:
+        """
+        Build a Config out of top-level items parsed with `parse_top_level_item`.
+
+        :param data: The original iterable container of dicts
+        :param parsed_items: The parsed items (or None for unparseable items), in the same order as `data`
+        :return: Config object
+        """
+        parsers = cls.get_top_level_parsers()
+        parse_warnings: list[str] = []
+        item_paths: dict[int, ObjectPath] = {}
+        append_warning_if_not_unique = _get_unique_name_checker(parse_warnings)
+
+        for index, (datum, parsed) in enumerate(zip(data, parsed_items)):
+            if parsed is None:
+                parse_warnings.append(f"No parser for {datum}")
+                continue
+            item_type, parsed_item = parsed
+            parsers[item_type][0].append(parsed_item)
+            item_paths[id(parsed_item)] = (index, item_type)
+            append_warning_if_not_unique(item_type, getattr(parsed_item, "name", None))
 
         inst = cls(
             steps=parsers["step"][0],
@@ -76,8 +179,13 @@ class Config(Item):
         )
         inst._original_data = data
         inst._parse_warnings = parse_warnings
+        inst._item_paths = item_paths
         return inst
 
+    def get_item_path(self, item: Item) -> ObjectPath | None:
+        """Get the path of the given top-level item in the data this configuration was parsed from, if known."""
+        return self._item_paths.get(id(item)) if self._item_paths else None
+
     @classmethod
     def get_top_level_parsers(cls) -> dict[str, tuple[list[Any], ParserFunction]]:
         """
@@ -129,25 +237,36 @@ class Config(Item):
             for warning in self._parse_warnings:
                 lint_result.add_warning(warning)
 
-        lint_iterables(
-            lint_result,
-            context,
-            (
-                self.deployments,
-                self.endpoints,
-                self.pipelines,
-                self.steps,
-                self.tasks,
-            ),
-        )
+        for items in self.get_lint_iterables():
+            for item in items.values():
+                start = len(lint_result.messages)
+                item.lint(lint_result, context)
+                lint_result.locate_messages(start, self.get_item_path(item))
         return lint_result
 
+    def get_lint_iterables(self) -> tuple[Mapping[str, Item], ...]:
+        """Get the collections of top-level items, in the order they are linted in."""
+        return (
+            self.deployments,
+            self.endpoints,
+            self.pipelines,
+            self.steps,
+            self.tasks,
+        )
+
     def get_step_by(self, **kwargs: Any) -> Step | None:
         """
         Get the first step that matches all the passed named arguments.
 
         Has special argument index not present in the real step.
 
+        Lookups by `name` and `index` go straight to the step in question;
+        lookups by other keys use indexes of the serialized steps built on demand.
+        Those indexes are rebuilt when `steps` is changed.  A step found through them is checked against
+        its current serialization (and the indexes rebuilt if it has been modified in place), so a step that
+        doesn't match is never returned; to find steps by values they've been modified in place to have,
+        call `clear_step_indexes()` first.
+
         Usage:
             config.get_step_by(name='not found')
             config.get_step_by(index=0)
@@ -158,40 +277,71 @@ class Config(Item):
         """
         if not kwargs:
             return None
-        for index, step in enumerate(self.steps.values()):
-            extended_step = dict(step.serialize(), index=index)
-            # check if kwargs is a subset of extended_step
-            if all(item in extended_step.items() for item in kwargs.items()):
-                return step
-        return None
+        if "name" in kwargs or isinstance(kwargs.get("index"), int):
+            return self._get_step_by_name_or_index(kwargs)
+        step_index = self._get_step_index()
+        position = step_index.find_position(kwargs)
+        if position is not None and step_index.steps[position].serialize() != step_index.serialized[position]:
+            # The step has been modified in place since the index was built, so rebuild it and look again.
+            step_index = self._step_index = _StepIndex(list(self.steps.values()))
+            position = step_index.find_position(kwargs)
+        return step_index.steps[position] if position is not None else None
+
+    def _get_step_by_name_or_index(self, kwargs: dict[str, Any]) -> Step | None:
+        # The steps are keyed by name, in order, so neither lookup requires serializing the other steps.
+        name: Any = kwargs.get("name")
+        index = kwargs.get("index")
+        if "name" in kwargs:
+            try:
+                step = self.steps.get(name)
+            except TypeError:  # unhashable, so can't be a name
+                return None
+            if step is None:
+                return None
+            if "index" in kwargs and self._get_step_name_at(index) != name:
+                return None
+        else:
+            step_name = self._get_step_name_at(index)
+            if step_name is None:
+                return None
+            step = self.steps[step_name]
+        other_kwargs = {key: value for (key, value) in kwargs.items() if key not in ("name", "index")}
+        if "name" in kwargs and step.name != name:
+            return None
+        if other_kwargs and not _is_subset(other_kwargs, step.serialize()):
+            return None
+        return step
+
+    def _get_step_name_at(self, index: Any) -> str | None:
+        if not isinstance(index, int) or index < 0:
+            return None
+        return next(islice(self.steps, index, None), None)
+
+    def _get_step_index(self) -> _StepIndex:
+        steps = self.steps.values()
+        if self._step_index is None or not self._step_index.is_up_to_date(steps):
+            self._step_index = _StepIndex(list(steps))
+        return self._step_index
+
+    def clear_step_indexes(self) -> None:
+        """Clear the indexes used by `get_step_by`, so steps modified in place are found by their new values."""
+        self._step_index = None
 
     @classmethod
     def default_merge(cls, a: Config, b: Config) -> Config:
-        result = merge_simple(a, b)
-        result.steps = merge_dicts(
-            a.steps,
-            b.steps,
-            merger=Step.default_merge,
-            copier=copy.deepcopy,
-        )
-        result.endpoints = merge_dicts(
-            a.endpoints,
-            b.endpoints,
-            merger=merge_simple,
-            copier=copy.deepcopy,
-        )
-        result.pipelines = merge_dicts(
-            a.pipelines,
-            b.pipelines,
-            merger=merge_simple,
-            copier=copy.deepcopy,
-        )
-        result.deployments = merge_dicts(
-            a.deployments,
-            b.deployments,
-            merger=merge_simple,
-            copier=copy.deepcopy,
+        merge_item_dicts = partial(merge_dicts, merger=merge_simple, copier=copy.deepcopy)
+        result = merge_item(
+            a,
+            b,
+            field_mergers={
+                "steps": partial(merge_dicts, merger=Step.default_merge, copier=copy.deepcopy),
+                "endpoints": merge_item_dicts,
+                "pipelines": merge_item_dicts,
+                "deployments": merge_item_dicts,
+            },
         )
+        result._item_paths = None  # The merged items are not from any one document
+        result._step_index = None
         return result
 
     def __repr__(self) -> str:  # pragma: no cover  # noqa: D105
@@ -212,14 +362,72 @@ def _get_unique_name_checker(parse_warnings: list[str]) -> Callable:
     """
     used_item_names = set()
 
-    def checker(item_type: str, item: Any) -> None:
-        try:
-            if (item_type, item.name) in used_item_names:
-                parse_warnings.append(f"Duplicate {item_type} name: {item.name}.")
-            used_item_names.add((item_type, item.name))
-        except AttributeError:
-            # all current items have a name, but that is not guaranteed for the future
-            # so make sure things don't break if we get a top-level item without a name
-            pass
+    def checker(item_type: str, name: str | None) -> None:
+        # all current items have a name, but that is not guaranteed for the future
+        # so make sure things don't break if we get a top-level item without a name
+        if name is None:
+            return
+        if (item_type, name) in used_item_names:
+            parse_warnings.append(f"Duplicate {item_type} name: {name}.")
+        used_item_names.add((item_type, name))
 
     return checker
+
+
+def _get_item_path_recorder(item_paths: dict[int, ObjectPath], path: ObjectPath) -> Callable[[Item], None]:
+    """Return a function that records `path` as the path of a lazily parsed item in `item_paths`."""
+
+    def recorder(item: Item) -> None:
+        item_paths[id(item)] = path
+
+    return recorder
+
+
+def _is_subset(kwargs: dict[str, Any], data: dict[str, Any]) -> bool:
+    return all(item in data.items() for item in kwargs.items())
+
+
+class _StepIndex:
+    """Indexes of serialized steps by the values of their keys, for `Config.get_step_by`."""
+
+    def __init__(self, steps: list[Step]) -> None:
+        self.steps = steps
+        self.serialized = [step.serialize() for step in steps]
+        self.positions_by_key: dict[str, dict[Any, list[int]]] = {}
+
+    def is_up_to_date(self, steps: Collection[Step]) -> bool:
+        # This is checked on every lookup, so it's done with a single list comparison, which compares
+        # identical items without calling `__eq__`.  Unfrozen steps are only equal if identical;
+        # a frozen step replaced with an equal one would be found as the original, which serializes the same.
+        return len(steps) == len(self.steps) and list(steps) == self.steps
+
+    def find_position(self, kwargs: dict[str, Any]) -> int | None:
+        """Find the position of the first step whose (indexed) serialization matches `kwargs`."""
+        for position in self.get_candidate_positions(kwargs):
+            if _is_subset(kwargs, dict(self.serialized[position], index=position)):
+                return position
+        return None
+
+    def get_candidate_positions(self, kwargs: dict[str, Any]) -> Iterable[int]:
+        """Get the positions of the steps that may match `kwargs`, in order."""
+        for key, value in kwargs.items():
+            if key == "index":
+                continue
+            try:
+                return self.get_positions_by_key(key).get(value, ())
+            except TypeError:  # unhashable value (e.g. a list command); try another key
+                continue
+        return range(len(self.steps))
+
+    def get_positions_by_key(self, key: str) -> dict[Any, list[int]]:
+        positions_by_value = self.positions_by_key.get(key)
+        if positions_by_value is None:
+            positions_by_value = self.positions_by_key[key] = {}
+            for position, data in enumerate(self.serialized):
+                if key not in data:
+                    continue
+                try:
+                    positions_by_value.setdefault(data[key], []).append(position)
+                except TypeError:  # unhashable value, can't be found by a hashable one anyway
+                    pass
+        return positions_by_value
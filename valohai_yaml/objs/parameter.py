@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Union
+from functools import lru_cache
+from string import Formatter
+from typing import TYPE_CHECKING, Any, Callable, Union
 
 from valohai_yaml.excs import InvalidType, ValidationErrors
 from valohai_yaml.objs.base import Item
@@ -40,9 +42,185 @@ ValueAtomType = Union[float, str, int, bool]
 ValueType = Union[list[ValueAtomType], ValueAtomType]
 
 
+def _coerce_integer(value: ValueAtomType, errors: list[str]) -> ValueAtomType:
+    try:
+        return int(str(value), 10)
+    except ValueError:
+        errors.append("No value supplied" if value == "" else f"{value} is not an integer")
+        return value
+
+
+def _coerce_float(value: ValueAtomType, errors: list[str]) -> ValueAtomType:
+    try:
+        return float(str(value))
+    except ValueError:
+        errors.append("No value supplied" if value == "" else f"{value} is not a floating-point number")
+        return value
+
+
+TYPE_COERCERS: dict[str, Callable[[ValueAtomType, list[str]], ValueAtomType]] = {
+    "integer": _coerce_integer,
+    "float": _coerce_float,
+}
+
+
+class ParameterValidator:
+    """
+    Validates (and typecasts) values of a parameter, with its settings bound in advance.
+
+    Get one with `Parameter.get_validator()`.
+    """
+
+    def __init__(self, parameter: Parameter) -> None:
+        self.type = parameter.type
+        self.min = parameter.min
+        self.max = parameter.max
+        self.choices = parameter.choices
+        self.multiple = parameter.multiple
+        self.coerce = TYPE_COERCERS.get(self.type)
+        # For looking up choices in constant time; None if there are no choices, or they're unhashable.
+        self.choice_set: frozenset[Any] | None = None
+        if self.choices is not None:
+            try:
+                self.choice_set = frozenset(self.choices)
+            except TypeError:
+                pass
+
+    def is_up_to_date(self, parameter: Parameter) -> bool:
+        """Find out whether the settings of `parameter` are still those this validator was built with."""
+        return (
+            parameter.choices is self.choices
+            and parameter.type == self.type
+            and parameter.min == self.min
+            and parameter.max == self.max
+            and parameter.multiple == self.multiple
+        )
+
+    def is_choice(self, value: ValueAtomType) -> bool:
+        if self.choice_set is not None:
+            try:
+                return value in self.choice_set
+            except TypeError:  # Unhashable value; fall through to comparing it to each choice
+                pass
+        return value in self.choices  # type: ignore[operator]
+
+    def validate_type(self, value: ValueAtomType, errors: list[str]) -> ValueAtomType:
+        return self.coerce(value, errors) if self.coerce else value
+
+    def validate_value(self, value: ValueAtomType, errors: list[str]) -> ValueAtomType:
+        if self.min is not None:
+            try:
+                if value < self.min:  # type: ignore
+                    errors.append(f"{value} is less than the minimum allowed ({self.min})")
+            except TypeError:  # Could occur if types are incompatible
+                pass
+        if self.max is not None:
+            try:
+                if value > self.max:  # type: ignore
+                    errors.append(f"{value} is greater than the maximum allowed ({self.max})")
+            except TypeError:
+                pass
+        if self.choices is not None and not self.is_choice(value):
+            errors.append(f"{value} is not among the choices allowed ({self.choices!r})")
+        return value
+
+    def validate(self, value: ValueType) -> ValueType:
+        """
+        Validate (and possibly typecast) the given parameter value.
+
+        :param value: Parameter value
+        :return: Typecast parameter value
+        :raises ValidationErrors: if there were validation errors
+        """
+        errors: list[str] = []
+        validated_values = []
+
+        if not self.multiple and isinstance(value, (list, tuple)):
+            errors.append("Only a single value is allowed")
+
+        if value is None:
+            errors.append("No value supplied")
+
+        for atom in listify(value):
+            if isinstance(atom, list):  # type guard
+                raise InvalidType(f"nested list atom {atom!r} not allowed")
+            atom = self.validate_type(atom, errors)
+            atom = self.validate_value(atom, errors)
+            validated_values.append(atom)
+
+        if errors:
+            raise ValidationErrors(errors)
+
+        if self.multiple:
+            return validated_values
+        return validated_values[0]
+
+
+class PassAsFormatter:
+    """
+    Formats parameter values into CLI strings according to a `pass-as` template; see `compile_pass_as`.
+
+    The template is split into whitespace-separated bits, each of which is formatted with
+    the `name` of the parameter and the `value` (or `v`) to pass.
+    """
+
+    # Names that template fields may refer to the value by.
+    VALUE_FIELDS = frozenset({"value", "v"})
+
+    def __init__(self, template: str, name: str) -> None:
+        self.name = name
+        self.bits = template.split()
+        # The literal parts around the value in each bit, with the name already formatted in;
+        # None for templates that must be formatted the slow way, e.g. due to format specs.
+        self.bit_parts: list[tuple[str, ...]] | None = self._compile_bits()
+
+    def _compile_bits(self) -> list[tuple[str, ...]] | None:
+        bit_parts = []
+        for bit in self.bits:
+            parts = []
+            literal = ""
+            try:
+                parsed_bit = list(Formatter().parse(bit))
+            except ValueError:  # Malformed; the error is raised when formatting
+                return None
+            for literal_text, field_name, format_spec, conversion in parsed_bit:
+                literal += literal_text
+                if field_name is None:
+                    continue
+                if format_spec or conversion:
+                    return None
+                if field_name == "name":
+                    literal += format(self.name, "")
+                elif field_name in self.VALUE_FIELDS:
+                    parts.append(literal)
+                    literal = ""
+                else:
+                    return None
+            parts.append(literal)
+            bit_parts.append(tuple(parts))
+        return bit_parts
+
+    def format(self, value: ValueAtomType | None) -> list[str]:
+        if self.bit_parts is None:
+            env = {"name": self.name, "value": value, "v": value}
+            return [bit.format_map(env) for bit in self.bits]
+        # Each value field is formatted the same, so they can be filled in by joining the parts around them.
+        formatted_value = format(value, "")
+        return [formatted_value.join(parts) for parts in self.bit_parts]
+
+
+@lru_cache(maxsize=1024)
+def compile_pass_as(template: str, name: str) -> PassAsFormatter:
+    """Get a (cached) formatter for the `pass-as` template `template` of the parameter `name`."""
+    return PassAsFormatter(template, name)
+
+
 class Parameter(Item):
     """Represents a parameter definition within an execution step definition."""
 
+    # Memoized validator; see `get_validator()`
+    _validator: ParameterValidator | None = None
+
     def __init__(
         self,
         *,
@@ -97,43 +275,26 @@ class Parameter(Item):
             data.pop("multiple_separator", None)
         return data
 
+    def get_validator(self) -> ParameterValidator:
+        """
+        Get a validator for values of this parameter, with its settings bound in advance.
+
+        The validator is memoized, and rebuilt when the settings it depends on are reassigned,
+        but not when `choices` is modified in place; call `clear_validator()` after doing that.
+        """
+        validator = self._validator
+        if validator is None or not validator.is_up_to_date(self):
+            validator = self._validator = ParameterValidator(self)
+        return validator
+
+    def clear_validator(self) -> None:
+        self._validator = None
+
     def _validate_value(self, value: ValueAtomType, errors: list[str]) -> ValueAtomType:
-        try:
-            if self.min is not None and value < self.min:  # type: ignore
-                errors.append(f"{value} is less than the minimum allowed ({self.min})")
-        except TypeError:  # Could occur if types are incompatible
-            pass
-        try:
-            if self.max is not None and value > self.max:  # type: ignore
-                errors.append(
-                    f"{value} is greater than the maximum allowed ({self.max})",
-                )
-        except TypeError:
-            pass
-        if self.choices is not None and value not in self.choices:
-            errors.append(
-                f"{value} is not among the choices allowed ({self.choices!r})",
-            )
-        return value
+        return self.get_validator().validate_value(value, errors)
 
     def _validate_type(self, value: ValueAtomType, errors: list[str]) -> ValueAtomType:
-        if self.type == "integer":
-            try:
-                value = int(str(value), 10)
-            except ValueError:
-                if value == "":
-                    errors.append("No value supplied")
-                else:
-                    errors.append(f"{value} is not an integer")
-        elif self.type == "float":
-            try:
-                value = float(str(value))
-            except ValueError:
-                if value == "":
-                    errors.append("No value supplied")
-                else:
-                    errors.append(f"{value} is not a floating-point number")
-        return value
+        return self.get_validator().validate_type(value, errors)
 
     def validate(self, value: ValueType) -> ValueType:
         """
@@ -143,28 +304,7 @@ class Parameter(Item):
         :return: Typecast parameter value
         :raises ValidationErrors: if there were validation errors
         """
-        errors = []
-        validated_values = []
-
-        if not self.multiple and isinstance(value, (list, tuple)):
-            errors.append("Only a single value is allowed")
-
-        if value is None:
-            errors.append("No value supplied")
-
-        for atom in listify(value):
-            if isinstance(atom, list):  # type guard
-                raise InvalidType(f"nested list atom {atom!r} not allowed")
-            atom = self._validate_type(atom, errors)
-            atom = self._validate_value(atom, errors)
-            validated_values.append(atom)
-
-        if errors:
-            raise ValidationErrors(errors)
-
-        if self.multiple:
-            return validated_values
-        return validated_values[0]
+        return self.get_validator().validate(value)
 
     @property
     def default_pass_as(self) -> str:
@@ -194,11 +334,7 @@ class Parameter(Item):
         if not pass_as_template:
             return None
 
-        pass_as_bits = pass_as_template.split()
-
-        def _format_atom(value: ValueAtomType | None) -> list[str]:
-            env = {"name": self.name, "value": value, "v": value}
-            return [bit.format_map(env) for bit in pass_as_bits]
+        _format_atom = compile_pass_as(pass_as_template, self.name).format
 
         if self.multiple == MultipleMode.REPEAT:
             out = []
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections import ChainMap
 from typing import TYPE_CHECKING
 
+from valohai_yaml.commands import quote_multiple
+
 if TYPE_CHECKING:
     from collections.abc import Mapping
 
@@ -37,3 +40,41 @@ class ParameterMap:
         if value is None:
             return None
         return param.format_cli(value)
+
+    def build_quoted_parameters(self) -> str:
+        """Build the CLI command line from the parameter values, shell-quoted; see `build_parameters`."""
+        quoted_bits = (self.build_quoted_parameter_by_name(name) for name in self.parameters)
+        return " ".join(bits for bits in quoted_bits if bits)
+
+    def build_quoted_parameter_by_name(self, name: str) -> str:
+        return quote_multiple(self.build_parameter_by_name(name))
+
+
+class BatchParameterMap(ParameterMap):
+    """
+    A parameter map for one of many sets of values for the same parameters and defaults.
+
+    The shell-quoted CLI bits for parameters left at their defaults are stored in `default_cache`,
+    which is shared between the parameter maps of a batch, so they're only built once per batch.
+    See `Step.build_commands`.
+    """
+
+    def __init__(
+        self,
+        *,
+        parameters: Mapping[str, Parameter],
+        defaults: Mapping[str, ValueType | None],
+        values: Mapping[str, ValueType | None],
+        default_cache: dict[str, str],
+    ) -> None:
+        super().__init__(parameters=parameters, values=ChainMap(values, defaults))  # type: ignore[arg-type]
+        self.overridden_values = values
+        self.default_cache = default_cache
+
+    def build_quoted_parameter_by_name(self, name: str) -> str:
+        if name in self.overridden_values:
+            return super().build_quoted_parameter_by_name(name)
+        quoted_bits = self.default_cache.get(name)
+        if quoted_bits is None:
+            quoted_bits = self.default_cache[name] = super().build_quoted_parameter_by_name(name)
+        return quoted_bits
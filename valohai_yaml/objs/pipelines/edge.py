@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Any
 
 from valohai_yaml.excs import ValidationError
 from valohai_yaml.objs.pipelines.types import edge_types
+from valohai_yaml.objs.pipelines.validation import get_pipeline_index
 from valohai_yaml.utils.node_socket_utils import split_socket_str
 
 if TYPE_CHECKING:
@@ -89,7 +90,7 @@ class Edge(Item):
 
     def lint(self, lint_result: LintResult, context: LintContext) -> None:
         pipeline: Pipeline = context["pipeline"]
-        node_map = pipeline.node_map
+        node_map = get_pipeline_index(context).node_map
         if self.source_node not in node_map:
             lint_result.add_error(
                 f"Pipeline {pipeline.name} edge source node {self.source_node} does not exist",
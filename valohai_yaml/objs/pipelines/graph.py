@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
+from valohai_yaml.excs import ValidationError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from valohai_yaml.objs.pipelines.pipeline import Pipeline
+
+
+class PipelineGraph:
+    """
+    The dependency graph of a pipeline's nodes, as implied by its edges.
+
+    Nodes are identified by name.  Edges between the same pair of nodes are collapsed into one,
+    and edges referring to nonexistent nodes are ignored (they are reported by linting).
+
+    The graph is stored as integer adjacency lists, and all the operations run in linear time
+    in the number of nodes and edges.  Get one for a pipeline with `Pipeline.get_graph()`.
+    """
+
+    def __init__(self, node_names: Iterable[str], edges: Iterable[tuple[str, str]]) -> None:
+        """
+        Build the graph.
+
+        :param node_names: Names of the nodes, in order.
+        :param edges: 2-tuples of the names of the source and target nodes of each edge.
+        """
+        self.node_names: list[str] = list(dict.fromkeys(node_names))
+        self.node_indices: dict[str, int] = {name: i for (i, name) in enumerate(self.node_names)}
+        n = len(self.node_names)
+        self.successors: list[list[int]] = [[] for _ in range(n)]
+        self.predecessors: list[list[int]] = [[] for _ in range(n)]
+        seen_edges = set()
+        for source, target in edges:
+            source_index = self.node_indices.get(source)
+            target_index = self.node_indices.get(target)
+            if source_index is None or target_index is None or (source_index, target_index) in seen_edges:
+                continue
+            seen_edges.add((source_index, target_index))
+            self.successors[source_index].append(target_index)
+            self.predecessors[target_index].append(source_index)
+        self._order, self._depths = self._sort()
+
+    @classmethod
+    def from_pipeline(cls, pipeline: Pipeline) -> PipelineGraph:
+        return cls(
+            node_names=(node.name for node in pipeline.nodes),
+            edges=((edge.source_node, edge.target_node) for edge in pipeline.edges),
+        )
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.node_names)
+
+    def _sort(self) -> tuple[list[int], list[int]]:
+        """
+        Run Kahn's algorithm over the graph.
+
+        :return: 2-tuple of the indices of the sorted nodes (cyclic nodes, and the ones after them, are left out),
+                 and the depth of each node (the number of edges on the longest path leading to it).
+        """
+        in_degrees = [len(predecessors) for predecessors in self.predecessors]
+        depths = [0] * len(self.node_names)
+        queue = deque(i for (i, in_degree) in enumerate(in_degrees) if in_degree == 0)
+        order = []
+        while queue:
+            i = queue.popleft()
+            order.append(i)
+            for j in self.successors[i]:
+                depths[j] = max(depths[j], depths[i] + 1)
+                in_degrees[j] -= 1
+                if in_degrees[j] == 0:
+                    queue.append(j)
+        return order, depths
+
+    def has_cycles(self) -> bool:
+        return len(self._order) != len(self.node_names)
+
+    def find_cycle(self) -> list[str] | None:
+        """
+        Find a cycle in the graph.
+
+        :return: Names of the nodes forming the cycle, starting and ending with the same node
+                 (the one that comes first in the pipeline), or None.
+        """
+        if not self.has_cycles():
+            return None
+        # Every node that Kahn's algorithm couldn't sort has a predecessor that it couldn't sort either,
+        # so walking backwards through those will eventually loop.
+        unreached = [True] * len(self.node_names)
+        for i in self._order:
+            unreached[i] = False
+        i = unreached.index(True)
+        path_positions: dict[int, int] = {}
+        path: list[int] = []
+        while i not in path_positions:
+            path_positions[i] = len(path)
+            path.append(i)
+            i = next(p for p in self.predecessors[i] if unreached[p])
+        cycle = path[path_positions[i] :]
+        cycle.reverse()
+        # Start from the node that comes first in the pipeline, for a stable result
+        start = cycle.index(min(cycle))
+        cycle = cycle[start:] + cycle[:start]
+        return [self.node_names[j] for j in (*cycle, cycle[0])]
+
+    def _check_acyclic(self) -> None:
+        cycle = self.find_cycle()
+        if cycle:
+            raise ValidationError(f"The pipeline graph has a cycle: {' -> '.join(cycle)}")
+
+    def get_topological_order(self) -> list[str]:
+        """
+        Get the node names so that every node comes after all the nodes it depends on.
+
+        Among nodes that don't depend on each other, the pipeline's order is retained where possible.
+
+        :raises ValidationError: if the graph has a cycle.
+        """
+        self._check_acyclic()
+        return [self.node_names[i] for i in self._order]
+
+    def get_depths(self) -> dict[str, int]:
+        """
+        Get the depth of each node, i.e. the number of edges on the longest path leading to it.
+
+        :raises ValidationError: if the graph has a cycle.
+        """
+        self._check_acyclic()
+        return {self.node_names[i]: self._depths[i] for i in self._order}
+
+    def get_levels(self) -> list[list[str]]:
+        """
+        Group the nodes into levels by their depth.
+
+        All the dependencies of the nodes on a level are on earlier levels,
+        so the nodes on each level can be run in parallel once the previous levels are done.
+
+        :raises ValidationError: if the graph has a cycle.
+        """
+        self._check_acyclic()
+        levels: list[list[str]] = [[] for _ in range(max(self._depths, default=-1) + 1)]
+        for i in self._order:
+            levels[self._depths[i]].append(self.node_names[i])
+        return levels
+
+    def get_critical_path(self) -> list[str]:
+        """
+        Get a longest path (by the number of nodes) through the graph.
+
+        No node on the path can start before the one preceding it is done,
+        so (with no other information on the nodes' durations) this is the critical path of the pipeline.
+        Ties are broken by the order of the nodes in the pipeline.
+
+        :raises ValidationError: if the graph has a cycle.
+        """
+        self._check_acyclic()
+        if not self._order:
+            return []
+        depths = self._depths
+        i = max(self._order, key=lambda i: (depths[i], -i))
+        path = [i]
+        while depths[i]:
+            i = min(p for p in self.predecessors[i] if depths[p] == depths[i] - 1)
+            path.append(i)
+        path.reverse()
+        return [self.node_names[j] for j in path]
+
+    def _walk(self, start: str, adjacency: list[list[int]]) -> set[str]:
+        start_index = self.node_indices[start]
+        visited = bytearray(len(self.node_names))
+        stack = [start_index]
+        found = set()
+        while stack:
+            for j in adjacency[stack.pop()]:
+                if not visited[j]:
+                    visited[j] = 1
+                    found.add(self.node_names[j])
+                    stack.append(j)
+        return found
+
+    def get_descendants(self, name: str) -> set[str]:
+        """Get the names of all the nodes that (transitively) depend on the node `name`."""
+        return self._walk(name, self.successors)
+
+    def get_ancestors(self, name: str) -> set[str]:
+        """Get the names of all the nodes the node `name` (transitively) depends on."""
+        return self._walk(name, self.predecessors)
+
+    def is_reachable(self, source: str, target: str) -> bool:
+        """Find out whether the node `target` (transitively) depends on the node `source`."""
+        return target in self.get_descendants(source)
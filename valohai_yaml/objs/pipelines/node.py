@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from valohai_yaml.objs.base import Item
 from valohai_yaml.objs.pipelines.edge_merge_mode import DEFAULT_EDGE_MERGE_MODE
@@ -49,6 +49,10 @@ class Node(Item):
     # `on_error` what the pipeline should do when this node is erroneous: "stop-all" default, "continue"
     on_error: ErrorAction
 
+    # Memoized serialization for `Pipeline.get_node_by`, along with the attribute values it was made from;
+    # see `get_lookup_data()`
+    _lookup_memo: tuple[list[Any], SerializedDict] | None = None
+
     def __init__(
         self,
         *,
@@ -72,6 +76,22 @@ class Node(Item):
         data["actions"] = consume_array_of(data, "actions", NodeAction)
         return subcls.parse(data)
 
+    def get_lookup_data(self) -> SerializedDict:
+        """
+        Get the serialization of this node for lookups, memoized until an attribute of the node is set.
+
+        Changes within nested objects (e.g. the node's override) are not noticed;
+        call `clear_lookup_data()` after making those.  The returned data must not be modified.
+        """
+        # The memo holds on to the attribute values, so comparing them mostly takes identity checks.
+        values = [value for (key, value) in vars(self).items() if key[0] != "_"]
+        if self._lookup_memo is None or self._lookup_memo[0] != values:
+            self._lookup_memo = (values, self.serialize())
+        return self._lookup_memo[1]
+
+    def clear_lookup_data(self) -> None:
+        self._lookup_memo = None
+
     def serialize(self) -> SerializedDict:
         ser = dict(super().serialize())
         ser["type"] = self.type
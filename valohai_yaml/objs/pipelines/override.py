@@ -11,12 +11,13 @@ from valohai_yaml.objs.mount import Mount
 from valohai_yaml.objs.parameter import Parameter
 from valohai_yaml.objs.step import Step, parse_common_step_properties
 from valohai_yaml.objs.utils import (
+    TItem,
     check_type_and_dictify,
     check_type_and_listify,
     serialize_into,
 )
 from valohai_yaml.utils import listify
-from valohai_yaml.utils.merge import merge_dicts, merge_simple
+from valohai_yaml.utils.merge import merge_dicts, merge_shallow
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -39,6 +40,10 @@ OVERRIDABLE_FIELDS = {
 }
 
 
+def _merge_frozen(a: TItem, b: TItem) -> TItem:
+    return merge_shallow(a, b).frozen_copy()
+
+
 class Override(Item):
     """Represents the step fields overridden in an execution or task node."""
 
@@ -69,27 +74,34 @@ class Override(Item):
 
     @classmethod
     def merge_with_step(cls, a: Override | None, step: Step) -> Override:
-        """Merge an override with a step, returning a new override object."""
-        override = copy.deepcopy(a) if a else cls()
+        """
+        Merge an override with a step, returning a new, frozen override object (see `Item.freeze()`).
+
+        Neither the override nor the step (nor anything within them) are modified, and nothing is deep-copied:
+        parameters, inputs and environment variables that aren't overridden are the step's own objects
+        if those are frozen, and frozen copies of them if not (see `Item.frozen_copy()`).
+        Use `thawed()` on the result to get a mutable copy.
+        """
+        override = copy.copy(a) if a else cls()
         override.parameters = merge_dicts(
             step.parameters,
             override.parameters,
-            merger=merge_simple,
-            copier=copy.deepcopy,
+            merger=_merge_frozen,
+            copier=Item.frozen_copy,
         )
         override.inputs = merge_dicts(
             step.inputs,
             override.inputs,
-            merger=merge_simple,
-            copier=copy.deepcopy,
+            merger=_merge_frozen,
+            copier=Item.frozen_copy,
         )
         override.environment_variables = merge_dicts(
             step.environment_variables,
             override.environment_variables,
-            merger=merge_simple,
-            copier=copy.deepcopy,
+            merger=_merge_frozen,
+            copier=Item.frozen_copy,
         )
-        return override
+        return override.frozen_copy()
 
     @classmethod
     def serialize_to_template(cls, override: Override) -> OrderedDict:
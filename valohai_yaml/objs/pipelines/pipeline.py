@@ -1,18 +1,58 @@
 from __future__ import annotations
 
 from collections import Counter, OrderedDict
-from typing import TYPE_CHECKING, Any
+from operator import attrgetter
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from valohai_yaml.objs.base import Item
 from valohai_yaml.objs.pipelines.edge import Edge
+from valohai_yaml.objs.pipelines.graph import PipelineGraph
 from valohai_yaml.objs.pipelines.node import Node
 from valohai_yaml.objs.pipelines.pipeline_parameter import PipelineParameter
 from valohai_yaml.utils.lint import lint_iterables
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
     from valohai_yaml.lint import LintResult
     from valohai_yaml.types import LintContext, SerializedDict
 
+_get_node_name = attrgetter("name")
+_get_edge_node_names = attrgetter("source_node", "target_node")
+
+
+class PipelineIndex(NamedTuple):
+    """Lookup structures over a pipeline's nodes and edges; see `Pipeline.get_index()`."""
+
+    node_map: Mapping[str, Node]
+    # Nodes by name and type, in pipeline order (unlike `node_map`, which has the last node of each name).
+    nodes_by_name: Mapping[str, list[Node]]
+    nodes_by_type: Mapping[str, list[Node]]
+    # Edges by the names of their source and target nodes, respectively, in pipeline order.
+    edges_by_source: Mapping[str, list[Edge]]
+    edges_by_target: Mapping[str, list[Edge]]
+
+    @classmethod
+    def build(cls, nodes: list[Node], edges: list[Edge]) -> PipelineIndex:
+        nodes_by_name: dict[str, list[Node]] = {}
+        nodes_by_type: dict[str, list[Node]] = {}
+        for node in nodes:
+            nodes_by_name.setdefault(node.name, []).append(node)
+            nodes_by_type.setdefault(node.type, []).append(node)
+        edges_by_source: dict[str, list[Edge]] = {}
+        edges_by_target: dict[str, list[Edge]] = {}
+        for edge in edges:
+            edges_by_source.setdefault(edge.source_node, []).append(edge)
+            edges_by_target.setdefault(edge.target_node, []).append(edge)
+        return cls(
+            node_map=MappingProxyType(OrderedDict((node.name, node) for node in nodes)),
+            nodes_by_name=MappingProxyType(nodes_by_name),
+            nodes_by_type=MappingProxyType(nodes_by_type),
+            edges_by_source=MappingProxyType(edges_by_source),
+            edges_by_target=MappingProxyType(edges_by_target),
+        )
+
 
 class Pipeline(Item):
     """Represents a definition of a pipeline, containing nodes and edges."""
@@ -32,9 +72,57 @@ class Pipeline(Item):
         self.parameters = parameters or []
         self.reuse_executions = reuse_executions
 
+    # Cached `PipelineIndex`, along with the signature of the nodes and edges it was built from.
+    _index_cache: tuple[tuple[Any, ...], PipelineIndex] | None = None
+
     @property
-    def node_map(self) -> OrderedDict:  # type: ignore[type-arg]
-        return OrderedDict((node.name, node) for node in self.nodes)
+    def node_map(self) -> Mapping[str, Node]:
+        """
+        Get a (read-only) mapping of node names to nodes.
+
+        Every access checks that the cached index is up to date, which takes time linear in the number
+        of nodes and edges; for many lookups (e.g. one per edge), hold on to the mapping, or `get_index()`.
+        """
+        return self.get_index().node_map
+
+    def get_index(self) -> PipelineIndex:
+        """
+        Get lookup structures (node map and edge adjacency) for this pipeline.
+
+        The index is cached, and rebuilt whenever nodes or edges have been added, removed, replaced,
+        renamed or reconnected since it was built.  The nodes and edges are plain lists that may be modified
+        in place, so finding that out requires going through them on every call (which is much cheaper than
+        rebuilding the index, but still linear in their number).  Callers doing many lookups should thus
+        hold on to the returned index for as long as they don't modify the pipeline, as linting does.
+        """
+        signature = self._get_index_signature()
+        if self._index_cache is None or self._index_cache[0] != signature:
+            self._index_cache = (signature, PipelineIndex.build(self.nodes, self.edges))
+        return self._index_cache[1]
+
+    # Cached `PipelineGraph`, along with the `PipelineIndex` it was built alongside.
+    _graph_cache: tuple[PipelineIndex, PipelineGraph] | None = None
+
+    def get_graph(self) -> PipelineGraph:
+        """
+        Get the dependency graph of this pipeline's nodes, for topological sorting, cycle detection, etc.
+
+        The graph is cached and rebuilt along with the pipeline index (see `get_index()`).
+        """
+        index = self.get_index()
+        if self._graph_cache is None or self._graph_cache[0] is not index:
+            self._graph_cache = (index, PipelineGraph.from_pipeline(self))
+        return self._graph_cache[1]
+
+    def _get_index_signature(self) -> tuple[Any, ...]:
+        # This is a good deal cheaper than building the index,
+        # since all of the iteration and attribute access happens in C.
+        return (
+            tuple(map(id, self.nodes)),
+            tuple(map(_get_node_name, self.nodes)),
+            tuple(map(id, self.edges)),
+            tuple(map(_get_edge_node_names, self.edges)),
+        )
 
     @classmethod
     def parse(cls, data: SerializedDict) -> Pipeline:
@@ -61,16 +149,51 @@ class Pipeline(Item):
                     f"Pipeline {self.name} has {times} nodes with the same name of {name}",
                 )
 
+        cycle = self.get_graph().find_cycle()
+        if cycle:
+            lint_result.add_error(f"Pipeline {self.name} has a cycle: {' -> '.join(cycle)}")
+
         # lint each node, edge and parameter
-        context = dict(context, pipeline=self)
+        context = dict(context, pipeline=self, pipeline_index=self.get_index())
         lint_iterables(lint_result, context, (self.nodes, self.edges, self.parameters))
 
     def get_node_by(self, **kwargs: Any) -> Node | None:
-        """Get the first node that matches all the passed named arguments."""
+        """
+        Get the first node that matches all the passed named arguments.
+
+        Lookups by `name` and `type` use the pipeline index, and `name`, `type`, `step` and `task`
+        are compared directly against the nodes' attributes. Other arguments are compared against
+        the nodes' serializations, which are memoized; see `Node.get_lookup_data()`.
+        """
         if not kwargs:
             return None
-        for node in self.nodes:
-            data = node.serialize()
-            if all(item in data.items() for item in kwargs.items()):
-                return node
+        candidates: Iterable[Node] = self.nodes
+        for key in ("name", "type"):
+            if key in kwargs:
+                index = self.get_index()
+                lookup = index.nodes_by_name if key == "name" else index.nodes_by_type
+                try:
+                    candidates = lookup.get(kwargs[key], ())
+                except TypeError:  # unhashable, so can't match
+                    return None
+                break
+        attribute_kwargs = {key: value for (key, value) in kwargs.items() if key in NODE_LOOKUP_ATTRIBUTES}
+        data_kwargs = {key: value for (key, value) in kwargs.items() if key not in NODE_LOOKUP_ATTRIBUTES}
+        for node in candidates:
+            if not all(_node_attribute_matches(node, key, value) for (key, value) in attribute_kwargs.items()):
+                continue
+            if data_kwargs:
+                data = node.get_lookup_data()
+                if not all(item in data.items() for item in data_kwargs.items()):
+                    continue
+            return node
         return None
+
+
+# Node attributes that are serialized as-is (when not None), so lookups by them needn't serialize the node.
+NODE_LOOKUP_ATTRIBUTES = frozenset({"name", "type", "step", "task"})
+
+
+def _node_attribute_matches(node: Node, key: str, value: Any) -> bool:
+    node_value = getattr(node, key, None)
+    return node_value is not None and node_value == value
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from valohai_yaml.objs.base import Item
+from valohai_yaml.objs.pipelines.validation import get_pipeline_index
 from valohai_yaml.objs.utils import check_type_and_listify
 from valohai_yaml.utils.node_socket_utils import split_socket_str
 
@@ -52,7 +53,7 @@ class PipelineParameter(Item):
         pipeline: Pipeline = context["pipeline"]
         config: Config = context["config"]
         steps = config.steps
-        node_map = pipeline.node_map
+        node_map = get_pipeline_index(context).node_map
         if not self.targets:
             lint_result.add_warning(
                 f'Pipeline "{pipeline.name}" parameter "{self.name}": no targets.',
@@ -6,11 +6,20 @@ if TYPE_CHECKING:
     from valohai_yaml.lint import LintResult
     from valohai_yaml.objs.pipelines.execution_node import ExecutionNode
     from valohai_yaml.objs.pipelines.override import Override
+    from valohai_yaml.objs.pipelines.pipeline import PipelineIndex
     from valohai_yaml.objs.pipelines.task_node import TaskNode
     from valohai_yaml.objs.step import Step
     from valohai_yaml.types import LintContext
 
 
+def get_pipeline_index(context: LintContext) -> PipelineIndex:
+    """Get the index of the pipeline being linted; it's built once per lint pass by `Pipeline.lint`."""
+    index = context.get("pipeline_index")
+    if index is None:
+        index = context["pipeline"].get_index()
+    return index
+
+
 def lint_step_reference(
     node: ExecutionNode | TaskNode,
     step_name: str,
@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import copy
+import operator
 from collections import OrderedDict
+from collections.abc import Mapping
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 from valohai_yaml.commands import build_command
+from valohai_yaml.excs import InvalidType, ValidationErrors
 from valohai_yaml.objs.base import Item
 from valohai_yaml.objs.environment_variable import EnvironmentVariable
 from valohai_yaml.objs.input import Input
 from valohai_yaml.objs.mount import Mount
 from valohai_yaml.objs.parameter import Parameter, ValueType
-from valohai_yaml.objs.parameter_map import ParameterMap
+from valohai_yaml.objs.parameter_map import BatchParameterMap, ParameterMap
 from valohai_yaml.objs.utils import (
     check_type_and_dictify,
     check_type_and_listify,
@@ -20,11 +24,11 @@ from valohai_yaml.objs.utils import (
 from valohai_yaml.objs.workload_resources import WorkloadResources
 from valohai_yaml.utils.duration import parse_duration
 from valohai_yaml.utils.lint import lint_expression, lint_iterables
-from valohai_yaml.utils.merge import merge_dicts, merge_simple
+from valohai_yaml.utils.merge import merge_dicts, merge_item, merge_simple
 
 if TYPE_CHECKING:
     import datetime
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator, Sequence
 
     from valohai_yaml.lint import LintResult
     from valohai_yaml.types import LintContext, SerializedDict
@@ -193,6 +197,69 @@ class Step(Item):
         parameter_map = ParameterMap(parameters=self.parameters, values=values)
         return build_command(command, parameter_map, special_interpolations=special)
 
+    def build_commands(
+        self,
+        parameter_values: Iterable[Mapping[str, ValueType | None]] | Mapping[str, Sequence[ValueType | None]],
+        command: list[str] | str | None = None,
+    ) -> Iterator[list[str]]:
+        """
+        Build the commands for this step for each of many sets of parameter values.
+
+        Equivalent to calling `build_command` for each set of values, but parameters left at their defaults
+        are only formatted and quoted once for the whole batch.  The commands are generated lazily,
+        so any number of value sets can be streamed through.
+
+        :param parameter_values: Either an iterable of parameter value dicts (as passed to `build_command`),
+                                 or a dict mapping parameter names to lists of values (all of the same length),
+                                 with the first set of values being the first value of each list and so on.
+        :param command: Overriding command; leave falsy to not override.
+        :return: Iterator of lists of commands
+        """
+        command = command or self.command
+        defaults = self.get_parameter_defaults(include_flags=False)
+        special = {}
+        if self.source_path is not None:
+            special["source-path"] = self.source_path
+
+        default_cache: dict[str, str] = {}
+        for values in iterate_parameter_value_sets(parameter_values):
+            parameter_map = BatchParameterMap(
+                parameters=self.parameters,
+                defaults=defaults,
+                values=values,
+                default_cache=default_cache,
+            )
+            yield build_command(command, parameter_map, special_interpolations=special)
+
+    def validate_parameter_values(self, values: Mapping[str, ValueType | None]) -> dict[str, list[str]]:
+        """
+        Validate a full set of parameter values for this step, collecting the errors for all parameters.
+
+        As with `build_command`, parameters with no value (or None) given take their defaults;
+        non-optional parameters with neither are errors.
+
+        :param values: Parameter values by parameter name.
+        :return: Dict mapping the names of parameters with invalid values (or of unknown parameters)
+                 to lists of error messages; empty if all the values are valid.
+        """
+        errors: dict[str, list[str]] = {}
+        for name, parameter in self.parameters.items():
+            value = values.get(name)
+            if value is None:
+                if not parameter.optional and parameter.default is None:
+                    errors[name] = ["No value supplied"]
+                continue
+            try:
+                parameter.validate(value)
+            except ValidationErrors as exc:
+                errors[name] = [str(error) for error in exc.errors]
+            except InvalidType as exc:
+                errors[name] = [str(exc)]
+        for name in values:
+            if name not in self.parameters:
+                errors[name] = [f"Unknown parameter {name!r}"]
+        return errors
+
     def lint(self, lint_result: LintResult, context: LintContext) -> None:
         context = dict(context, step=self, object_type="step")
 
@@ -217,29 +284,34 @@ class Step(Item):
 
     @classmethod
     def default_merge(cls, a: Step, b: Step) -> Step:
-        result = merge_simple(a, b)
-        result.parameters = merge_dicts(
-            a.parameters,
-            b.parameters,
-            merger=merge_simple,
-            copier=copy.deepcopy,
-        )
-        result.inputs = merge_dicts(
-            a.inputs,
-            b.inputs,
-            merger=merge_simple,
-            copier=copy.deepcopy,
-        )
-        result.outputs = a.outputs[:] + b.outputs[:]  # TODO: Improve handling
-        result.environment_variables = merge_dicts(
-            a.environment_variables,
-            b.environment_variables,
-            merger=merge_simple,
-            copier=copy.deepcopy,
+        merge_item_dicts = partial(merge_dicts, merger=merge_simple, copier=copy.deepcopy)
+        return merge_item(
+            a,
+            b,
+            field_mergers={
+                "parameters": merge_item_dicts,
+                "inputs": merge_item_dicts,
+                "outputs": operator.add,  # TODO: Improve handling
+                "environment_variables": merge_item_dicts,
+                "environment_variable_groups": operator.add,
+                "cache_volumes": operator.add,
+            },
         )
-        result.environment_variable_groups = a.environment_variable_groups + b.environment_variable_groups
-        result.cache_volumes = a.cache_volumes + b.cache_volumes
-        return result
+
+
+def iterate_parameter_value_sets(
+    parameter_values: Iterable[Mapping[str, ValueType | None]] | Mapping[str, Sequence[ValueType | None]],
+) -> Iterator[Mapping[str, ValueType | None]]:
+    """Iterate over sets of parameter values given either as an iterable of dicts, or as a dict of lists."""
+    if not isinstance(parameter_values, Mapping):
+        yield from parameter_values
+        return
+    names = list(parameter_values)
+    columns = [parameter_values[name] for name in names]
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("All lists of parameter values must be of the same length")
+    for row in zip(*columns):
+        yield dict(zip(names, row))
 
 
 def parse_common_step_properties(data: SerializedDict) -> dict[str, Any]:
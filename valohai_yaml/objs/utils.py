@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from collections import OrderedDict
 from collections import OrderedDict as OrderedDictType
+from collections.abc import MutableMapping
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Callable, TypeVar
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, NoReturn, TypeVar
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator, Mapping
 
     from valohai_yaml.objs.base import Item
     from valohai_yaml.types import SerializedDict
@@ -64,6 +65,164 @@ def check_type_and_dictify(
     return out
 
 
+class _UnparsedItem(NamedTuple):
+    data: Any
+    parse: Callable[[Any], Any]
+    on_parse: Callable[[Any], None] | None
+
+
+class LazyItemMap(MutableMapping[str, T]):
+    """
+    An ordered mapping of names to items, some of which may be held as raw data and only parsed on first access.
+
+    Otherwise behaves like the OrderedDict returned by `check_type_and_dictify`.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, T | _UnparsedItem] = {}
+
+    def add_unparsed(
+        self,
+        name: str,
+        data: Any,
+        parse: Callable[[Any], T],
+        on_parse: Callable[[T], None] | None = None,
+    ) -> None:
+        """Add an item to be parsed out of `data` using `parse` once it's first accessed."""
+        self._entries[name] = _UnparsedItem(data, parse, on_parse)
+
+    def is_parsed(self, name: str) -> bool:
+        return not isinstance(self._entries[name], _UnparsedItem)
+
+    def materialize(self) -> None:
+        """Parse all items that have not been parsed yet."""
+        for name in self._entries:
+            self[name]
+
+    def __getitem__(self, name: str) -> T:  # noqa: D105
+        entry = self._entries[name]
+        if not isinstance(entry, _UnparsedItem):
+            return entry
+        item = entry.parse(entry.data)
+        self._entries[name] = item
+        if entry.on_parse:
+            entry.on_parse(item)
+        return item
+
+    def __setitem__(self, name: str, item: T) -> None:  # noqa: D105
+        self._entries[name] = item
+
+    def __delitem__(self, name: str) -> None:  # noqa: D105
+        del self._entries[name]
+
+    def __contains__(self, name: object) -> bool:  # noqa: D105
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[str]:  # noqa: D105
+        return iter(self._entries)
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self._entries)
+
+    def __getstate__(self) -> dict[str, Any]:  # noqa: D105
+        # The parse callbacks may not be picklable (or sensible to share between copies), so parse everything first.
+        self.materialize()
+        return self.__dict__
+
+    def __repr__(self) -> str:  # noqa: D105
+        parsed = sum(1 for name in self._entries if self.is_parsed(name))
+        return f"<LazyItemMap {list(self._entries)!r} ({parsed}/{len(self)} parsed)>"
+
+
+def _readonly(self: Any, *args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError(f"{type(self).__name__} objects are read-only")
+
+
+class FrozenDict(dict[str, T]):
+    """
+    A read-only dict, used for the mappings of frozen `Item`s.
+
+    Being a dict, it can be used (and serialized) just like the mapping it replaces.
+    """
+
+    def __init__(self, data: Mapping[str, T] | Iterable[tuple[str, T]] = (), thawed_type: type = dict) -> None:
+        super().__init__(data)
+        # The type of mapping a mutable copy should be made into (e.g. an `OrderedDict`).
+        self.thawed_type = thawed_type
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self) -> tuple[Any, ...]:  # noqa: D105
+        # The default pickling protocol would set the items one by one.
+        return (type(self), (dict(self), self.thawed_type))
+
+
+class FrozenList(list[T]):
+    """A read-only list, used for the lists of frozen `Item`s."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = reverse = sort = _readonly
+
+    def __reduce__(self) -> tuple[Any, ...]:  # noqa: D105
+        # The default pickling protocol would append the items one by one.
+        return (type(self), (list(self),))
+
+
+def freeze_value(value: Any, *, copy_items: bool = False) -> Any:
+    """
+    Get an immutable version of an `Item` attribute value; see `Item.freeze()`.
+
+    Items are frozen in place (or, with `copy_items`, replaced with frozen copies; see `Item.frozen_copy()`);
+    mappings become `FrozenDict`s, lists `FrozenList`s and sets frozensets.
+    Lazily parsed mappings are fully parsed.
+    """
+    if hasattr(value, "freeze"):
+        return value.frozen_copy() if copy_items else value.freeze()
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, (dict, MutableMapping)):
+        thawed_type = type(value) if isinstance(value, dict) else OrderedDict
+        return FrozenDict(
+            ((key, freeze_value(v, copy_items=copy_items)) for (key, v) in value.items()),
+            thawed_type=thawed_type,
+        )
+    if isinstance(value, list):
+        return FrozenList(freeze_value(v, copy_items=copy_items) for v in value)
+    if isinstance(value, tuple):
+        return tuple(freeze_value(v, copy_items=copy_items) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze_value(v, copy_items=copy_items) for v in value)
+    return value
+
+
+def thaw_value(value: Any) -> Any:
+    """Get a mutable copy of a value frozen with `freeze_value`; the inverse of that function."""
+    if hasattr(value, "thawed"):
+        return value.thawed()
+    if isinstance(value, FrozenDict):
+        return value.thawed_type((key, thaw_value(v)) for (key, v) in value.items())
+    if isinstance(value, FrozenList):
+        return [thaw_value(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(thaw_value(v) for v in value)
+    if isinstance(value, frozenset):
+        return {thaw_value(v) for v in value}
+    return value
+
+
+def hash_value(value: Any) -> int:
+    """Hash a value frozen with `freeze_value` (or data derived from one), consistently with its equality."""
+    if isinstance(value, dict):
+        # Dict equality doesn't care about order, so neither may the hash.
+        return hash(frozenset((key, hash_value(v)) for (key, v) in value.items()))
+    if isinstance(value, (list, tuple)):
+        return hash(tuple(hash_value(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return hash(frozenset(hash_value(v) for v in value))
+    return hash(value)
+
+
 def serialize_into(
     dest,  # type: OrderedDict[str, Any] # noqa: ANN001
     key: str,
@@ -1,21 +1,56 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
 from valohai_yaml.objs import Config
-from valohai_yaml.types import YamlReadable
 from valohai_yaml.utils import read_yaml
 
+if TYPE_CHECKING:
+    from valohai_yaml.caching import BaseParseCache
+    from valohai_yaml.types import YamlReadable
 
-def parse(yaml: YamlReadable, validate: bool = True) -> Config:
+
+def parse(
+    yaml: YamlReadable,
+    validate: bool = True,
+    cache: BaseParseCache | None = None,
+    fail_fast: bool = False,
+    lazy: bool = False,
+    frozen: bool = False,
+) -> Config:
     """
     Parse the given YAML data into a `Config` object, optionally validating it first.
 
     :param yaml: YAML data (either a string, a stream, or pre-parsed Python dict/list)
     :param validate: Whether to validate the data before attempting to parse it.
+    :param cache: Optional `valohai_yaml.caching.ParseCache` or `DiskParseCache` to look the parsed data up from
+                  (and store it in).
+    :param fail_fast: Whether to stop validating at the first error (the raised `ValidationErrors` will then only
+                      contain that error).
+    :param lazy: Whether to defer parsing each top-level item (step, pipeline, ...) until it is first accessed.
+                 Speeds up e.g. looking up a single step from a large configuration.
+    :param frozen: Whether to make the returned `Config`, and everything in it, immutable and hashable;
+                   see `Item.freeze()`.  Frozen configurations can be safely shared between threads,
+                   and used as memoization keys.  (A lazily parsed configuration is fully parsed when frozen.)
     :return: Config object
     """
+    if cache is not None:
+        return cache.parse(yaml, validate=validate, fail_fast=fail_fast, lazy=lazy, frozen=frozen)
+    return build_config(load_and_validate(yaml, validate=validate, fail_fast=fail_fast), lazy=lazy, frozen=frozen)
+
+
+def load_and_validate(yaml: YamlReadable, validate: bool = True, fail_fast: bool = False) -> Any:
+    """Read the given YAML data into plain Python data, optionally validating it."""
     data = read_yaml(yaml)
-    if data is None:  # empty file
-        return Config()
-    if validate:  # pragma: no branch
+    if data is not None and validate:  # pragma: no branch
         from valohai_yaml.validation import validate as do_validate
 
-        do_validate(data, raise_exc=True)
-    return Config.parse(data)
+        do_validate(data, raise_exc=True, fail_fast=fail_fast)
+    return data
+
+
+def build_config(data: Any, lazy: bool = False, frozen: bool = False) -> Config:
+    config = Config() if data is None else Config.parse(data, lazy=lazy)  # `None` for an empty file
+    if frozen:
+        config.freeze()
+    return config
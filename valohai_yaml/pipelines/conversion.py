@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import json
 from typing import TYPE_CHECKING, Any, TypedDict, Union
 
+from valohai_yaml.caching import CacheInfo
 from valohai_yaml.objs import (
     Config,
     DeploymentNode,
@@ -15,9 +17,23 @@ from valohai_yaml.objs import (
 from valohai_yaml.objs.pipelines.override import Override
 
 if TYPE_CHECKING:
-    from collections.abc import MutableMapping
+    from collections.abc import Iterable, Iterator, MutableMapping
 
 ConvertedObject = dict[str, Any]
+ParameterArguments = dict[str, Union[str, list]]
+
+
+def _copy_data(value: Any) -> Any:
+    """Deep-copy serialized (JSON-like) data; faster than `copy.deepcopy`, and keeps the types of the dicts."""
+    if isinstance(value, dict):
+        copied = value.copy()
+        for key, item in copied.items():
+            if isinstance(item, (dict, list)):
+                copied[key] = _copy_data(item)
+        return copied
+    if isinstance(value, list):
+        return [_copy_data(item) for item in value]
+    return value
 
 
 class VariantExpression(TypedDict):
@@ -30,14 +46,38 @@ class VariantExpression(TypedDict):
 ExpressionValue = Union[str, int, bool, float, VariantExpression]
 
 
-class ConvertedPipeline(TypedDict):
-    """TypedDict for converted Pipeline object."""
+class ExecutionPlanNode(TypedDict):
+    """Scheduling information for a node of a converted pipeline."""
+
+    level: int  # index of the wave the node is in
+    in_degree: int  # number of nodes this node directly depends on
+    fan_out: int  # number of nodes that directly depend on this node
+    critical: bool  # whether the node is on the critical path
+
+
+class ExecutionPlan(TypedDict):
+    """Execution plan for a converted pipeline."""
+
+    # Node names grouped into dependency levels; the nodes of a wave can all be started
+    # once the nodes of the previous waves are done.
+    waves: list[list[str]]
+    nodes: dict[str, ExecutionPlanNode]
+    # Names of the nodes on a longest dependency chain, in order.
+    critical_path: list[str]
+
 
+class _ConvertedPipelineBase(TypedDict):
     edges: list[ConvertedObject]
     nodes: list[ConvertedObject]
     parameters: dict[str, ConvertedObject]
 
 
+class ConvertedPipeline(_ConvertedPipelineBase, total=False):
+    """TypedDict for converted Pipeline object."""
+
+    plan: ExecutionPlan  # only if requested
+
+
 class PipelineConverter:
     """Converts pipeline objects to Valohai API payloads."""
 
@@ -46,34 +86,124 @@ class PipelineConverter:
         *,
         config: Config,
         commit_identifier: str | None,
-        parameter_arguments: dict[str, str | list] | None = None,
+        parameter_arguments: ParameterArguments | None = None,
     ) -> None:
         self.config = config
         self.commit_identifier = commit_identifier
         self.parameter_arguments = parameter_arguments or {}
+        self._template_cache: dict[tuple[str | None, str | None, str | None], ConvertedObject] = {}
+        self._template_cache_hits = 0
+        self._template_cache_misses = 0
 
-    def convert_pipeline(self, pipeline: Pipeline) -> ConvertedPipeline:
-        return {
+    def convert_pipeline(self, pipeline: Pipeline, *, include_plan: bool = False) -> ConvertedPipeline:
+        """
+        Convert a pipeline to an API payload.
+
+        :param include_plan: Whether to include an execution plan (see `get_execution_plan`) as `plan`.
+        """
+        converted: ConvertedPipeline = {
             "edges": [edge.get_expanded() for edge in pipeline.edges],
             "nodes": [self.convert_node(node) for node in pipeline.nodes],
             "parameters": {parameter.name: self.convert_parameter(parameter) for parameter in pipeline.parameters},
         }
+        if include_plan:
+            converted["plan"] = self.get_execution_plan(pipeline)
+        return converted
+
+    def iter_convert_pipeline_batch(
+        self,
+        pipeline: Pipeline,
+        parameter_argument_sets: Iterable[ParameterArguments],
+        *,
+        include_plan: bool = False,
+    ) -> Iterator[ConvertedPipeline]:
+        """
+        Convert a pipeline to API payloads, one for each set of parameter arguments, as a generator.
+
+        The nodes, edges and execution plan don't depend on the parameter arguments,
+        so they are converted once, and each generated payload gets its own (deep) copy of them;
+        modifying one payload doesn't affect the others.  The pipeline parameters are converted
+        for each set of arguments, with the parameters' configuration serialized only once.
+
+        The converter's own `parameter_arguments` are not used.
+        """
+        edges = [edge.get_expanded() for edge in pipeline.edges]
+        nodes = [self.convert_node(node) for node in pipeline.nodes]
+        plan = self.get_execution_plan(pipeline) if include_plan else None
+        parameter_configs = [(parameter, parameter.serialize()) for parameter in pipeline.parameters]
+        for parameter_arguments in parameter_argument_sets:
+            converted: ConvertedPipeline = {
+                "edges": _copy_data(edges),
+                "nodes": _copy_data(nodes),
+                "parameters": {
+                    parameter.name: {
+                        "config": _copy_data(config),
+                        "expression": self.convert_expression(self.get_parameter_value(parameter, parameter_arguments)),
+                    }
+                    for (parameter, config) in parameter_configs
+                },
+            }
+            if plan is not None:
+                converted["plan"] = _copy_data(plan)
+            yield converted
+
+    def convert_pipeline_batch(
+        self,
+        pipeline: Pipeline,
+        parameter_argument_sets: Iterable[ParameterArguments],
+        *,
+        include_plan: bool = False,
+    ) -> list[ConvertedPipeline]:
+        """Convert a pipeline to a list of API payloads; see `iter_convert_pipeline_batch`."""
+        return list(self.iter_convert_pipeline_batch(pipeline, parameter_argument_sets, include_plan=include_plan))
+
+    def get_execution_plan(self, pipeline: Pipeline) -> ExecutionPlan:
+        """
+        Get an execution plan for a pipeline.
+
+        The plan groups the pipeline's nodes into waves of nodes that can be run in parallel,
+        and annotates each node with its in-degree, fan-out and whether it's on the critical path.
+
+        :raises ValidationError: if the pipeline has a cycle.
+        """
+        graph = pipeline.get_graph()
+        waves = graph.get_levels()
+        critical_path = graph.get_critical_path()
+        critical_nodes = set(critical_path)
+        nodes: dict[str, ExecutionPlanNode] = {}
+        for level, wave in enumerate(waves):
+            for name in wave:
+                i = graph.node_indices[name]
+                nodes[name] = {
+                    "level": level,
+                    "in_degree": len(graph.predecessors[i]),
+                    "fan_out": len(graph.successors[i]),
+                    "critical": name in critical_nodes,
+                }
+        return {
+            "waves": waves,
+            "nodes": nodes,
+            "critical_path": critical_path,
+        }
 
     def convert_parameter(self, parameter: PipelineParameter) -> ConvertedObject:
         """Convert a pipeline parameter to a config-expression payload."""
-        param_value: ExpressionValue | list[str]
-        if parameter.name in self.parameter_arguments:
-            param_value = self.parameter_arguments[parameter.name]
-        elif parameter.default is not None:
-            param_value = parameter.default
-        else:
-            param_value = ""
-
         return {
             "config": {**parameter.serialize()},
-            "expression": self.convert_expression(param_value),
+            "expression": self.convert_expression(self.get_parameter_value(parameter, self.parameter_arguments)),
         }
 
+    def get_parameter_value(
+        self,
+        parameter: PipelineParameter,
+        parameter_arguments: ParameterArguments,
+    ) -> ExpressionValue | list[str]:
+        if parameter.name in parameter_arguments:
+            return parameter_arguments[parameter.name]
+        if parameter.default is not None:
+            return parameter.default
+        return ""
+
     def convert_node(self, node: Node) -> ConvertedObject:
         if isinstance(node, (ExecutionNode, TaskNode)):
             return self.convert_executionlike_node(node)
@@ -112,8 +242,50 @@ class PipelineConverter:
                 raise ValueError(f"Task {task_name} not found in {self.config}")
             step_name = task_blueprint.step
 
+        commit = node_commit or self.commit_identifier
+        template = self.get_step_template(node, step_name, commit)
+
+        if not commit:  # pragma: no cover
+            raise ValueError("Cannot determine commit for node")
+
+        node_data["template"] = template
+
+        if task_blueprint:
+            task_to_template = Task.serialize_to_template(task_blueprint)
+            task_variant_parameters = task_to_template.pop("variant_parameters", None)
+            node_data["template"].update(task_to_template)
+            if task_variant_parameters:
+                node_data["template"]["parameters"] = {
+                    **node_data["template"].get("parameters", {}),
+                    **task_variant_parameters,
+                }
+
+        return node_data
+
+    def get_step_template(
+        self,
+        node: ExecutionNode | TaskNode,
+        step_name: str | None,
+        commit: str | None,
+    ) -> ConvertedObject:
+        """
+        Get the execution template for a node referring to the given step at the given commit.
+
+        Templates are cached by step name, commit and the contents of the node's override,
+        so nodes that share those are only serialized once; each call gets its own (deep) copy of the template,
+        so modifying it affects neither other nodes nor later conversions.
+        """
+        override_data: MutableMapping[str, Any] | None = node.override.serialize() if node.override else None
+        override_fingerprint = json.dumps(override_data, sort_keys=True, default=repr) if override_data else None
+        key = (step_name, override_fingerprint, commit)
+        template = self._template_cache.get(key)
+        if template is not None:
+            self._template_cache_hits += 1
+            return _copy_data(template)
+        self._template_cache_misses += 1
+
         step_data: MutableMapping[str, Any]
-        if not node_commit or node_commit == self.commit_identifier:
+        if commit == self.commit_identifier:
             # Local step, let's do validation and merging properly
             step = self.config.get_step_by(name=step_name)
             if not step:  # pragma: no cover
@@ -131,27 +303,28 @@ class PipelineConverter:
         else:
             # This is a remote step reference.
             # Just add in overrides and hope for the best...
-            step_data = node.override.serialize() if node.override else {}
+            step_data = override_data or {}
 
-        commit = node_commit or self.commit_identifier
-
-        if not commit:  # pragma: no cover
-            raise ValueError("Cannot determine commit for node")
-
-        node_data["template"] = {
+        template = self._template_cache[key] = {
             "commit": commit,
             "step": step_name,
             **step_data,
         }
+        return _copy_data(template)
 
-        if task_blueprint:
-            task_to_template = Task.serialize_to_template(task_blueprint)
-            task_variant_parameters = task_to_template.pop("variant_parameters", None)
-            node_data["template"].update(task_to_template)
-            if task_variant_parameters:
-                node_data["template"].setdefault("parameters", {}).update(task_variant_parameters)
+    def template_cache_info(self) -> CacheInfo:
+        """Get statistics of the step template cache (see `get_step_template`)."""
+        return CacheInfo(
+            hits=self._template_cache_hits,
+            misses=self._template_cache_misses,
+            maxsize=None,
+            currsize=len(self._template_cache),
+        )
 
-        return node_data
+    def clear_template_cache(self) -> None:
+        """Clear the step template cache; required if the configuration's steps are modified."""
+        self._template_cache.clear()
+        self._template_cache_hits = self._template_cache_misses = 0
 
     def convert_expression(self, expression: ExpressionValue | list) -> ExpressionValue:
         if isinstance(expression, list):
@@ -1,4 +1,4 @@
-from typing import IO, Any, Union
+from typing import IO, Any, NamedTuple, Union
 
 YamlReadable = Union[dict[Any, Any], list[Any], bytes, str, IO[bytes], IO[str]]
 SerializedDict = dict[str, Any]
@@ -10,3 +10,14 @@ EndpointResourcesDict = dict[str, Any]
 EndpointTolerationDict = dict[str, Any]
 NodeOverrideDict = dict[str, Any]
 DeploymentDefaultsDict = dict[str, Any]
+ObjectPath = tuple[Union[str, int], ...]
+
+
+class SourceLocation(NamedTuple):
+    """A 1-based line and column position in a source file."""
+
+    line: int
+    column: int
+
+
+SourceLocationMap = dict[ObjectPath, SourceLocation]
@@ -2,18 +2,39 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, TypeVar, overload
 
-from yaml import safe_load
+from valohai_yaml.utils.yaml_loaders import get_yaml_loader, load_yaml_with_locations
 
 if TYPE_CHECKING:
-    from valohai_yaml.types import YamlReadable
+    from valohai_yaml.types import SourceLocationMap, YamlReadable
 
 
-def read_yaml(yaml: YamlReadable) -> Any:
+def read_yaml(yaml: YamlReadable, loader: str | None = None) -> Any:
+    """
+    Read YAML data into plain Python data.
+
+    :param yaml: YAML data (either a string, a stream, or pre-parsed Python dict/list)
+    :param loader: Name of the YAML loading backend to use; defaults to the fastest available one.
+                   See `valohai_yaml.utils.yaml_loaders`.
+    """
     if isinstance(yaml, (dict, list)):  # Smells already parsed
         return yaml
     if isinstance(yaml, bytes):
         yaml = yaml.decode("utf-8")
-    return safe_load(yaml)  # can be a stream or a string
+    return get_yaml_loader(loader)(yaml)  # can be a stream or a string
+
+
+def read_yaml_with_locations(yaml: YamlReadable, loader: str | None = None) -> tuple[Any, SourceLocationMap | None]:
+    """
+    Read YAML data into plain Python data, along with a map of object paths to source locations.
+
+    The location map is None if the data was already parsed.
+    See `valohai_yaml.utils.yaml_loaders.load_yaml_with_locations`.
+    """
+    if isinstance(yaml, (dict, list)):  # Smells already parsed
+        return (yaml, None)
+    if isinstance(yaml, bytes):
+        yaml = yaml.decode("utf-8")
+    return load_yaml_with_locations(yaml, loader=loader)
 
 
 T = TypeVar("T")
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import operator
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from valohai_yaml.excs import InvalidType, ValidationErrors
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from valohai_yaml.objs.parameter import Parameter, ParameterValidator
+
+# Integers up to this magnitude are exactly representable as float64.
+MAX_EXACT_FLOAT_INT = 2**53
+INT64_RANGE = (-(2**63), 2**63 - 1)
+
+
+class ColumnValidationResult(NamedTuple):
+    """The result of validating a column of values for a parameter; see `validate_column`."""
+
+    # Whether each value is valid.
+    mask: list[bool]
+    # The typecast values, as `Parameter.validate` would return them (or the original values, for invalid rows).
+    values: list[Any]
+    # The error messages `Parameter.validate` would raise `ValidationErrors` with, by row index, for invalid rows.
+    errors: dict[int, list[str]]
+
+    def is_valid(self) -> bool:
+        return not self.errors
+
+
+def validate_column(
+    parameter: Parameter,
+    values: Iterable[Any],
+    *,
+    use_numpy: bool | None = None,
+) -> ColumnValidationResult:
+    """
+    Validate (and typecast) many values for a parameter at once, e.g. the values of a parameter sweep.
+
+    The results are the same as from calling `Parameter.validate` for each value.
+    If NumPy is installed, type coercion, range checks and choice lookups for single-valued parameters
+    are done as array operations where that gives exactly the same results; the rest is done in Python.
+
+    :param parameter: The parameter to validate values for.
+    :param values: The values to validate.
+    :param use_numpy: Whether to use NumPy; by default it's used if installed.
+    :return: ColumnValidationResult
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    elif use_numpy and np is None:
+        raise ImportError("NumPy is required for use_numpy=True (install valohai-yaml[numpy])")
+    validator = parameter.get_validator()
+    values = list(values)
+    if use_numpy and not validator.multiple:
+        return _validate_column_numpy(validator, values)
+    return _validate_column_python(validator, values)
+
+
+def _validate_row(
+    validator: ParameterValidator,
+    index: int,
+    value: Any,
+    out: list[Any],
+    errors: dict[int, list[str]],
+) -> None:
+    try:
+        out[index] = validator.validate(value)
+    except ValidationErrors as exc:
+        errors[index] = [str(error) for error in exc.errors]
+    except InvalidType as exc:
+        errors[index] = [str(exc)]
+
+
+def _get_result(values: list[Any], out: list[Any], errors: dict[int, list[str]]) -> ColumnValidationResult:
+    mask = [True] * len(out)
+    for index in errors:
+        mask[index] = False
+        out[index] = values[index]
+    return ColumnValidationResult(mask=mask, values=out, errors=dict(sorted(errors.items())))
+
+
+def _validate_column_python(validator: ParameterValidator, values: list[Any]) -> ColumnValidationResult:
+    out = list(values)
+    errors: dict[int, list[str]] = {}
+    for index, value in enumerate(values):
+        _validate_row(validator, index, value, out, errors)
+    return _get_result(values, out, errors)
+
+
+def _validate_column_numpy(validator: ParameterValidator, values: list[Any]) -> ColumnValidationResult:
+    out = list(values)
+    errors: dict[int, list[str]] = {}
+    atom_rows = []
+    for index, value in enumerate(values):
+        if value is None or isinstance(value, (list, tuple)):  # Rare, so validated one by one
+            _validate_row(validator, index, value, out, errors)
+        else:
+            atom_rows.append(index)
+
+    # Coerce the types of the values; those of the parameter's native type (e.g. ints for an integer parameter)
+    # are unchanged by the coercion (save for ints becoming floats), so they can be converted in bulk.
+    native_rows, array = _coerce_native_rows(validator, values, atom_rows, out)
+    native_row_set = set(native_rows)
+    for index in atom_rows:
+        if index not in native_row_set:
+            row_errors: list[str] = []
+            out[index] = validator.validate_type(values[index], row_errors)
+            validator.validate_value(out[index], row_errors)
+            if row_errors:
+                errors[index] = row_errors
+
+    if native_rows:
+        for index, row_errors in _check_array(validator, array, [out[i] for i in native_rows]).items():
+            errors[native_rows[index]] = row_errors
+    return _get_result(values, out, errors)
+
+
+def _coerce_native_rows(
+    validator: ParameterValidator,
+    values: list[Any],
+    atom_rows: list[int],
+    out: list[Any],
+) -> tuple[list[int], Any]:
+    """Find the rows with values of the parameter's native type, coerce them in `out`, and get them as an array."""
+    if validator.type == "integer":
+        native_rows = [i for i in atom_rows if type(values[i]) is int]
+        dtype: Any = np.int64
+    elif validator.type == "float":
+        native_rows = [i for i in atom_rows if type(values[i]) in (int, float)]
+        dtype = np.float64
+    elif validator.coerce is None and all(_is_array_string(values[i]) for i in atom_rows):
+        native_rows = atom_rows
+        dtype = str
+    else:
+        return [], None
+    try:
+        array = np.asarray([values[i] for i in native_rows], dtype=dtype)
+    except OverflowError:  # Integers too large for the array type
+        return [], None
+    if dtype is np.float64:
+        for i, value in zip(native_rows, array.tolist()):
+            out[i] = value
+    return native_rows, array
+
+
+def _is_array_string(value: Any) -> bool:
+    # NumPy strips trailing NULs off strings stored in arrays, so those wouldn't compare the same
+    return type(value) is str and not value.endswith("\0")
+
+
+def _is_exact_operand(operand: Any, array: Any) -> bool:
+    """Find out whether comparing `array` to `operand` with NumPy gives the same result as Python would."""
+    if array.dtype.kind == "U":
+        return _is_array_string(operand)
+    if type(operand) in (int, bool):
+        if array.dtype.kind == "f":
+            return abs(operand) <= MAX_EXACT_FLOAT_INT
+        return INT64_RANGE[0] <= operand <= INT64_RANGE[1]
+    return type(operand) is float and array.dtype.kind == "f"
+
+
+def _compare(array: Any, python_values: list[Any], op: Callable[[Any, Any], Any], bound: Any) -> Any:
+    if _is_exact_operand(bound, array):
+        return op(array, bound)
+
+    def compare_one(value: Any) -> bool:
+        try:
+            return bool(op(value, bound))
+        except TypeError:  # Could occur if types are incompatible
+            return False
+
+    return np.array([compare_one(value) for value in python_values], dtype=bool)
+
+
+def _find_non_choices(validator: ParameterValidator, array: Any, python_values: list[Any]) -> Any:
+    choices = validator.choices
+    assert choices is not None
+    if array.dtype.kind != "U":
+        # Numbers are never equal to strings (or the other types choices could be), so those can be left out.
+        choices = [choice for choice in choices if type(choice) in (int, bool, float)]
+    if all(_is_exact_operand(choice, array) for choice in choices):
+        return ~np.isin(array, np.asarray(choices, dtype=array.dtype))
+    return np.array([not validator.is_choice(value) for value in python_values], dtype=bool)
+
+
+def _check_array(validator: ParameterValidator, array: Any, python_values: list[Any]) -> dict[int, list[str]]:
+    """Run the range and choice checks of `ParameterValidator.validate_value` on an array of coerced values."""
+    no_errors = np.zeros(len(python_values), dtype=bool)
+    below = _compare(array, python_values, operator.lt, validator.min) if validator.min is not None else no_errors
+    above = _compare(array, python_values, operator.gt, validator.max) if validator.max is not None else no_errors
+    non_choices = _find_non_choices(validator, array, python_values) if validator.choices is not None else no_errors
+    errors = {}
+    choices_repr = repr(validator.choices)  # Could be long, so only formatted once
+    for index in np.flatnonzero(below | above | non_choices).tolist():
+        value = python_values[index]
+        row_errors = []
+        if below[index]:
+            row_errors.append(f"{value} is less than the minimum allowed ({validator.min})")
+        if above[index]:
+            row_errors.append(f"{value} is greater than the maximum allowed ({validator.max})")
+        if non_choices[index]:
+            row_errors.append(f"{value} is not among the choices allowed ({choices_repr})")
+        errors[index] = row_errors
+    return errors
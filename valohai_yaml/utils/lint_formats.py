@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import abc
+import json
+import os
+import pathlib
+from typing import TYPE_CHECKING, Any, TextIO
+from urllib.parse import quote
+
+if TYPE_CHECKING:
+    from valohai_yaml.lint import LintResult
+    from valohai_yaml.types import LintResultMessage
+
+SARIF_SCHEMA_URL = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {"error": "error", "warning": "warning", "hint": "note"}
+# Relative file paths are given relative to this base URI, which is defined in each run's header.
+SARIF_SOURCE_ROOT_ID = "%SRCROOT%"
+
+
+def format_json_path(path: list[str | int] | None) -> str | None:
+    """Format an object path (e.g. from a JSON schema validation error) as a JSONPath expression."""
+    if path is None:
+        return None
+    bits = ["$"]
+    for el in path:
+        bits.append(f"[{el}]" if isinstance(el, int) else f".{el}")
+    return "".join(bits)
+
+
+def get_message_entry(file: str, message: LintResultMessage) -> dict[str, Any]:
+    """Get a JSON-serializable representation of a lint result message."""
+    location = message.get("location")
+    return {
+        "file": file,
+        "severity": message["type"],
+        "message": message["message"],
+        "path": format_json_path(message.get("path")),
+        "location": location._asdict() if location else None,
+    }
+
+
+class LintResultWriter(abc.ABC):
+    """
+    Base class for writing lint results for multiple files into a stream.
+
+    Results are written (and flushed) as soon as each file's result is available,
+    and nothing is retained between files, so any number of files can be processed.
+    """
+
+    name: str
+
+    # Whether the output is meant for humans (and can thus use e.g. ANSI colors).
+    human_readable = False
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def start(self) -> None:  # noqa: B027  # Optional hook
+        pass
+
+    @abc.abstractmethod
+    def write_result(self, file: str, result: LintResult) -> None:
+        raise NotImplementedError()
+
+    def finish(self, *, errors: int, warnings: int) -> None:  # noqa: B027  # Optional hook
+        pass
+
+
+class TextLintResultWriter(LintResultWriter):
+    """Writes lint messages in a human-readable format."""
+
+    name = "text"
+    human_readable = True
+
+    def write_result(self, file: str, result: LintResult) -> None:
+        header_printed = False
+        for item in result.messages:
+            if not header_printed:
+                self.stream.write(f">>> {file}\n")
+                header_printed = True
+            self.stream.write(f"{item['type']}: {item['message']}\n")
+            self.stream.write(f"{'-' * 60}\n")
+
+    def finish(self, *, errors: int, warnings: int) -> None:
+        if errors or warnings:
+            self.stream.write(f"*** {errors} errors, {warnings} warnings\n")
+
+
+class NDJSONLintResultWriter(LintResultWriter):
+    """Writes one JSON object per line for each lint message."""
+
+    name = "ndjson"
+
+    def write_result(self, file: str, result: LintResult) -> None:
+        for message in result.messages:
+            self.stream.write(json.dumps(get_message_entry(file, message)))
+            self.stream.write("\n")
+        self.stream.flush()
+
+
+class JSONLintResultWriter(LintResultWriter):
+    """Writes a single JSON array of lint messages, streamed out incrementally."""
+
+    name = "json"
+
+    def start(self) -> None:
+        self.stream.write("[")
+        self._first = True
+
+    def write_entry(self, entry: dict[str, Any]) -> None:
+        self.stream.write("\n" if self._first else ",\n")
+        self.stream.write(json.dumps(entry))
+        self._first = False
+
+    def write_result(self, file: str, result: LintResult) -> None:
+        for message in result.messages:
+            self.write_entry(get_message_entry(file, message))
+        self.stream.flush()
+
+    def finish(self, *, errors: int, warnings: int) -> None:
+        self.stream.write("\n]\n")
+        self.stream.flush()
+
+
+class SARIFLintResultWriter(JSONLintResultWriter):
+    """Writes a SARIF 2.1.0 log, with the results streamed out incrementally."""
+
+    name = "sarif"
+
+    def start(self) -> None:
+        from valohai_yaml import __version__
+
+        tool = {
+            "driver": {
+                "name": "valohai-yaml",
+                "version": __version__,
+                "informationUri": "https://github.com/valohai/valohai-yaml",
+            },
+        }
+        base_uris = {SARIF_SOURCE_ROOT_ID: {"uri": f"{pathlib.Path.cwd().as_uri().rstrip('/')}/"}}
+        # Write everything up to the opening bracket of the run's results array;
+        # `finish()` closes the array, the run, the runs array and the log object.
+        self.stream.write(f'{{"$schema": {json.dumps(SARIF_SCHEMA_URL)}, "version": "2.1.0", "runs": [')
+        self.stream.write(f'{{"tool": {json.dumps(tool)}, "originalUriBaseIds": {json.dumps(base_uris)}, "results": [')
+        self._first = True
+
+    def write_result(self, file: str, result: LintResult) -> None:
+        for message in result.messages:
+            self.write_entry(get_sarif_result(file, message))
+        self.stream.flush()
+
+    def finish(self, *, errors: int, warnings: int) -> None:
+        self.stream.write("\n]}]}\n")
+        self.stream.flush()
+
+
+def get_sarif_artifact_location(file: str) -> dict[str, Any]:
+    """Get a SARIF artifact location for a file path; relative paths are relative to `SARIF_SOURCE_ROOT_ID`."""
+    if os.path.isabs(file):
+        return {"uri": pathlib.Path(file).as_uri()}
+    return {"uri": quote(pathlib.Path(file).as_posix()), "uriBaseId": SARIF_SOURCE_ROOT_ID}
+
+
+def get_sarif_result(file: str, message: LintResultMessage) -> dict[str, Any]:
+    location: dict[str, Any] = {"physicalLocation": {"artifactLocation": get_sarif_artifact_location(file)}}
+    source_location = message.get("location")
+    if source_location:
+        location["physicalLocation"]["region"] = {
+            "startLine": source_location.line,
+            "startColumn": source_location.column,
+        }
+    json_path = format_json_path(message.get("path"))
+    if json_path:
+        location["logicalLocations"] = [{"fullyQualifiedName": json_path}]
+    return {
+        "level": SARIF_LEVELS.get(message["type"], "none"),
+        "message": {"text": message["message"]},
+        "locations": [location],
+    }
+
+
+LINT_RESULT_WRITERS: dict[str, type[LintResultWriter]] = {
+    cls.name: cls
+    for cls in (
+        TextLintResultWriter,
+        JSONLintResultWriter,
+        NDJSONLintResultWriter,
+        SARIFLintResultWriter,
+    )
+}
@@ -1,6 +1,13 @@
+from __future__ import annotations
+
 import copy
+import datetime
 from collections.abc import MutableMapping
-from typing import Any, Callable, TypeVar
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
 
 MISSING = object()
 
@@ -8,6 +15,23 @@ TMerge = TypeVar("TMerge")
 TCopy = TypeVar("TCopy")
 TD = TypeVar("TD", bound=MutableMapping[Any, Any])
 
+FieldMerger = Callable[[Any, Any], Any]
+
+# Values of these types are never modified in place, so they needn't be copied when merging.
+IMMUTABLE_TYPES = (
+    str,
+    bytes,
+    int,
+    float,
+    complex,
+    type(None),
+    Enum,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    frozenset,
+)
+
 
 def merge_dicts(
     a: TD,
@@ -17,7 +41,8 @@ def merge_dicts(
     skip_missing_a: bool = False,
     skip_missing_b: bool = False,
 ) -> TD:
-    out: TD = type(a)()
+    # Read-only mappings (such as those of frozen items) know which type of mapping to make a mutable copy into.
+    out: TD = getattr(a, "thawed_type", type(a))()
 
     # Hack to keep the iteration order the same...
     keys: list[Any] = list(a)
@@ -38,7 +63,59 @@ def merge_dicts(
     return out
 
 
+def is_immutable(value: Any) -> bool:
+    if isinstance(value, IMMUTABLE_TYPES):
+        return True
+    return type(value) is tuple and all(is_immutable(v) for v in value)
+
+
+def merge_item(
+    a: TMerge,
+    b: TMerge,
+    *,
+    field_mergers: Mapping[str, FieldMerger] | None = None,
+    copier: Callable[[Any], Any] = copy.deepcopy,
+) -> TMerge:
+    """
+    Merge the attributes of `b` over those of `a`, field by field, into a new object of `a`'s type.
+
+    Each attribute of the result is
+    * `field_mergers[name](a_value, b_value)`, if there is a merger for the field and both objects have it,
+    * otherwise the value from `b` if it has the attribute, else the one from `a`, copied with `copier`
+      (values of immutable types, such as strings and numbers, are not copied).
+
+    Underscore-prefixed attributes are internal state, and are taken as-is.
+    """
+    if field_mergers is None:
+        field_mergers = {}
+    a_fields = vars(a)
+    b_fields = vars(b)
+    out = copy.copy(a)
+    for name in {**a_fields, **b_fields}:
+        value: Any
+        if name.startswith("_"):
+            value = b_fields.get(name, a_fields.get(name))
+        elif name in field_mergers and name in a_fields and name in b_fields:
+            value = field_mergers[name](a_fields[name], b_fields[name])
+        else:
+            value = b_fields[name] if name in b_fields else a_fields[name]
+            if not is_immutable(value):
+                value = copier(value)
+        setattr(out, name, value)
+    return out
+
+
 def merge_simple(a: TMerge, b: TMerge) -> TMerge:
-    a = copy.deepcopy(a)
-    a.__dict__.update(copy.deepcopy(b).__dict__)
-    return a
+    """Merge `b` over `a`, with the result having copies of the attribute values of `b`, or failing that, `a`."""
+    return merge_item(a, b)
+
+
+def merge_shallow(a: TMerge, b: TMerge) -> TMerge:
+    """
+    Merge `b` over `a` like `merge_simple`, but without copying the attribute values.
+
+    The result thus shares its attribute values with `a` and `b`, and must not be modified in place.
+    """
+    out = copy.copy(a)
+    out.__dict__.update(b.__dict__)
+    return out
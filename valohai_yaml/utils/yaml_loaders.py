@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import io
+from typing import IO, TYPE_CHECKING, Any, Callable, NoReturn, Union
+
+import yaml
+
+from valohai_yaml.types import SourceLocation
+
+if TYPE_CHECKING:
+    from valohai_yaml.types import ObjectPath, SourceLocationMap
+
+YamlLoadFunction = Callable[[Union[str, IO[str], IO[bytes]]], Any]
+
+_loaders: dict[str, YamlLoadFunction] = {}
+_loader_classes: dict[str, type] = {}
+
+
+def register_yaml_loader(name: str, load: YamlLoadFunction, *, loader_class: type | None = None) -> None:
+    """
+    Register a YAML loading backend.
+
+    The `load` function is passed a string or a stream, and must return plain Python data
+    (as `yaml.safe_load` would), raising a `yaml.YAMLError` for malformed documents.
+
+    If the backend is built on a PyYAML loader class (such as `yaml.SafeLoader`), pass it as `loader_class`
+    so the backend can also be used to load YAML with source locations (see `load_yaml_with_locations`).
+    """
+    _loaders[name] = load
+    if loader_class is not None:
+        _loader_classes[name] = loader_class
+    else:
+        _loader_classes.pop(name, None)
+
+
+def get_yaml_loader_names() -> list[str]:
+    """Get the names of all registered YAML loading backends, in registration order."""
+    return list(_loaders)
+
+
+def get_yaml_loader(name: str | None = None) -> YamlLoadFunction:
+    """
+    Get a registered YAML loading backend by name.
+
+    If no name is given, the fastest available backend is returned.
+    """
+    if name is None:
+        name = DEFAULT_YAML_LOADER
+    try:
+        return _loaders[name]
+    except KeyError:
+        raise ValueError(f"Unknown YAML loader {name!r} (available: {', '.join(_loaders)})") from None
+
+
+def get_yaml_loader_class(name: str | None = None) -> type:
+    """
+    Get the PyYAML loader class of a registered YAML loading backend by name.
+
+    If no name is given, that of the fastest available backend is returned.
+
+    :raises ValueError: if there is no such backend, or it has no loader class.
+    """
+    if name is None:
+        name = DEFAULT_YAML_LOADER
+    get_yaml_loader(name)  # Raises for unknown backends
+    loader_class = _loader_classes.get(name)
+    if loader_class is None:
+        raise ValueError(f"YAML loader {name!r} can't load YAML with source locations")
+    return loader_class
+
+
+def _load_pyyaml(stream: str | IO[str] | IO[bytes]) -> Any:
+    return yaml.load(stream, Loader=yaml.SafeLoader)
+
+
+def _buffer_stream(stream: str | IO[str] | IO[bytes]) -> str | io.StringIO:
+    """Read a stream into a rewindable buffer (with the same name, which YAML errors mention)."""
+    if isinstance(stream, str):
+        return stream
+    content = stream.read()
+    buffer = io.StringIO(content.decode("utf-8") if isinstance(content, bytes) else content)
+    buffer.name = getattr(stream, "name", "<file>")  # type: ignore[misc]
+    return buffer
+
+
+def _raise_pure_python_error(source: str | io.StringIO, exc: yaml.YAMLError) -> NoReturn:
+    """
+    Re-raise a libyaml loading error the way the pure-Python loader would report it.
+
+    libyaml's error messages and marks (and thus e.g. the lines reported by lint) differ from PyYAML's,
+    so malformed documents are reloaded with the pure-Python loader to get consistent errors.
+    """
+    if isinstance(source, io.StringIO):
+        source.seek(0)
+    yaml.load(source, Loader=yaml.SafeLoader)
+    raise exc  # pragma: no cover  # The loaders disagree on whether the document is malformed
+
+
+def _load_libyaml(stream: str | IO[str] | IO[bytes]) -> Any:
+    source = _buffer_stream(stream)
+    try:
+        return yaml.load(source, Loader=yaml.CSafeLoader)
+    except yaml.YAMLError as exc:
+        _raise_pure_python_error(source, exc)
+
+
+register_yaml_loader("pyyaml", _load_pyyaml, loader_class=yaml.SafeLoader)
+
+if getattr(yaml, "__with_libyaml__", False):  # pragma: no branch
+    register_yaml_loader("libyaml", _load_libyaml, loader_class=yaml.CSafeLoader)
+    DEFAULT_YAML_LOADER = "libyaml"
+else:  # pragma: no cover
+    DEFAULT_YAML_LOADER = "pyyaml"
+
+
+def load_yaml_with_locations(
+    stream: str | IO[str] | IO[bytes],
+    loader: str | None = None,
+) -> tuple[Any, SourceLocationMap]:
+    """
+    Load YAML into plain Python data, also returning a map of object paths to their source locations.
+
+    The paths are tuples of mapping keys and sequence indices (as in `jsonschema`'s error paths).
+    For mapping values, the location is that of the key; for sequence items, that of the item itself.
+
+    The document is only composed once; the node tree is discarded after the data and the location map
+    have been built from it.  Errors are reported as by the pure-Python loader.
+
+    :param loader: Name of the YAML loading backend to use; defaults to the fastest available one.
+                   The backend must have been registered with a loader class.
+    """
+    loader_class = get_yaml_loader_class(loader)
+    source = _buffer_stream(stream)
+    yaml_loader = loader_class(source)
+    try:
+        node = yaml_loader.get_single_node()
+        if node is None:
+            return (None, {})
+        data = yaml_loader.construct_document(node)
+        return (data, _get_node_locations(yaml_loader, node))
+    except yaml.YAMLError as exc:
+        if loader_class is yaml.SafeLoader:
+            raise
+        _raise_pure_python_error(source, exc)
+    finally:
+        yaml_loader.dispose()
+
+
+def _construct_key(yaml_loader: Any, key_node: yaml.Node) -> Any:
+    if key_node.tag == "tag:yaml.org,2002:str":
+        return key_node.value
+    return yaml_loader.construct_object(key_node, deep=True)
+
+
+def _get_node_locations(yaml_loader: Any, root: yaml.Node) -> SourceLocationMap:
+    """
+    Map the object paths within a constructed node tree to their source locations.
+
+    Constructing the document has flattened merge keys (`<<`) into the mapping nodes,
+    so the mapping keys can be matched to those of the data.
+    """
+    locations: SourceLocationMap = {(): _get_location(root)}
+    stack: list[tuple[ObjectPath, yaml.Node]] = [((), root)]
+    while stack:
+        path, node = stack.pop()
+        if isinstance(node, yaml.MappingNode):
+            # As when constructing the data, the last occurrence of a duplicate key wins.
+            entries = {}
+            for key_node, value_node in node.value:
+                try:
+                    entries[_construct_key(yaml_loader, key_node)] = (key_node, value_node)
+                except TypeError:  # pragma: no cover  # Unhashable keys can't be loaded anyway
+                    continue
+            for key, (key_node, value_node) in entries.items():
+                value_path = (*path, key)
+                locations[value_path] = _get_location(key_node)
+                stack.append((value_path, value_node))
+        elif isinstance(node, yaml.SequenceNode):
+            for index, item_node in enumerate(node.value):
+                item_path = (*path, index)
+                locations[item_path] = _get_location(item_node)
+                stack.append((item_path, item_node))
+    return locations
+
+
+def _get_location(node: yaml.Node) -> SourceLocation:
+    return SourceLocation(line=node.start_mark.line + 1, column=node.start_mark.column + 1)
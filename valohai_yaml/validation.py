@@ -1,7 +1,11 @@
 from copy import deepcopy
 from functools import cache
+from itertools import islice
+from typing import Any
 
 from jsonschema import Draft202012Validator, ValidationError
+from referencing import Registry
+from referencing.jsonschema import DRAFT202012
 
 from valohai_yaml import schema_data
 from valohai_yaml.excs import ValidationErrors
@@ -21,19 +25,30 @@ def get_json_schema() -> dict:
     }
 
 
+def get_schema_registry(schema: dict) -> Registry:
+    """
+    Get a `referencing` registry with all of the subschemata of `schema` crawled ahead of time.
+
+    Without this, the validator would (re-)crawl the whole schema document
+    to resolve every `$ref` it encounters during validation.
+    """
+    return (DRAFT202012.create_resource(schema) @ Registry()).crawl()
+
+
 @cache
 def get_validator() -> Draft202012Validator:
     schema = get_json_schema()
     Draft202012Validator.check_schema(schema)
-    return Draft202012Validator(schema)
+    return Draft202012Validator(schema, registry=get_schema_registry(schema))
 
 
-def validate(yaml: YamlReadable, raise_exc: bool = True) -> list[ValidationError]:
+def validate(yaml: YamlReadable, raise_exc: bool = True, fail_fast: bool = False) -> list[ValidationError]:
     """
     Validate the given YAML document and return a list of errors.
 
     :param yaml: YAML data (either a string, a stream, or pre-parsed Python dict/list)
     :param raise_exc: Whether to raise a meta-exception containing all discovered errors after validation.
+    :param fail_fast: Whether to stop validating at the first error (which is then the only one returned).
     :return: A list of errors encountered.
     """
     data = read_yaml(yaml)
@@ -41,7 +56,53 @@ def validate(yaml: YamlReadable, raise_exc: bool = True) -> list[ValidationError
     # Nb: this uses a list instead of being a generator function in order to be
     # easier to call correctly. (Were it a generator function, a plain
     # `validate(..., raise_exc=True)` would not do anything.
-    errors = list(validator.iter_errors(data))
+    errors = list(islice(validator.iter_errors(data), 1) if fail_fast else validator.iter_errors(data))
     if errors and raise_exc:
         raise ValidationErrors(errors)
     return errors
+
+
+def is_valid(yaml: YamlReadable) -> bool:
+    """
+    Check whether the given YAML document is valid, stopping at the first problem found.
+
+    A cheap structural check of the top-level items is done before the full schema validation.
+
+    :param yaml: YAML data (either a string, a stream, or pre-parsed Python dict/list)
+    """
+    data = read_yaml(yaml)
+    return check_structure(data) and get_validator().is_valid(data)
+
+
+# Top-level item types whose required properties are checked by `check_structure`.
+STRUCTURALLY_CHECKED_ITEM_TYPES = ("step", "pipeline")
+
+
+@cache
+def _get_structural_requirements() -> dict[str, frozenset[str]]:
+    return {
+        item_type: frozenset(schema_data.SCHEMATA[f"https://valohai.com/schemas/{item_type}"]["required"])
+        for item_type in STRUCTURALLY_CHECKED_ITEM_TYPES
+    }
+
+
+def check_structure(data: Any) -> bool:
+    """
+    Cheaply check the overall structure of the given (pre-parsed) data.
+
+    This only looks at the top-level list, its items, and the required keys of `step`s and `pipeline`s,
+    so it will not catch everything full validation would; however, any data it rejects would also
+    fail full validation.
+    """
+    if not isinstance(data, list):
+        return False
+    requirements = _get_structural_requirements()
+    for item in data:
+        if not isinstance(item, dict):
+            return False
+        for item_type, required_keys in requirements.items():
+            if item_type in item:
+                value = item[item_type]
+                if not isinstance(value, dict) or not required_keys.issubset(value):
+                    return False
+    return True